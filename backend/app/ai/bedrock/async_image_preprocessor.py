@@ -0,0 +1,88 @@
+import asyncio
+import base64
+
+from app.ai.bedrock.image_preprocessor import (
+    ImageDownscaler,
+    PreparedImage,
+    detect_base64_media_type,
+    detect_media_type,
+)
+from app.exceptions.image_not_found_exception import ImageNotFoundException
+from app.repositories.interface.async_image_repository import AsyncImageRepository
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("ai")
+class AsyncImagePreprocessor(ImageDownscaler):
+    """
+    モデルに渡す前に画像を縮小して再エンコードする (非同期版)
+
+    画像の取得と保存はイベントループで待ち，縮小と再エンコードはスレッドで実行する．
+    前処理した画像はインスタンスに保持するため，リクエストごとに作成して使う．
+    """
+
+    def __init__(
+        self,
+        image_repository: AsyncImageRepository,
+        max_edge: int = 1568,
+        quality: int = 85,
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            image_repository (AsyncImageRepository): 画像リポジトリ
+            max_edge (int, optional): 縮小後の長辺の最大値 (ピクセル単位)
+            quality (int, optional): 再エンコードするJPEGの品質
+        """
+        super().__init__(max_edge, quality)
+
+        self.image_repository = image_repository
+
+        self.prepared_images: dict[str, PreparedImage] = {}
+        self.key_locks: dict[str, asyncio.Lock] = {}
+
+    async def prepare(self, image_key: str) -> PreparedImage:
+        """
+        モデルに渡すための画像を取得する
+
+        Args:
+            image_key (str): 元の画像のキー
+
+        Returns:
+            PreparedImage: 画像の形式と base64 エンコードされた画像
+
+        Raises:
+            ImageNotFoundException: 画像が見つからない場合
+            ImagePreprocessingException: 画像を読み込めない場合や縮小できない場合
+        """
+        # 飼育タスクと飼育アドバイスが同じ画像を同時に使う場合でも取得と縮小は1回だけ行う
+        async with self.key_locks.setdefault(image_key, asyncio.Lock()):
+            if image_key not in self.prepared_images:
+                self.prepared_images[image_key] = await self.prepare_uncached(image_key)
+
+            return self.prepared_images[image_key]
+
+    async def prepare_uncached(self, image_key: str) -> PreparedImage:
+        processed_image_key = self.get_processed_image_key(image_key)
+
+        # 前処理済みの画像があれば元の画像は取得しない
+        base64_image = await self.image_repository.get_base64_by_key(processed_image_key)
+        if base64_image is not None:
+            return PreparedImage(
+                media_type=detect_base64_media_type(base64_image),
+                base64_data=base64_image,
+            )
+
+        image_bytes = await self.image_repository.get_by_key(image_key)
+        if image_bytes is None:
+            raise ImageNotFoundException(f"画像が見つかりませんでした: {image_key}")
+
+        # 縮小はCPUを使うため，イベントループを止めないようにスレッドで実行する
+        processed_image_bytes = await asyncio.to_thread(self.process, image_bytes)
+        await self.image_repository.save(processed_image_key, processed_image_bytes)
+
+        return PreparedImage(
+            media_type=detect_media_type(processed_image_bytes),
+            base64_data=base64.b64encode(processed_image_bytes).decode("utf-8"),
+        )
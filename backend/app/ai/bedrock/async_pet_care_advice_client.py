@@ -0,0 +1,87 @@
+import asyncio
+
+from app.ai.bedrock.async_image_preprocessor import AsyncImagePreprocessor
+from app.ai.bedrock.pet_care_advice_client import (
+    build_prompt_text,
+    build_request_body,
+    parse_response_body,
+)
+from app.ai.interface.async_pet_care_advice_client import AsyncPetCareAdviceClient
+from app.ai.interface.pet_care_advice_client import CareAdvicePromptVariables
+from app.aws.async_client_registry import async_aws_client_registry
+from app.repositories.interface.prompt_repository import PromptRepository
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("ai")
+class AsyncBedrockPetCareAdviceClient(AsyncPetCareAdviceClient):
+    MODEL_ID = "apac.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+    def __init__(
+        self,
+        secret_name: str,
+        prompt_repository: PromptRepository,
+        image_preprocessor: AsyncImagePreprocessor,
+        region_name: str = "ap-northeast-1",
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            secret_name (str): プロンプトの情報が入ったシークレット名
+            prompt_repository (PromptRepository): プロンプトリポジトリ
+            image_preprocessor (AsyncImagePreprocessor): モデルに渡す画像の前処理
+            region_name (str, optional): リージョン名. デフォルトは "ap-northeast-1".
+        """
+        self.secret_name = secret_name
+        self.prompt_repository = prompt_repository
+        self.image_preprocessor = image_preprocessor
+        self.region_name = region_name
+
+    async def generate(
+        self,
+        prompt_variables: CareAdvicePromptVariables,
+        pet_picture_key: str,
+    ) -> str:
+        """
+        飼育アドバイスを生成する
+
+        Args:
+            prompt_variables (CareAdvicePromptVariables): プロンプトに埋め込む変数
+            pet_picture_key (str): ペットの画像へのパス
+
+        Returns:
+            str: 飼育アドバイス
+        """
+        # プロンプトはコンテナ内でキャッシュされるため，取得し直すときだけスレッドで待つ
+        prompt_template = await asyncio.to_thread(self.get_prompt)
+        prompt_text = build_prompt_text(prompt_template, prompt_variables)
+        pet_picture = await self.image_preprocessor.prepare(pet_picture_key)
+
+        bedrock_runtime_client = await async_aws_client_registry.client(
+            "bedrock-runtime",
+            region_name=self.region_name,
+        )
+        response = await bedrock_runtime_client.invoke_model(
+            modelId=self.MODEL_ID,
+            contentType="application/json",
+            accept="application/json",
+            body=build_request_body(prompt_text, pet_picture),
+        )
+
+        async with response["body"] as body:
+            return parse_response_body(await body.read())
+
+    def get_prompt(self) -> str:
+        """
+        飼育アドバイスを生成するためのプロンプトを取得する
+
+        Returns:
+            str: 飼育アドバイスを生成するためのプロンプト
+        """
+        secrets = self.prompt_repository.get_secrets(self.secret_name)
+
+        return self.prompt_repository.get_prompt_text(
+            secrets["petCareAdvicePromptIdentifier"],
+            secrets["petCareAdvicePromptVersion"],
+        )
@@ -0,0 +1,274 @@
+import base64
+import io
+import posixpath
+import threading
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps
+
+from app.exceptions.image_not_found_exception import ImageNotFoundException
+from app.exceptions.image_preprocessing_exception import ImagePreprocessingException
+from app.repositories.interface.image_repository import ImageRepository
+from app.tracing.timing import timed_methods
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    media_type: str
+    base64_data: str
+
+
+@timed_methods("ai")
+class ImageDownscaler:
+    """
+    モデルに渡す画像を縮小して再エンコードする処理
+
+    画像の取得と保存は行わないため，同期版と非同期版の前処理で共有する．
+    """
+
+    # Claudeが入力として受け付ける画像の形式
+    SUPPORTED_MEDIA_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+    PROCESSED_DIRECTORY_NAME = "processed"
+
+    def __init__(self, max_edge: int = 1568, quality: int = 85):
+        """
+        コンストラクタ
+
+        Args:
+            max_edge (int, optional): 縮小後の長辺の最大値 (ピクセル単位)
+            quality (int, optional): 再エンコードするJPEGの品質
+        """
+        self.max_edge = max_edge
+        self.quality = quality
+
+    def open_image(self, image_bytes: bytes, media_type: str | None) -> Image.Image:
+        """
+        画像を読み込む
+
+        Args:
+            image_bytes (bytes): 画像のバイナリデータ
+            media_type (str | None): detect_media_type で判定した画像の形式
+
+        Returns:
+            Image.Image: 読み込んだ画像
+
+        Raises:
+            ImagePreprocessingException: 画像を読み込めない場合 (HEIC，画素数が多すぎる画像を含む)
+        """
+        # PillowはHEICを読み込めないため，形式が分かる場合は明確なエラーにする
+        if media_type == "image/heic":
+            raise ImagePreprocessingException(
+                "HEIC形式の画像には対応していません (JPEG，PNG，WebPでアップロードしてください)"
+            )
+
+        try:
+            return Image.open(io.BytesIO(image_bytes))
+        except (Image.DecompressionBombError, OSError) as e:
+            # UnidentifiedImageError は OSError のサブクラス
+            raise ImagePreprocessingException("画像を読み込めませんでした") from e
+
+    def can_use_as_is(self, media_type: str | None, image: Image.Image) -> bool:
+        """
+        縮小せずにそのままモデルに渡せるか判定する
+
+        Args:
+            media_type (str | None): 画像の形式
+            image (Image.Image): 読み込んだ画像
+
+        Returns:
+            bool: モデルが対応している形式で十分に小さい場合はTrue
+        """
+        return media_type in self.SUPPORTED_MEDIA_TYPES and max(image.size) <= self.max_edge
+
+    def downscale(self, image: Image.Image) -> bytes:
+        """
+        画像を縮小してJPEGで再エンコードする
+
+        Args:
+            image (Image.Image): 元の画像
+
+        Returns:
+            bytes: 再エンコードした画像のバイナリデータ
+
+        Raises:
+            ImagePreprocessingException: 画像が途中で切れているなどで画素を読み込めない場合
+        """
+        try:
+            # スマートフォンの写真は向きがEXIFに記録されているため画素に反映してから縮小する
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((self.max_edge, self.max_edge), Image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, format="JPEG", quality=self.quality, optimize=True)
+        except (Image.DecompressionBombError, OSError) as e:
+            raise ImagePreprocessingException("画像を縮小できませんでした") from e
+
+        return buffer.getvalue()
+
+    def process(self, image_bytes: bytes) -> bytes:
+        """
+        元の画像から前処理済みの画像を作成する
+
+        Args:
+            image_bytes (bytes): 元の画像のバイナリデータ
+
+        Returns:
+            bytes: 前処理済みの画像のバイナリデータ (十分に小さい画像は元の画像のまま)
+
+        Raises:
+            ImagePreprocessingException: 画像を読み込めない場合や縮小できない場合
+        """
+        media_type = detect_media_type(image_bytes)
+        image = self.open_image(image_bytes, media_type)
+
+        # 十分に小さい画像も前処理済みの画像として保存し，次回以降は元の画像を取得しない
+        if self.can_use_as_is(media_type, image):
+            return image_bytes
+
+        return self.downscale(image)
+
+    def get_processed_image_key(self, image_key: str) -> str:
+        """
+        縮小した画像を保存するキーを取得する
+
+        Args:
+            image_key (str): 元の画像のキー
+
+        Returns:
+            str: 縮小した画像のキー (例: pet_id/processed/picture_1568_q85.jpg)
+
+        Notes:
+            十分に小さい画像は元の形式のまま保存するため，拡張子は画像の形式と一致しない場合がある．
+        """
+        directory, file_name = posixpath.split(image_key)
+        stem, _ = posixpath.splitext(file_name)
+
+        return posixpath.join(
+            directory,
+            self.PROCESSED_DIRECTORY_NAME,
+            f"{stem}_{self.max_edge}_q{self.quality}.jpg",
+        )
+
+
+@timed_methods("ai")
+class ImagePreprocessor(ImageDownscaler):
+    """
+    モデルに渡す前に画像を縮小して再エンコードする
+
+    前処理済みの画像は元の画像から導出したキーでS3に保存し，次回以降は元の画像を取得せずにそれを使う．
+    """
+
+    def __init__(
+        self,
+        image_repository: ImageRepository,
+        max_edge: int = 1568,
+        quality: int = 85,
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            image_repository (ImageRepository): 画像リポジトリ
+            max_edge (int, optional): 縮小後の長辺の最大値 (ピクセル単位)
+            quality (int, optional): 再エンコードするJPEGの品質
+        """
+        super().__init__(max_edge, quality)
+
+        self.image_repository = image_repository
+
+        self.lock = threading.Lock()
+        self.key_locks: dict[str, threading.Lock] = {}
+
+    def prepare(self, image_key: str) -> PreparedImage:
+        """
+        モデルに渡すための画像を取得する
+
+        Args:
+            image_key (str): 元の画像のキー
+
+        Returns:
+            PreparedImage: 画像の形式と base64 エンコードされた画像
+
+        Raises:
+            ImageNotFoundException: 画像が見つからない場合
+            ImagePreprocessingException: 画像を読み込めない場合や縮小できない場合
+        """
+        # 同じ画像を複数のクライアントが同時に使う場合でも縮小は1回だけ行う
+        with self.get_key_lock(image_key):
+            processed_image_key = self.get_processed_image_key(image_key)
+
+            # 前処理済みの画像があれば元の画像は取得しない
+            base64_image = self.image_repository.get_base64_by_key(processed_image_key)
+            if base64_image is not None:
+                return PreparedImage(
+                    media_type=detect_base64_media_type(base64_image),
+                    base64_data=base64_image,
+                )
+
+            image_bytes = self.image_repository.get_by_key(image_key)
+            if image_bytes is None:
+                raise ImageNotFoundException(f"画像が見つかりませんでした: {image_key}")
+
+            processed_image_bytes = self.process(image_bytes)
+            self.image_repository.save(processed_image_key, processed_image_bytes)
+
+            return PreparedImage(
+                media_type=detect_media_type(processed_image_bytes),
+                base64_data=base64.b64encode(processed_image_bytes).decode("utf-8"),
+            )
+
+    def get_key_lock(self, image_key: str) -> threading.Lock:
+        """
+        画像のキーごとのロックを取得する
+
+        Args:
+            image_key (str): 画像のキー
+
+        Returns:
+            threading.Lock: キーごとのロック
+        """
+        with self.lock:
+            return self.key_locks.setdefault(image_key, threading.Lock())
+
+
+def detect_media_type(image_bytes: bytes) -> str | None:
+    """
+    先頭のバイト列から画像の形式を判定する
+
+    Args:
+        image_bytes (bytes): 画像のバイナリデータ
+
+    Returns:
+        str | None: 画像のMIMEタイプ (判定できない場合はNone)
+    """
+    if image_bytes.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+
+    if image_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+
+    if image_bytes.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+
+    if image_bytes[4:8] == b"ftyp" and image_bytes[8:12] in (b"heic", b"heix", b"mif1", b"msf1"):
+        return "image/heic"
+
+    return None
+
+
+def detect_base64_media_type(base64_data: str) -> str:
+    """
+    base64 エンコードされた画像の先頭から画像の形式を判定する
+
+    Args:
+        base64_data (str): base64 エンコードされた前処理済みの画像
+
+    Returns:
+        str: 画像のMIMEタイプ (判定できない場合は縮小した画像のJPEG)
+    """
+    # 16文字をデコードすると判定に必要な先頭の12バイトが得られる
+    return detect_media_type(base64.b64decode(base64_data[:16])) or "image/jpeg"
@@ -1,12 +1,13 @@
 import json
 
-import boto3
-
 from app.ai.interface.pet_avatar_image_client import PetAvatarImageClient
 from app.ai.interface.pet_picture_description_client import PetPictureDescription
+from app.aws.client_registry import aws_client_registry
 from app.exceptions.avatar_image_generation_exception import AvatarImageGenerationException
+from app.tracing.timing import timed_methods
 
 
+@timed_methods("ai")
 class BedrockPetAvatarImageClient(PetAvatarImageClient):
     MODEL_ID = "amazon.titan-image-generator-v2:0"
     TITAN_MAX_PROMPT_LENGTH = 512
@@ -18,7 +19,10 @@ class BedrockPetAvatarImageClient(PetAvatarImageClient):
         Args:
             region_name (str, optional): リージョン名. デフォルトは "us-east-1".
         """
-        self.bedrock_runtime_client = boto3.client("bedrock-runtime", region_name=region_name)
+        self.bedrock_runtime_client = aws_client_registry.client(
+            "bedrock-runtime",
+            region_name=region_name,
+        )
 
     def generate(self, description: PetPictureDescription) -> str:
         """
@@ -1,24 +1,24 @@
-import base64
 import json
 
-import boto3
-
+from app.ai.bedrock.image_preprocessor import ImagePreprocessor, PreparedImage
 from app.ai.interface.pet_care_advice_client import (
     CareAdvicePromptVariables,
     PetCareAdviceClient,
 )
-from app.exceptions.image_not_found_exception import ImageNotFoundException
-from app.exceptions.prompt_not_found_exception import PromptNotFoundException
-from app.repositories.interface.image_repository import ImageRepository
+from app.aws.client_registry import aws_client_registry
+from app.repositories.interface.prompt_repository import PromptRepository
+from app.tracing.timing import timed_methods
 
 
+@timed_methods("ai")
 class BedrockPetCareAdviceClient(PetCareAdviceClient):
     MODEL_ID = "apac.anthropic.claude-3-7-sonnet-20250219-v1:0"
 
     def __init__(
         self,
         secret_name: str,
-        image_repository: ImageRepository,
+        prompt_repository: PromptRepository,
+        image_preprocessor: ImagePreprocessor,
         region_name: str = "ap-northeast-1",
     ):
         """
@@ -26,24 +26,18 @@ class BedrockPetCareAdviceClient(PetCareAdviceClient):
 
         Args:
             secret_name (str): プロンプトの情報が入ったシークレット名
-            image_repository (ImageRepository): 画像リポジトリ
+            prompt_repository (PromptRepository): プロンプトリポジトリ
+            image_preprocessor (ImagePreprocessor): モデルに渡す画像の前処理
             region_name (str, optional): リージョン名. デフォルトは "ap-northeast-1".
         """
-        self.bedrock_agent_client = boto3.client(
-            "bedrock-agent",
-            region_name=region_name,
-        )
-        self.bedrock_runtime_client = boto3.client(
+        self.bedrock_runtime_client = aws_client_registry.client(
             "bedrock-runtime",
             region_name=region_name,
         )
-        self.secrets_manager_client = boto3.client(
-            "secretsmanager",
-            region_name=region_name,
-        )
 
         self.secret_name = secret_name
-        self.image_repository = image_repository
+        self.prompt_repository = prompt_repository
+        self.image_preprocessor = image_preprocessor
 
     def generate(
         self,
@@ -60,54 +54,17 @@ class BedrockPetCareAdviceClient(PetCareAdviceClient):
         Returns:
             str: 飼育アドバイス
         """
-        prompt_template = self.get_prompt()
-
-        prompt_text = prompt_template.format(
-            birth_date=prompt_variables.birth_date.isoformat(),
-            category=prompt_variables.category,
-            date=prompt_variables.date.isoformat(),
-            weather=prompt_variables.weather.value,
-            temperature=prompt_variables.temperature,
-        )
-
-        base64_pet_picture = self.get_base64_image(pet_picture_key)
+        prompt_text = build_prompt_text(self.get_prompt(), prompt_variables)
+        pet_picture = self.image_preprocessor.prepare(pet_picture_key)
 
         response = self.bedrock_runtime_client.invoke_model(
             modelId=self.MODEL_ID,
             contentType="application/json",
             accept="application/json",
-            body=json.dumps(
-                {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 1000,
-                    "temperature": 0.5,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "image",
-                                    "source": {
-                                        "type": "base64",
-                                        "media_type": "image/jpeg",  # FIXME: ペットの画像がJPEGとは限らない
-                                        "data": base64_pet_picture,
-                                    },
-                                },
-                                {
-                                    "type": "text",
-                                    "text": prompt_text,
-                                },
-                            ],
-                        },
-                    ],
-                }
-            ),
+            body=build_request_body(prompt_text, pet_picture),
         )
 
-        response_body = json.loads(response["body"].read())
-        advice_text = response_body["content"][0]["text"]
-
-        return advice_text
+        return parse_response_body(response["body"].read())
 
     def get_prompt(self) -> str:
         """
@@ -116,41 +73,81 @@ class BedrockPetCareAdviceClient(PetCareAdviceClient):
         Returns:
             str: 飼育アドバイスを生成するためのプロンプト
         """
-        secrets_response = self.secrets_manager_client.get_secret_value(SecretId=self.secret_name)
-        secrets = json.loads(secrets_response["SecretString"])
-
-        prompt_identifier = secrets["petCareAdvicePromptIdentifier"]
-        prompt_version = secrets["petCareAdvicePromptVersion"]
+        secrets = self.prompt_repository.get_secrets(self.secret_name)
 
-        response = self.bedrock_agent_client.get_prompt(
-            promptIdentifier=prompt_identifier,
-            promptVersion=prompt_version,
+        return self.prompt_repository.get_prompt_text(
+            secrets["petCareAdvicePromptIdentifier"],
+            secrets["petCareAdvicePromptVersion"],
         )
 
-        default_variant_name = response["defaultVariant"]
 
-        for variant in response["variants"]:
-            if variant["name"] == default_variant_name:
-                return variant["templateConfiguration"]["text"]["text"]
-
-        raise PromptNotFoundException("プロンプトが見つかりませんでした")
-
-    def get_base64_image(self, s3_image_key: str) -> str:
-        """
-        画像を base64 エンコードして文字列に変換する
-
-        Args:
-            s3_image_key (str): 画像の S3 キー
+def build_prompt_text(prompt_template: str, prompt_variables: CareAdvicePromptVariables) -> str:
+    """
+    プロンプトのテンプレートに変数を埋め込む
+
+    Args:
+        prompt_template (str): プロンプトのテンプレート
+        prompt_variables (CareAdvicePromptVariables): プロンプトに埋め込む変数
+
+    Returns:
+        str: プロンプト
+    """
+    return prompt_template.format(
+        birth_date=prompt_variables.birth_date.isoformat(),
+        category=prompt_variables.category,
+        date=prompt_variables.date.isoformat(),
+        weather=prompt_variables.weather.value,
+        temperature=prompt_variables.temperature,
+    )
+
+
+def build_request_body(prompt_text: str, pet_picture: PreparedImage) -> str:
+    """
+    InvokeModel に渡すリクエストの本文を作る (同期版と非同期版のクライアントで共有する)
+
+    Args:
+        prompt_text (str): プロンプト
+        pet_picture (PreparedImage): 前処理したペットの画像
+
+    Returns:
+        str: JSON形式のリクエストの本文
+    """
+    return json.dumps(
+        {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 1000,
+            "temperature": 0.5,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": pet_picture.media_type,
+                                "data": pet_picture.base64_data,
+                            },
+                        },
+                        {
+                            "type": "text",
+                            "text": prompt_text,
+                        },
+                    ],
+                },
+            ],
+        }
+    )
 
-        Returns:
-            str: base64 エンコードされた画像の文字列
 
-        Raises:
-            ValueError: 画像が見つからない場合
-        """
-        image_bytes = self.image_repository.get_by_key(s3_image_key)
+def parse_response_body(response_body: bytes) -> str:
+    """
+    InvokeModel のレスポンスの本文から飼育アドバイスを取り出す
 
-        if image_bytes is None:
-            raise ImageNotFoundException(f"画像が見つかりませんでした: {s3_image_key}")
+    Args:
+        response_body (bytes): レスポンスの本文
 
-        return base64.b64encode(image_bytes).decode("utf-8")
+    Returns:
+        str: 飼育アドバイス
+    """
+    return json.loads(response_body)["content"][0]["text"]
@@ -1,15 +1,17 @@
 import json
 
-import boto3
-
 from app.ai.interface.pet_care_notes_client import (
     CareNotesPromptVariables,
     PetCareNotesClient,
 )
+from app.aws.client_registry import aws_client_registry
 from app.exceptions.care_notes_generation_exception import CareNotesGenerationException
 from app.models.pet import PetCareNote
+from app.repositories.interface.prompt_repository import PromptRepository
+from app.tracing.timing import timed_methods
 
 
+@timed_methods("ai")
 class BedrockPetCareNotesClient(PetCareNotesClient):
     CARE_NOTE_ICONS = [
         "Dog",
@@ -20,24 +22,27 @@ class BedrockPetCareNotesClient(PetCareNotesClient):
         "Cookie",
     ]
 
-    def __init__(self, secret_name: str, region_name: str = "ap-northeast-1") -> None:
+    def __init__(
+        self,
+        secret_name: str,
+        prompt_repository: PromptRepository,
+        region_name: str = "ap-northeast-1",
+    ) -> None:
         """
         コンストラクタ
 
         Args:
             secret_name (str): プロンプトの情報が入ったシークレット名
+            prompt_repository (PromptRepository): プロンプトリポジトリ
             region_name (str, optional): リージョン名. デフォルトは "ap-northeast-1".
         """
-        self.bedrock_runtime_client = boto3.client(
+        self.bedrock_runtime_client = aws_client_registry.client(
             "bedrock-runtime",
             region_name=region_name,
         )
-        self.secrets_manager_client = boto3.client(
-            "secretsmanager",
-            region_name=region_name,
-        )
 
         self.secret_name = secret_name
+        self.prompt_repository = prompt_repository
 
     def generate(self, prompt_variables: CareNotesPromptVariables) -> list[PetCareNote]:
         """
@@ -101,7 +106,6 @@ class BedrockPetCareNotesClient(PetCareNotesClient):
         Returns:
             str: プロンプトの ARN
         """
-        secrets_response = self.secrets_manager_client.get_secret_value(SecretId=self.secret_name)
-        secrets = json.loads(secrets_response["SecretString"])
+        secrets = self.prompt_repository.get_secrets(self.secret_name)
 
         return secrets["careNotesPromptArn"]
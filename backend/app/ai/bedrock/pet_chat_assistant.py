@@ -1,29 +1,30 @@
-import json
-
-import boto3
+import codecs
+from collections.abc import Iterator
 
 from app.ai.interface.pet_chat_assistant import PetChatAssistant
+from app.aws.client_registry import aws_client_registry
 from app.models.chat import ChatMessage
 from app.repositories.interface.chat_repository import ChatRepository
+from app.repositories.interface.prompt_repository import PromptRepository
+from app.tracing.timing import timed_methods
 
 
+@timed_methods("ai")
 class BedrockPetChatAssistant(PetChatAssistant):
     def __init__(
         self,
         secret_name: str,
+        prompt_repository: PromptRepository,
         chat_repository: ChatRepository,
         region_name: str = "ap-northeast-1",
     ):
-        self.bedrock_agent_runtime_client = boto3.client(
+        self.bedrock_agent_runtime_client = aws_client_registry.client(
             "bedrock-agent-runtime",
             region_name=region_name,
         )
-        self.secret_manager_client = boto3.client(
-            "secretsmanager",
-            region_name=region_name,
-        )
 
         self.secret_name = secret_name
+        self.prompt_repository = prompt_repository
         self.chat_repository = chat_repository
 
     def converse(self, pet_id: str, user_message: ChatMessage) -> ChatMessage:
@@ -37,6 +38,41 @@ class BedrockPetChatAssistant(PetChatAssistant):
         Returns:
             ChatMessage: AIアシスタントからの応答
         """
+        chunks = self.invoke_agent(pet_id, user_message, stream_final_response=False)
+        agent_response = "".join(chunks)
+
+        return ChatMessage(content=agent_response)
+
+    def converse_stream(self, pet_id: str, user_message: ChatMessage) -> Iterator[str]:
+        """
+        AIアシスタントと会話し，応答を生成された順に逐次返す
+
+        Args:
+            pet_id: ペットID
+            user_message: ユーザーからのメッセージ
+
+        Yields:
+            str: AIアシスタントからの応答の断片
+        """
+        yield from self.invoke_agent(pet_id, user_message, stream_final_response=True)
+
+    def invoke_agent(
+        self,
+        pet_id: str,
+        user_message: ChatMessage,
+        stream_final_response: bool,
+    ) -> Iterator[str]:
+        """
+        エージェントを呼び出し，応答のチャンクを受信した順に返す
+
+        Args:
+            pet_id: ペットID
+            user_message: ユーザーからのメッセージ
+            stream_final_response: 最終応答をトークン単位で受け取るかどうか
+
+        Yields:
+            str: 応答のチャンクをデコードした文字列
+        """
         agent_id, agent_alias_id = self.get_agent_id()
 
         response = self.bedrock_agent_runtime_client.invoke_agent(
@@ -49,14 +85,26 @@ class BedrockPetChatAssistant(PetChatAssistant):
                     "petId": pet_id,
                 }
             },
+            streamingConfigurations={
+                "streamFinalResponse": stream_final_response,
+            },
         )
 
-        agent_response = ""
+        # マルチバイト文字がチャンクの境界で分割される場合があるため逐次デコードする
+        decoder = codecs.getincrementaldecoder("utf-8")()
+
         for event in response.get("completion", []):
-            chunk = event["chunk"]
-            agent_response += chunk["bytes"].decode()
+            chunk = event.get("chunk")
+            if chunk is None:
+                continue
 
-        return ChatMessage(content=agent_response)
+            text = decoder.decode(chunk["bytes"])
+            if text:
+                yield text
+
+        rest = decoder.decode(b"", final=True)
+        if rest:
+            yield rest
 
     def get_agent_id(self) -> tuple[str, str]:
         """
@@ -69,8 +117,7 @@ class BedrockPetChatAssistant(PetChatAssistant):
         Returns:
             tuple[str, str]: エージェントIDとエイリアスID
         """
-        secret_response = self.secret_manager_client.get_secret_value(SecretId=self.secret_name)
-        secrets = json.loads(secret_response["SecretString"])
+        secrets = self.prompt_repository.get_secrets(self.secret_name)
 
         agent_id = secrets.get("chatAssistantAgentId")
         agent_alias_id = secrets.get("chatAssistantAgentAliasId")
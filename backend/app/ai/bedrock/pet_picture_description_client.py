@@ -1,49 +1,44 @@
-import base64
 import json
 
-import boto3
-
+from app.ai.bedrock.image_preprocessor import ImagePreprocessor
 from app.ai.interface.pet_picture_description_client import (
     PetPictureDescription,
     PetPictureDescriptionClient,
 )
-from app.exceptions.image_not_found_exception import ImageNotFoundException
+from app.aws.client_registry import aws_client_registry
 from app.exceptions.picture_description_exception import PictureDescriptionException
-from app.exceptions.prompt_not_found_exception import PromptNotFoundException
-from app.repositories.interface.image_repository import ImageRepository
+from app.repositories.interface.prompt_repository import PromptRepository
+from app.tracing.timing import timed_methods
 
 
+@timed_methods("ai")
 class BedrockPetPictureDescriptionClient(PetPictureDescriptionClient):
     MODEL_ID = "apac.anthropic.claude-3-7-sonnet-20250219-v1:0"
 
     def __init__(
         self,
         secret_name: str,
-        image_repository: ImageRepository,
+        prompt_repository: PromptRepository,
+        image_preprocessor: ImagePreprocessor,
         region_name: str = "ap-northeast-1",
     ):
         """
         コンストラクタ
 
         Args:
-            image_repository (ImageRepository): 画像リポジトリ
+            secret_name (str): プロンプトの情報が入ったシークレット名
+            prompt_repository (PromptRepository): プロンプトリポジトリ
+            image_preprocessor (ImagePreprocessor): モデルに渡す画像の前処理
             region_name (str, optional): リージョン名. デフォルトは "ap-northeast-1".
         """
-        self.bedrock_agent_client = boto3.client(
-            "bedrock-agent",
-            region_name=region_name,
-        )
-        self.bedrock_runtime_client = boto3.client(
+        self.bedrock_runtime_client = aws_client_registry.client(
             "bedrock-runtime",
             region_name=region_name,
         )
-        self.secrets_manager_client = boto3.client(
-            "secretsmanager",
-            region_name=region_name,
-        )
 
         self.secret_name = secret_name
-        self.image_repository = image_repository
+        self.prompt_repository = prompt_repository
+        self.image_preprocessor = image_preprocessor
 
     def describe(self, pet_picture_key: str) -> PetPictureDescription:
         """
@@ -58,7 +53,7 @@ class BedrockPetPictureDescriptionClient(PetPictureDescriptionClient):
         """
         prompt_text = self.get_prompt()
 
-        base64_pet_picture = self.get_base64_image(pet_picture_key)
+        pet_picture = self.image_preprocessor.prepare(pet_picture_key)
 
         response = self.bedrock_runtime_client.invoke_model(
             modelId=self.MODEL_ID,
@@ -76,8 +71,8 @@ class BedrockPetPictureDescriptionClient(PetPictureDescriptionClient):
                                     "type": "image",
                                     "source": {
                                         "type": "base64",
-                                        "media_type": "image/jpeg",
-                                        "data": base64_pet_picture,
+                                        "media_type": pet_picture.media_type,
+                                        "data": pet_picture.base64_data,
                                     },
                                 },
                                 {
@@ -113,41 +108,9 @@ class BedrockPetPictureDescriptionClient(PetPictureDescriptionClient):
         Returns:
             str: 画像の説明文を生成するためのプロンプト
         """
-        secrets_response = self.secrets_manager_client.get_secret_value(SecretId=self.secret_name)
-        secrets = json.loads(secrets_response["SecretString"])
-
-        prompt_identifier = secrets["pictureDescriptionPromptIdentifier"]
-        prompt_version = secrets["pictureDescriptionPromptVersion"]
+        secrets = self.prompt_repository.get_secrets(self.secret_name)
 
-        response = self.bedrock_agent_client.get_prompt(
-            promptIdentifier=prompt_identifier,
-            promptVersion=prompt_version,
+        return self.prompt_repository.get_prompt_text(
+            secrets["pictureDescriptionPromptIdentifier"],
+            secrets["pictureDescriptionPromptVersion"],
         )
-
-        default_variant_name = response["defaultVariant"]
-
-        for variant in response["variants"]:
-            if variant["name"] == default_variant_name:
-                return variant["templateConfiguration"]["text"]["text"]
-
-        raise PromptNotFoundException("プロンプトが見つかりませんでした")
-
-    def get_base64_image(self, s3_image_key: str) -> str:
-        """
-        画像を base64 エンコードして文字列に変換する
-
-        Args:
-            s3_image_key (str): 画像の S3 キー
-
-        Returns:
-            str: base64 エンコードされた画像の文字列
-
-        Raises:
-            ValueError: 画像が見つからない場合
-        """
-        image_bytes = self.image_repository.get_by_key(s3_image_key)
-
-        if image_bytes is None:
-            raise ImageNotFoundException(f"画像が見つかりませんでした: {s3_image_key}")
-
-        return base64.b64encode(image_bytes).decode("utf-8")
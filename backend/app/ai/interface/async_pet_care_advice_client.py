@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+from app.ai.interface.pet_care_advice_client import CareAdvicePromptVariables
+
+
+class AsyncPetCareAdviceClient(ABC):
+    @abstractmethod
+    async def generate(
+        self,
+        prompt_variables: CareAdvicePromptVariables,
+        pet_picture_key: str,
+    ) -> str:
+        """
+        飼育アドバイスを生成する
+
+        Args:
+            prompt_variables (CareAdvicePromptVariables): プロンプトに埋め込む変数
+            pet_picture_key (str): ペットの画像へのパス
+
+        Returns:
+            str: 飼育アドバイス
+        """
+        pass
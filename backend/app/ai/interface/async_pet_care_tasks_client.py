@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+from app.ai.interface.pet_care_tasks_client import CareTasksPromptVariables
+from app.models.diary import DiaryTask
+
+
+class AsyncPetCareTasksClient(ABC):
+    @abstractmethod
+    async def generate(
+        self,
+        prompt_variables: CareTasksPromptVariables,
+        pet_picture_key: str,
+    ) -> list[DiaryTask]:
+        """
+        ペットの飼育タスクを生成する
+
+        Args:
+            prompt_variables (CareTasksPromptVariables): ペットの飼育情報を生成するための情報
+            pet_picture_key (str): ペットの画像へのパス
+
+        Returns:
+            list[DiaryTask]: タスクのリスト
+        """
+        pass
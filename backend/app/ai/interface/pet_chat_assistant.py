@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
 from app.models.chat import ChatMessage
 
@@ -17,3 +18,17 @@ class PetChatAssistant(ABC):
             ChatMessage: AIアシスタントからの応答
         """
         pass
+
+    @abstractmethod
+    def converse_stream(self, pet_id: str, user_message: ChatMessage) -> Iterator[str]:
+        """
+        AIアシスタントと会話し，応答を生成された順に逐次返す
+
+        Args:
+            pet_id: ペットID
+            user_message: ユーザーからのメッセージ
+
+        Yields:
+            str: AIアシスタントからの応答の断片
+        """
+        pass
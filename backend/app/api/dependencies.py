@@ -1,102 +1,302 @@
+from __future__ import annotations
+
 import os
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
 
+from aws_lambda_powertools import Logger
 from fastapi import Depends
 
-from app.ai.bedrock.pet_avatar_image_client import BedrockPetAvatarImageClient
-from app.ai.bedrock.pet_care_advice_client import BedrockPetCareAdviceClient
-from app.ai.bedrock.pet_care_notes_client import BedrockPetCareNotesClient
-from app.ai.bedrock.pet_care_tasks_client import BedrockPetCareTasksClient
-from app.ai.bedrock.pet_chat_assistant import BedrockPetChatAssistant
-from app.ai.bedrock.pet_picture_description_client import BedrockPetPictureDescriptionClient
+from app.ai.interface.async_pet_care_advice_client import AsyncPetCareAdviceClient
+from app.ai.interface.async_pet_care_tasks_client import AsyncPetCareTasksClient
 from app.ai.interface.pet_avatar_image_client import PetAvatarImageClient
 from app.ai.interface.pet_care_advice_client import PetCareAdviceClient
 from app.ai.interface.pet_care_notes_client import PetCareNotesClient
 from app.ai.interface.pet_care_tasks_client import PetCareTasksClient
 from app.ai.interface.pet_chat_assistant import PetChatAssistant
 from app.ai.interface.pet_picture_description_client import PetPictureDescriptionClient
-from app.repositories.dynamodb.chat_repository import DynamoDBChatRepository
-from app.repositories.dynamodb.diary_repository import DynamoDBDiaryRepository
-from app.repositories.dynamodb.pet_repository import DynamoDBPetRepository
-from app.repositories.dynamodb.user_repository import DynamoDBUserRepository
+from app.cache.ttl_cache import TTLCache
+from app.cache.versioned_lru_cache import VersionedLRUCache
+from app.models.pet import Pet
+from app.models.user import User
+from app.repositories.cache.pet_repository import CachedPetRepository, get_pet_revision
+from app.repositories.cache.user_repository import CachedUserRepository, get_user_revision
+from app.repositories.interface.async_diary_repository import AsyncDiaryRepository
+from app.repositories.interface.async_image_repository import AsyncImageRepository
 from app.repositories.interface.chat_repository import ChatRepository
 from app.repositories.interface.diary_repository import DiaryRepository
-from app.repositories.interface.image_repository import ImageRepository
+from app.repositories.interface.image_repository import (
+    DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ImageRepository,
+)
+from app.repositories.interface.pet_creation_checkpoint_repository import (
+    PetCreationCheckpointRepository,
+)
 from app.repositories.interface.pet_repository import PetRepository
+from app.repositories.interface.prompt_repository import PromptRepository
 from app.repositories.interface.user_repository import UserRepository
-from app.repositories.s3.image_repository import S3ImageRepository
+from app.repositories.memory.pet_creation_checkpoint_repository import (
+    InMemoryPetCreationCheckpointRepository,
+)
 from app.services.chat_service.chat_service import ChatService
 from app.services.chat_service.get_chat_service import GetChatService
+from app.services.diary_service.async_create_diary_service import AsyncCreateDiaryService
+from app.services.diary_service.async_get_diary_service import AsyncGetDiaryService
 from app.services.diary_service.create_diary_service import CreateDiaryService
+from app.services.diary_service.get_diaries_service import GetDiariesService
 from app.services.diary_service.get_diary_service import GetDiaryService
+from app.services.diary_service.list_diaries_service import ListDiariesService
 from app.services.diary_service.update_diary_service import UpdateDiaryService
+from app.services.diary_service.update_diary_task_service import UpdateDiaryTaskService
 from app.services.pet_service.create_pet_service import CreatePetService
 from app.services.pet_service.get_pet_service import GetPetService
+from app.services.pet_service.get_pets_service import GetPetsService
 from app.services.pet_service.update_pet_service import UpdatePetService
+from app.services.s3_service.abort_multipart_upload_service import AbortMultipartUploadService
+from app.services.s3_service.complete_multipart_upload_service import (
+    CompleteMultipartUploadService,
+)
+from app.services.s3_service.create_multipart_upload_service import CreateMultipartUploadService
+from app.services.s3_service.create_upload_policy_service import CreateUploadPolicyService
 from app.services.s3_service.get_presigned_url_service import GetPresignedUrlService
+from app.services.s3_service.get_presigned_urls_service import GetPresignedUrlsService
+from app.services.s3_service.list_pet_pictures_service import ListPetPicturesService
 from app.services.user_service.create_user_service import CreateUserService
 from app.services.user_service.get_user_service import GetUserService
+from app.services.user_service.get_users_service import GetUsersService
 from app.services.user_service.update_user_service import UpdateUserService
 
+# AWSのSDKやPillowを読み込む実装は，コールドスタートを短くするために使うときに初めてインポートする
+if TYPE_CHECKING:
+    from app.ai.bedrock.async_image_preprocessor import AsyncImagePreprocessor
+    from app.ai.bedrock.image_preprocessor import ImagePreprocessor
+
 DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT_URL")
 S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
 
 USER_TABLE_NAME = os.getenv("USER_TABLE_NAME")
 PET_TABLE_NAME = os.getenv("PET_TABLE_NAME")
 DIARY_TABLE_NAME = os.getenv("DIARY_TABLE_NAME")
+PET_CREATION_CHECKPOINT_TABLE_NAME = os.getenv("PET_CREATION_CHECKPOINT_TABLE_NAME")
+CHAT_MESSAGE_TABLE_NAME = os.getenv("CHAT_MESSAGE_TABLE_NAME")
 IMAGE_BUCKET_NAME = os.getenv("IMAGE_BUCKET_NAME")
 SECRET_NAME = os.getenv("PETROCK_NOVA_API_SECRET_NAME")
 
+PET_CREATION_CHECKPOINT_TTL_SECONDS = int(os.getenv("PET_CREATION_CHECKPOINT_TTL_SECONDS", "86400"))
+
+REQUEST_IMAGE_CACHE_MAX_BYTES = int(os.getenv("REQUEST_IMAGE_CACHE_MAX_BYTES", "20971520"))
+
+CHAT_WRITE_AHEAD = os.getenv("CHAT_WRITE_AHEAD", "false").lower() == "true"
+
+MODEL_IMAGE_MAX_EDGE = int(os.getenv("MODEL_IMAGE_MAX_EDGE", "1568"))
+MODEL_IMAGE_QUALITY = int(os.getenv("MODEL_IMAGE_QUALITY", "85"))
+
+PROMPT_CACHE_TTL_SECONDS = float(os.getenv("PROMPT_CACHE_TTL_SECONDS", "300"))
+PROMPT_CACHE_MAX_STALE_SECONDS = float(os.getenv("PROMPT_CACHE_MAX_STALE_SECONDS", "3600"))
+
+# 0を指定するとキャッシュしない
+PET_CACHE_MAX_ENTRIES = int(os.getenv("PET_CACHE_MAX_ENTRIES", "1000"))
+PET_CACHE_TTL_SECONDS = float(os.getenv("PET_CACHE_TTL_SECONDS", "5"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "5"))
+
+# 0を指定するとキャッシュしない
+PRESIGNED_URL_CACHE_MAX_ENTRIES = int(os.getenv("PRESIGNED_URL_CACHE_MAX_ENTRIES", "10000"))
+# キャッシュから返したURLがこの秒数以上は使えるように，URLの有効期限より前に署名し直す
+PRESIGNED_URL_CACHE_MIN_REMAINING_SECONDS = float(
+    os.getenv("PRESIGNED_URL_CACHE_MIN_REMAINING_SECONDS", "300")
+)
+
+# 署名付きPOSTとマルチパートアップロードで受け付ける画像の最大サイズと，署名の有効期限
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", "10485760"))
+UPLOAD_URL_EXPIRES_IN = int(os.getenv("UPLOAD_URL_EXPIRES_IN", "900"))
+
+# 制限のないPUTの署名付きURLを発行するか (フロントエンドを upload-policy に移行するまで)
+ALLOW_PRESIGNED_PUT_URL = os.getenv("ALLOW_PRESIGNED_PUT_URL", "false").lower() == "true"
+
+# バージョンを指定しないペットと日記の更新を許可するか (フロントエンドが送るようになるまで)
+ALLOW_UNVERSIONED_UPDATE = os.getenv("ALLOW_UNVERSIONED_UPDATE", "false").lower() == "true"
+
+# Lambda はレスポンスを返すと実行環境を止めるため，バックグラウンドのスレッドを使わない
+RUNNING_ON_LAMBDA = "AWS_LAMBDA_FUNCTION_NAME" in os.environ
+
+logger = Logger()
+
+# シークレットとプロンプトはコンテナ内のリクエスト間で共有する
+prompt_cache = TTLCache(
+    "Prompt",
+    ttl_seconds=PROMPT_CACHE_TTL_SECONDS,
+    max_stale_seconds=PROMPT_CACHE_MAX_STALE_SECONDS,
+    background_refresh=not RUNNING_ON_LAMBDA,
+)
+
+# ペットとユーザーはコンテナ内のリクエスト間で共有し，有効期限が切れたら版だけを取得して再検証する
+pet_cache: VersionedLRUCache[str, Pet] = VersionedLRUCache(
+    "Pet",
+    PET_CACHE_MAX_ENTRIES,
+    PET_CACHE_TTL_SECONDS,
+    get_pet_revision,
+)
+user_cache: VersionedLRUCache[str, User] = VersionedLRUCache(
+    "User",
+    USER_CACHE_MAX_ENTRIES,
+    USER_CACHE_TTL_SECONDS,
+    get_user_revision,
+)
+
+# 閲覧用の署名付きURLはコンテナ内のリクエスト間で共有する (URLは版を持たないため常に置き換える)
+presigned_url_cache: VersionedLRUCache[tuple, str] = VersionedLRUCache(
+    "PresignedUrl",
+    PRESIGNED_URL_CACHE_MAX_ENTRIES,
+    DEFAULT_PRESIGNED_URL_EXPIRES_IN - PRESIGNED_URL_CACHE_MIN_REMAINING_SECONDS,
+    lambda presigned_url: 0,
+)
+
+# テーブルが設定されていない場合はコンテナ内のメモリに途中結果を保存する
+in_memory_pet_creation_checkpoint_repository = InMemoryPetCreationCheckpointRepository()
+
+# Lambda ではコンテナごとにメモリが分かれ，再試行が別のコンテナで実行されると再開できない
+if PET_CREATION_CHECKPOINT_TABLE_NAME is None and RUNNING_ON_LAMBDA:
+    logger.warning(
+        "PET_CREATION_CHECKPOINT_TABLE_NAME が設定されていないため，途中結果をメモリに保存します"
+    )
+
 
 def get_user_repository() -> UserRepository:
-    return DynamoDBUserRepository(USER_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
+    from app.repositories.dynamodb.user_repository import DynamoDBUserRepository
+
+    user_repository = DynamoDBUserRepository(USER_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
+
+    if USER_CACHE_MAX_ENTRIES <= 0:
+        return user_repository
+
+    return CachedUserRepository(user_repository, user_cache)
 
 
 def get_pet_repository() -> PetRepository:
-    return DynamoDBPetRepository(PET_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
+    from app.repositories.dynamodb.pet_repository import DynamoDBPetRepository
 
+    pet_repository = DynamoDBPetRepository(PET_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
 
-def get_image_repository() -> ImageRepository:
-    return S3ImageRepository(IMAGE_BUCKET_NAME, S3_ENDPOINT_URL)
+    if PET_CACHE_MAX_ENTRIES <= 0:
+        return pet_repository
+
+    return CachedPetRepository(pet_repository, pet_cache)
+
+
+def get_pet_creation_checkpoint_repository() -> PetCreationCheckpointRepository:
+    if PET_CREATION_CHECKPOINT_TABLE_NAME is None:
+        return in_memory_pet_creation_checkpoint_repository
+
+    from app.repositories.dynamodb.pet_creation_checkpoint_repository import (
+        DynamoDBPetCreationCheckpointRepository,
+    )
+
+    return DynamoDBPetCreationCheckpointRepository(
+        PET_CREATION_CHECKPOINT_TABLE_NAME,
+        DYNAMODB_ENDPOINT_URL,
+        PET_CREATION_CHECKPOINT_TTL_SECONDS,
+    )
+
+
+def get_image_repository() -> Iterator[ImageRepository]:
+    from app.repositories.cache.image_repository import CachedImageRepository
+    from app.repositories.s3.image_repository import S3ImageRepository
+
+    # 同じリクエストの中では同じインスタンスが使われるため，画像のダウンロードは1回で済む
+    image_repository = CachedImageRepository(
+        S3ImageRepository(IMAGE_BUCKET_NAME, S3_ENDPOINT_URL),
+        REQUEST_IMAGE_CACHE_MAX_BYTES,
+        presigned_url_cache if PRESIGNED_URL_CACHE_MAX_ENTRIES > 0 else None,
+    )
+
+    yield image_repository
+
+    if image_repository.download_count > 0:
+        logger.info(
+            "リクエスト中に画像をダウンロードしました",
+            extra={
+                "downloaded_bytes": image_repository.downloaded_bytes,
+                "download_count": image_repository.download_count,
+                "cache_hit_count": image_repository.hit_count,
+            },
+        )
 
 
 def get_diary_repository() -> DiaryRepository:
+    from app.repositories.dynamodb.diary_repository import DynamoDBDiaryRepository
+
     return DynamoDBDiaryRepository(DIARY_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
 
 
 def get_chat_repository() -> ChatRepository:
-    return DynamoDBChatRepository(PET_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
+    from app.repositories.dynamodb.chat_repository import DynamoDBChatRepository
 
+    return DynamoDBChatRepository(CHAT_MESSAGE_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
 
-def get_pet_picture_description_client(
+
+def get_prompt_repository() -> PromptRepository:
+    from app.repositories.bedrock.prompt_repository import BedrockPromptRepository
+
+    return BedrockPromptRepository(prompt_cache)
+
+
+def get_image_preprocessor(
     image_repository: ImageRepository = Depends(get_image_repository),
+) -> ImagePreprocessor:
+    from app.ai.bedrock.image_preprocessor import ImagePreprocessor
+
+    return ImagePreprocessor(image_repository, MODEL_IMAGE_MAX_EDGE, MODEL_IMAGE_QUALITY)
+
+
+def get_pet_picture_description_client(
+    prompt_repository: PromptRepository = Depends(get_prompt_repository),
+    image_preprocessor: ImagePreprocessor = Depends(get_image_preprocessor),
 ) -> PetPictureDescriptionClient:
-    return BedrockPetPictureDescriptionClient(SECRET_NAME, image_repository)
+    from app.ai.bedrock.pet_picture_description_client import BedrockPetPictureDescriptionClient
+
+    return BedrockPetPictureDescriptionClient(SECRET_NAME, prompt_repository, image_preprocessor)
 
 
 def get_pet_avatar_image_client() -> PetAvatarImageClient:
+    from app.ai.bedrock.pet_avatar_image_client import BedrockPetAvatarImageClient
+
     return BedrockPetAvatarImageClient()
 
 
-def get_pet_care_notes_client() -> PetCareNotesClient:
-    return BedrockPetCareNotesClient(SECRET_NAME)
+def get_pet_care_notes_client(
+    prompt_repository: PromptRepository = Depends(get_prompt_repository),
+) -> PetCareNotesClient:
+    from app.ai.bedrock.pet_care_notes_client import BedrockPetCareNotesClient
+
+    return BedrockPetCareNotesClient(SECRET_NAME, prompt_repository)
 
 
 def get_pet_care_tasks_client(
-    image_repository: ImageRepository = Depends(get_image_repository),
+    prompt_repository: PromptRepository = Depends(get_prompt_repository),
+    image_preprocessor: ImagePreprocessor = Depends(get_image_preprocessor),
 ) -> PetCareTasksClient:
-    return BedrockPetCareTasksClient(SECRET_NAME, image_repository)
+    from app.ai.bedrock.pet_care_tasks_client import BedrockPetCareTasksClient
+
+    return BedrockPetCareTasksClient(SECRET_NAME, prompt_repository, image_preprocessor)
 
 
 def get_pet_care_advice_client(
-    image_repository: ImageRepository = Depends(get_image_repository),
+    prompt_repository: PromptRepository = Depends(get_prompt_repository),
+    image_preprocessor: ImagePreprocessor = Depends(get_image_preprocessor),
 ) -> PetCareAdviceClient:
-    return BedrockPetCareAdviceClient(SECRET_NAME, image_repository)
+    from app.ai.bedrock.pet_care_advice_client import BedrockPetCareAdviceClient
+
+    return BedrockPetCareAdviceClient(SECRET_NAME, prompt_repository, image_preprocessor)
 
 
 def get_pet_chat_assistant(
+    prompt_repository: PromptRepository = Depends(get_prompt_repository),
     chat_repository: ChatRepository = Depends(get_chat_repository),
 ) -> PetChatAssistant:
-    return BedrockPetChatAssistant(SECRET_NAME, chat_repository)
+    from app.ai.bedrock.pet_chat_assistant import BedrockPetChatAssistant
+
+    return BedrockPetChatAssistant(SECRET_NAME, prompt_repository, chat_repository)
 
 
 def get_get_user_service(
@@ -105,6 +305,12 @@ def get_get_user_service(
     return GetUserService(user_repository)
 
 
+def get_get_users_service(
+    user_repository: UserRepository = Depends(get_user_repository),
+) -> GetUsersService:
+    return GetUsersService(user_repository)
+
+
 def get_create_user_service(
     user_repository: UserRepository = Depends(get_user_repository),
 ) -> CreateUserService:
@@ -123,12 +329,19 @@ def get_get_pet_service(
     return GetPetService(pet_repository)
 
 
+def get_get_pets_service(
+    pet_repository: PetRepository = Depends(get_pet_repository),
+) -> GetPetsService:
+    return GetPetsService(pet_repository)
+
+
 def get_create_pet_service(
     pet_picture_description_client: PetPictureDescriptionClient = Depends(get_pet_picture_description_client),  # noqa: E501
     pet_avatar_image_client: PetAvatarImageClient = Depends(get_pet_avatar_image_client),
     pet_care_notes_client: PetCareNotesClient = Depends(get_pet_care_notes_client),
     pet_repository: PetRepository = Depends(get_pet_repository),
     image_repository: ImageRepository = Depends(get_image_repository),
+    checkpoint_repository: PetCreationCheckpointRepository = Depends(get_pet_creation_checkpoint_repository),  # noqa: E501
 ) -> CreatePetService:  # fmt: skip
     return CreatePetService(
         pet_picture_description_client,
@@ -136,6 +349,7 @@ def get_create_pet_service(
         pet_care_notes_client,
         pet_repository,
         image_repository,
+        checkpoint_repository,
     )
 
 
@@ -145,6 +359,18 @@ def get_get_diary_service(
     return GetDiaryService(diary_repository)
 
 
+def get_get_diaries_service(
+    diary_repository: DiaryRepository = Depends(get_diary_repository),
+) -> GetDiariesService:
+    return GetDiariesService(diary_repository)
+
+
+def get_list_diaries_service(
+    diary_repository: DiaryRepository = Depends(get_diary_repository),
+) -> ListDiariesService:
+    return ListDiariesService(diary_repository)
+
+
 def get_create_diary_service(
     pet_care_tasks_client: PetCareTasksClient = Depends(get_pet_care_tasks_client),
     pet_care_advice_client: PetCareAdviceClient = Depends(get_pet_care_advice_client),
@@ -156,31 +382,137 @@ def get_create_diary_service(
         diary_repository,
     )
 
+
 def get_update_diary_service(
     diary_repository: DiaryRepository = Depends(get_diary_repository),
 ) -> UpdateDiaryService:
-    return UpdateDiaryService(diary_repository)
+    return UpdateDiaryService(diary_repository, ALLOW_UNVERSIONED_UPDATE)
+
+
+def get_update_diary_task_service(
+    diary_repository: DiaryRepository = Depends(get_diary_repository),
+) -> UpdateDiaryTaskService:
+    return UpdateDiaryTaskService(diary_repository)
+
 
 def get_get_chat_service(
     chat_repository: ChatRepository = Depends(get_chat_repository),
+    pet_repository: PetRepository = Depends(get_pet_repository),
 ) -> GetChatService:
-    return GetChatService(chat_repository)
+    return GetChatService(chat_repository, pet_repository)
 
 
 def get_chat_service(
     pet_chat_assistant: PetChatAssistant = Depends(get_pet_chat_assistant),
     chat_repository: ChatRepository = Depends(get_chat_repository),
 ) -> ChatService:
-    return ChatService(pet_chat_assistant, chat_repository)
+    return ChatService(pet_chat_assistant, chat_repository, CHAT_WRITE_AHEAD)
 
 
 def get_update_pet_service(
     pet_repository: PetRepository = Depends(get_pet_repository),
 ) -> UpdatePetService:
-    return UpdatePetService(pet_repository)
+    return UpdatePetService(pet_repository, ALLOW_UNVERSIONED_UPDATE)
 
 
 def get_get_presigned_url_service(
     image_repository: ImageRepository = Depends(get_image_repository),
 ) -> GetPresignedUrlService:
-    return GetPresignedUrlService(image_repository)
+    return GetPresignedUrlService(image_repository, ALLOW_PRESIGNED_PUT_URL)
+
+
+def get_get_presigned_urls_service(
+    image_repository: ImageRepository = Depends(get_image_repository),
+) -> GetPresignedUrlsService:
+    return GetPresignedUrlsService(image_repository)
+
+
+def get_list_pet_pictures_service(
+    image_repository: ImageRepository = Depends(get_image_repository),
+) -> ListPetPicturesService:
+    return ListPetPicturesService(image_repository)
+
+
+def get_create_upload_policy_service(
+    image_repository: ImageRepository = Depends(get_image_repository),
+) -> CreateUploadPolicyService:
+    return CreateUploadPolicyService(image_repository, UPLOAD_MAX_BYTES, UPLOAD_URL_EXPIRES_IN)
+
+
+def get_create_multipart_upload_service(
+    image_repository: ImageRepository = Depends(get_image_repository),
+) -> CreateMultipartUploadService:
+    return CreateMultipartUploadService(image_repository, UPLOAD_MAX_BYTES, UPLOAD_URL_EXPIRES_IN)
+
+
+def get_complete_multipart_upload_service(
+    image_repository: ImageRepository = Depends(get_image_repository),
+) -> CompleteMultipartUploadService:
+    return CompleteMultipartUploadService(image_repository, UPLOAD_MAX_BYTES)
+
+
+def get_abort_multipart_upload_service(
+    image_repository: ImageRepository = Depends(get_image_repository),
+) -> AbortMultipartUploadService:
+    return AbortMultipartUploadService(image_repository)
+
+
+# API_CONCURRENCY_MODE が async の場合に日記のルーターが使う非同期の実装 (aioboto3 が必要)
+# 同期の関数はスレッドプールで実行されるため，イベントループで実行されるように async で定義する
+
+
+async def get_async_image_repository() -> AsyncImageRepository:
+    from app.repositories.s3.async_image_repository import AsyncS3ImageRepository
+
+    return AsyncS3ImageRepository(IMAGE_BUCKET_NAME, S3_ENDPOINT_URL)
+
+
+async def get_async_diary_repository() -> AsyncDiaryRepository:
+    from app.repositories.dynamodb.async_diary_repository import AsyncDynamoDBDiaryRepository
+
+    return AsyncDynamoDBDiaryRepository(DIARY_TABLE_NAME, DYNAMODB_ENDPOINT_URL)
+
+
+async def get_async_image_preprocessor(
+    image_repository: AsyncImageRepository = Depends(get_async_image_repository),
+) -> AsyncImagePreprocessor:
+    from app.ai.bedrock.async_image_preprocessor import AsyncImagePreprocessor
+
+    # 同じリクエストの中では同じインスタンスが使われるため，画像の前処理は1回で済む
+    return AsyncImagePreprocessor(image_repository, MODEL_IMAGE_MAX_EDGE, MODEL_IMAGE_QUALITY)
+
+
+async def get_async_pet_care_tasks_client(
+    prompt_repository: PromptRepository = Depends(get_prompt_repository),
+    image_preprocessor: AsyncImagePreprocessor = Depends(get_async_image_preprocessor),
+) -> AsyncPetCareTasksClient:
+    from app.ai.bedrock.async_pet_care_tasks_client import AsyncBedrockPetCareTasksClient
+
+    return AsyncBedrockPetCareTasksClient(SECRET_NAME, prompt_repository, image_preprocessor)
+
+
+async def get_async_pet_care_advice_client(
+    prompt_repository: PromptRepository = Depends(get_prompt_repository),
+    image_preprocessor: AsyncImagePreprocessor = Depends(get_async_image_preprocessor),
+) -> AsyncPetCareAdviceClient:
+    from app.ai.bedrock.async_pet_care_advice_client import AsyncBedrockPetCareAdviceClient
+
+    return AsyncBedrockPetCareAdviceClient(SECRET_NAME, prompt_repository, image_preprocessor)
+
+
+async def get_async_get_diary_service(
+    diary_repository: AsyncDiaryRepository = Depends(get_async_diary_repository),
+) -> AsyncGetDiaryService:
+    return AsyncGetDiaryService(diary_repository)
+
+
+async def get_async_create_diary_service(
+    pet_care_tasks_client: AsyncPetCareTasksClient = Depends(get_async_pet_care_tasks_client),
+    pet_care_advice_client: AsyncPetCareAdviceClient = Depends(get_async_pet_care_advice_client),
+    diary_repository: AsyncDiaryRepository = Depends(get_async_diary_repository),
+) -> AsyncCreateDiaryService:
+    return AsyncCreateDiaryService(
+        pet_care_tasks_client,
+        pet_care_advice_client,
+        diary_repository,
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import UTC, datetime, timedelta
+
+from fastapi import HTTPException, Response, status
+
+# 条件付きのGETで返す 304 Not Modified (OpenAPIのスキーマに載せる)
+NOT_MODIFIED_RESPONSES = {
+    status.HTTP_304_NOT_MODIFIED: {
+        "description": "If-None-Match のETagと一致した場合は本文を返さない",
+    },
+}
+
+# 条件付きの更新で返す 412 Precondition Failed (OpenAPIのスキーマに載せる)
+PRECONDITION_FAILED_RESPONSES = {
+    status.HTTP_412_PRECONDITION_FAILED: {
+        "description": "If-Match のETagが最新のバージョンと一致しない場合",
+    },
+}
+
+# 更新でバージョンを指定しなかった場合に返す 428 Precondition Required (OpenAPIのスキーマに載せる)
+PRECONDITION_REQUIRED_RESPONSES = {
+    status.HTTP_428_PRECONDITION_REQUIRED: {
+        "description": "If-Match と本文の version のどちらも指定しなかった場合",
+    },
+}
+
+# build_version_etag で作成したETag ("<バージョン>-<更新日時のエポックからのマイクロ秒>")
+VERSION_ETAG_PATTERN = re.compile(r'^"(\d+)-(\d+)"$')
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def build_etag(*parts: object) -> str:
+    """
+    レスポンスの内容を決める値から強いETagを作成する
+
+    Args:
+        *parts (object): レスポンスの内容を決める値 (文字列に変換してハッシュを求める)
+
+    Returns:
+        str: ダブルクォートで囲んだETag
+    """
+    digest = hashlib.sha256("\x1f".join(map(str, parts)).encode()).hexdigest()
+
+    return f'"{digest[:32]}"'
+
+
+def build_version_etag(version: int, updated_at: datetime) -> str:
+    """
+    バージョンを持つ項目の強いETagを作成する
+
+    Args:
+        version (int): 項目のバージョン (更新のたびに増える)
+        updated_at (datetime): 項目の更新日時
+
+    Returns:
+        str: ダブルクォートで囲んだETag ("<バージョン>-<更新日時のエポックからのマイクロ秒>")
+
+    Notes:
+        作成し直した項目はバージョンが0に戻るため，更新日時も含める．
+        If-Match ではETagから両方を取り出し，最新の項目の版と比べてから書き込む
+    """
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=UTC)
+
+    return f'"{version}-{(updated_at - EPOCH) // timedelta(microseconds=1)}"'
+
+
+def parse_etags(header: str) -> list[str]:
+    """
+    If-None-Match や If-Match のヘッダーからETagを取り出す
+
+    Args:
+        header (str): ヘッダーの値 (カンマ区切り)
+
+    Returns:
+        list[str]: ETag (弱いETagの W/ は取り除く)
+    """
+    return [etag.strip().removeprefix("W/") for etag in header.split(",") if etag.strip()]
+
+
+def is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Match のETagが現在のETagと一致するか確認する
+
+    Args:
+        if_none_match (str | None): If-None-Match ヘッダーの値
+        etag (str): 現在のETag
+
+    Returns:
+        bool: 一致する場合はTrue (304を返す)
+
+    Notes:
+        RFC 9110 に従い，If-None-Match では弱い比較を行う
+    """
+    if if_none_match is None:
+        return False
+
+    etags = parse_etags(if_none_match)
+
+    return "*" in etags or etag in etags
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    304 Not Modified のレスポンスを作成する (本文はシリアライズしない)
+
+    Args:
+        etag (str): 現在のETag
+
+    Returns:
+        Response: 本文のないレスポンス
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def is_if_match_any(if_match: str | None) -> bool:
+    """
+    If-Match が * (項目が存在すれば条件を問わない) か確認する
+
+    Args:
+        if_match (str | None): If-Match ヘッダーの値
+
+    Returns:
+        bool: * の場合はTrue (存在する項目だけをバージョンを確認せずに更新する)
+    """
+    return if_match is not None and if_match.strip() == "*"
+
+
+def get_if_match_revision(if_match: str | None) -> tuple[datetime, int] | None:
+    """
+    If-Match ヘッダーから書き込みの条件にする版 (更新日時とバージョン) を取り出す
+
+    Args:
+        if_match (str | None): If-Match ヘッダーの値
+
+    Returns:
+        tuple[datetime, int] | None: 期待する更新日時とバージョン
+            (ヘッダーがない場合や * の場合はNone．* は is_if_match_any で確認する)
+
+    Raises:
+        HTTPException: 強いETagを1つだけ指定していない場合 (412)
+    """
+    if if_match is None:
+        return None
+
+    etags = [etag.strip() for etag in if_match.split(",") if etag.strip()]
+
+    if etags == ["*"]:
+        return None
+
+    # If-Match は強い比較のため，弱いETagや build_version_etag で作成していないETagは一致しない
+    match = VERSION_ETAG_PATTERN.match(etags[0]) if len(etags) == 1 else None
+
+    if match is None:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match には取得したときのETagを1つだけ指定してください",
+        )
+
+    return EPOCH + timedelta(microseconds=int(match.group(2))), int(match.group(1))
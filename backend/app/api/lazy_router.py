@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import importlib
+import threading
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI
+
+
+@dataclass(frozen=True)
+class LazyRouter:
+    """最初のリクエストまで読み込みを遅らせるルーター"""
+
+    # ルーターを定義しているモジュール (router という名前の APIRouter を持つ)
+    module_name: str
+    prefix: str
+    tags: list[str] = field(default_factory=list)
+
+
+class LazyRouterLoader:
+    """
+    リクエストのパスに対応するルーターだけをインポートしてアプリに追加する
+
+    ルーターのモジュールはサービスやリポジトリを通じて多くのモジュールを読み込むため，
+    コールドスタートでは使うルーターだけを読み込む．
+    """
+
+    def __init__(self, app: FastAPI, routers: list[LazyRouter]) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            app (FastAPI): ルーターを追加するアプリ
+            routers (list[LazyRouter]): ルーター (ルートを照合する順に並べる)
+        """
+        self.app = app
+        self.routers = routers
+        self.loaded: set[str] = set()
+        self.lock = threading.Lock()
+
+    def load_for_path(self, path: str) -> None:
+        """
+        パスに対応するルーターを読み込む
+
+        Args:
+            path (str): リクエストのパス
+
+        Notes:
+            プレフィックスの最初のパスパラメーターより前の部分でパスを照合する．
+            同じ部分を持つルーター (/pets と /pets/{pet_id}/diaries など) はまとめて読み込む
+        """
+        self.load(
+            [
+                router
+                for router in self.routers
+                if is_path_under(path, router.prefix.split("{", 1)[0].rstrip("/"))
+            ]
+        )
+
+    def load_all(self) -> None:
+        """
+        すべてのルーターを読み込む (OpenAPIのスキーマを作るときなど)
+        """
+        self.load(self.routers)
+
+    def load(self, routers: list[LazyRouter]) -> None:
+        if all(router.module_name in self.loaded for router in routers):
+            return
+
+        with self.lock:
+            # 定義した順に追加して，ルートを照合する順序を変えない
+            for router in self.routers:
+                if router not in routers or router.module_name in self.loaded:
+                    continue
+
+                module = importlib.import_module(router.module_name)
+                self.app.include_router(module.router, prefix=router.prefix, tags=router.tags)
+                self.loaded.add(router.module_name)
+
+            # 追加したルートが含まれるようにOpenAPIのスキーマを作り直す
+            self.app.openapi_schema = None
+
+
+def is_path_under(path: str, prefix: str) -> bool:
+    return path == prefix or path.startswith(f"{prefix}/")
+
+
+class LazyRouterMiddleware:
+    """
+    リクエストを処理する前に，パスに対応するルーターを読み込むASGIミドルウェア
+    """
+
+    def __init__(self, app, loader: LazyRouterLoader) -> None:
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+
+            if path == self.loader.app.openapi_url:
+                self.loader.load_all()
+            else:
+                self.loader.load_for_path(path)
+
+        await self.app(scope, receive, send)
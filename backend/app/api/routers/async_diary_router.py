@@ -0,0 +1,96 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+
+from app.api.dependencies import (
+    get_async_create_diary_service,
+    get_async_get_diary_service,
+)
+from app.api.etag import (
+    NOT_MODIFIED_RESPONSES,
+    build_version_etag,
+    is_not_modified,
+    not_modified_response,
+)
+from app.api.routers.diary_router import router as diary_router
+from app.api.schemas.diary_schema import CreateDiaryResponseBody
+from app.services.diary_service.async_create_diary_service import AsyncCreateDiaryService
+from app.services.diary_service.async_get_diary_service import AsyncGetDiaryService
+from app.services.diary_service.create_diary_service import (
+    CreateDiaryServiceRequest,
+    CreateDiaryServiceResponse,
+)
+from app.services.diary_service.get_diary_service import (
+    GetDiaryServiceRequest,
+    GetDiaryServiceResponse,
+)
+
+# API_CONCURRENCY_MODE が async の場合に diary_router の代わりに使うルーター
+# Bedrockの呼び出しを待つ日記の作成と，作成後に続けて呼ばれる取得だけをイベントループで処理する
+router = APIRouter()
+
+
+@router.get(
+    "/{date}",
+    response_model=GetDiaryServiceResponse,
+    tags=["Diary"],
+    summary="日記を取得する",
+    operation_id="get_diary",
+    responses=NOT_MODIFIED_RESPONSES,
+)
+async def get_diary(
+    pet_id: str,
+    date: date,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    get_diary_service: AsyncGetDiaryService = Depends(get_async_get_diary_service),
+):
+    request = GetDiaryServiceRequest(pet_id=pet_id, date=date)
+    service_response = await get_diary_service.execute(request)
+
+    if service_response is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="日記が見つかりませんでした",
+        )
+
+    etag = build_version_etag(service_response.version, service_response.updated_at)
+    if is_not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return service_response
+
+
+@router.post(
+    "/{date}",
+    response_model=CreateDiaryServiceResponse,
+    tags=["Diary"],
+    summary="日記を作成する",
+    operation_id="create_diary",
+)
+async def create_diary(
+    pet_id: str,
+    date: date,
+    request_body: CreateDiaryResponseBody,
+    create_diary_service: AsyncCreateDiaryService = Depends(get_async_create_diary_service),
+):
+    request = CreateDiaryServiceRequest(
+        pet_id=pet_id,
+        category=request_body.category,
+        birth_date=request_body.birth_date,
+        date=date,
+        picture_name=request_body.picture_name,
+        weather=request_body.weather,
+        temperature=request_body.temperature,
+    )
+
+    return await create_diary_service.execute(request)
+
+
+# 一覧と更新はDynamoDBを短時間呼び出すだけのため，同期版のルートをそのまま使う
+router.routes.extend(
+    route
+    for route in diary_router.routes
+    if getattr(route, "operation_id", None) not in {"get_diary", "create_diary"}
+)
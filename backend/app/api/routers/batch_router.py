@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.dependencies import (
+    get_get_diaries_service,
+    get_get_pets_service,
+    get_get_users_service,
+)
+from app.api.schemas.batch_schema import (
+    GetDiariesRequestBody,
+    GetPetsRequestBody,
+    GetUsersRequestBody,
+)
+from app.exceptions.batch_get_exception import BatchGetException
+from app.services.diary_service.get_diaries_service import (
+    GetDiariesService,
+    GetDiariesServiceRequest,
+    GetDiariesServiceResponse,
+)
+from app.services.pet_service.get_pets_service import (
+    GetPetsService,
+    GetPetsServiceRequest,
+    GetPetsServiceResponse,
+)
+from app.services.user_service.get_users_service import (
+    GetUsersService,
+    GetUsersServiceRequest,
+    GetUsersServiceResponse,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/pets",
+    response_model=GetPetsServiceResponse,
+    tags=["Batch"],
+    summary="複数のペットをまとめて取得する",
+    operation_id="get_pets",
+)
+def get_pets(
+    request_body: GetPetsRequestBody,
+    get_pets_service: GetPetsService = Depends(get_get_pets_service),
+):
+    request = GetPetsServiceRequest(pet_ids=request_body.pet_ids)
+
+    try:
+        return get_pets_service.execute(request)
+    except BatchGetException:
+        raise_service_unavailable()
+
+
+@router.post(
+    "/users",
+    response_model=GetUsersServiceResponse,
+    tags=["Batch"],
+    summary="複数のユーザーをまとめて取得する",
+    operation_id="get_users",
+)
+def get_users(
+    request_body: GetUsersRequestBody,
+    get_users_service: GetUsersService = Depends(get_get_users_service),
+):
+    request = GetUsersServiceRequest(user_ids=request_body.user_ids)
+
+    try:
+        return get_users_service.execute(request)
+    except BatchGetException:
+        raise_service_unavailable()
+
+
+@router.post(
+    "/diaries",
+    response_model=GetDiariesServiceResponse,
+    tags=["Batch"],
+    summary="複数の日記をまとめて取得する",
+    operation_id="get_diaries",
+)
+def get_diaries(
+    request_body: GetDiariesRequestBody,
+    get_diaries_service: GetDiariesService = Depends(get_get_diaries_service),
+):
+    request = GetDiariesServiceRequest(keys=request_body.keys)
+
+    try:
+        return get_diaries_service.execute(request)
+    except BatchGetException:
+        raise_service_unavailable()
+
+
+def raise_service_unavailable() -> None:
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="一部の項目を取得できませんでした．時間をおいて再度お試しください",
+    )
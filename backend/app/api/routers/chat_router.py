@@ -1,7 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from collections.abc import Iterator
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import get_chat_service, get_get_chat_service
+from app.api.etag import (
+    NOT_MODIFIED_RESPONSES,
+    build_etag,
+    is_not_modified,
+    not_modified_response,
+)
 from app.api.schemas.chat_schema import ChatRequestBody
+from app.exceptions.chat_response_exception import ChatResponseException
+from app.exceptions.invalid_cursor_exception import InvalidCursorException
 from app.exceptions.pet_not_found_exception import PetNotFoundException
 from app.models.chat import ChatMessage
 from app.services.chat_service.chat_service import ChatService, ChatServiceRequest
@@ -12,6 +24,9 @@ from app.services.chat_service.get_chat_service import (
 
 router = APIRouter()
 
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get(
     "",
@@ -19,28 +34,58 @@ router = APIRouter()
     tags=["Chat"],
     summary="チャット履歴を取得する",
     operation_id="get_chat",
+    responses={
+        status.HTTP_200_OK: {
+            "description": (
+                "新しいメッセージから limit 件を古い順に返す．"
+                f"続きがある場合は {NEXT_CURSOR_HEADER} ヘッダーに次のページのカーソルを返す"
+            ),
+        },
+        **NOT_MODIFIED_RESPONSES,
+    },
 )
 def get_chat(
     pet_id: str,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
     get_chat_service: GetChatService = Depends(get_get_chat_service),
 ):
-    request = GetChatServiceRequest(pet_id=pet_id)
+    request = GetChatServiceRequest(pet_id=pet_id, limit=limit, cursor=cursor)
 
     try:
-        response = get_chat_service.execute(request)
+        service_response = get_chat_service.execute(request)
     except PetNotFoundException:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="ペットが見つかりませんでした",
         )
+    except InvalidCursorException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルの形式が不正です",
+        )
 
-    if response is None:
+    if service_response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="チャット履歴が見つかりませんでした",
         )
 
-    return [message.content for message in response.chat_history]
+    # メッセージは追加されるだけで書き換わらないため，ページ内のメッセージからETagを作る
+    etag = build_etag(
+        service_response.next_cursor,
+        *((message.created_at, message.content) for message in service_response.chat_history),
+    )
+    if is_not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    if service_response.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = service_response.next_cursor
+
+    return [message.content for message in service_response.chat_history]
 
 
 @router.post(
@@ -49,16 +94,81 @@ def get_chat(
     tags=["Chat"],
     summary="メッセージを送信して応答を得る",
     operation_id="converse",
+    responses={
+        status.HTTP_200_OK: {
+            "content": {
+                EVENT_STREAM_MEDIA_TYPE: {
+                    "schema": {"type": "string"},
+                },
+            },
+            "description": (
+                "Accept ヘッダーに text/event-stream を指定した場合は"
+                "応答を Server-Sent Events で逐次返す"
+            ),
+        },
+    },
 )
 def converse(
     pet_id: str,
     request_body: ChatRequestBody,
+    accept: str | None = Header(default=None),
     chat_service: ChatService = Depends(get_chat_service),
-) -> str:
+):
     request = ChatServiceRequest(
         pet_id=pet_id,
         user_message=ChatMessage(content=request_body.content),
     )
+
+    if accept is not None and EVENT_STREAM_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            to_server_sent_events(chat_service.execute_stream(request)),
+            media_type=EVENT_STREAM_MEDIA_TYPE,
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+            },
+        )
+
     response = chat_service.execute(request)
 
     return response.assistant_response.content
+
+
+def to_server_sent_events(chunks: Iterator[str]) -> Iterator[str]:
+    """
+    応答の断片を Server-Sent Events の形式に変換する
+
+    Args:
+        chunks (Iterator[str]): AIアシスタントからの応答の断片
+
+    Yields:
+        str: message イベント (応答の断片)，完了時の done イベント，失敗時の error イベント
+
+    Notes:
+        ストリーミング開始後はステータスコードを変更できないため，失敗は error イベントで通知する
+    """
+    try:
+        for chunk in chunks:
+            yield format_server_sent_event("message", {"content": chunk})
+    except ChatResponseException:
+        yield format_server_sent_event(
+            "error",
+            {"detail": "チャットの応答を生成する過程で例外が発生しました"},
+        )
+        return
+
+    yield format_server_sent_event("done", {})
+
+
+def format_server_sent_event(event: str, data: dict) -> str:
+    """
+    Server-Sent Events の1イベント分の文字列を生成する
+
+    Args:
+        event (str): イベント名
+        data (dict): イベントのデータ
+
+    Returns:
+        str: イベントの文字列
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
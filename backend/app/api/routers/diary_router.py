@@ -1,16 +1,34 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response, status
 
-from app.api.dependencies import(
+from app.api.dependencies import (
     get_create_diary_service,
     get_get_diary_service,
+    get_list_diaries_service,
     get_update_diary_service,
+    get_update_diary_task_service,
+)
+from app.api.etag import (
+    NOT_MODIFIED_RESPONSES,
+    PRECONDITION_FAILED_RESPONSES,
+    PRECONDITION_REQUIRED_RESPONSES,
+    build_etag,
+    build_version_etag,
+    get_if_match_revision,
+    is_if_match_any,
+    is_not_modified,
+    not_modified_response,
 )
 from app.api.schemas.diary_schema import (
     CreateDiaryResponseBody,
     UpdateDiaryRequestBody,
+    UpdateDiaryTaskRequestBody,
 )
+from app.exceptions.diary_task_not_found_exception import DiaryTaskNotFoundException
+from app.exceptions.invalid_cursor_exception import InvalidCursorException
+from app.exceptions.version_conflict_exception import VersionConflictException
+from app.exceptions.version_required_exception import VersionRequiredException
 from app.services.diary_service.create_diary_service import (
     CreateDiaryService,
     CreateDiaryServiceRequest,
@@ -21,37 +39,110 @@ from app.services.diary_service.get_diary_service import (
     GetDiaryServiceRequest,
     GetDiaryServiceResponse,
 )
-from app.services.diary_service.update_diary_service import(
+from app.services.diary_service.list_diaries_service import (
+    ListDiariesService,
+    ListDiariesServiceRequest,
+    ListDiariesServiceResponse,
+)
+from app.services.diary_service.update_diary_service import (
     UpdateDiaryService,
     UpdateDiaryServiceRequest,
     UpdateDiaryServiceResponse,
 )
+from app.services.diary_service.update_diary_task_service import (
+    UpdateDiaryTaskService,
+    UpdateDiaryTaskServiceRequest,
+    UpdateDiaryTaskServiceResponse,
+)
 
 router = APIRouter()
 
 
+@router.get(
+    "",
+    response_model=ListDiariesServiceResponse,
+    tags=["Diary"],
+    summary="期間内の日記の一覧を取得する",
+    operation_id="list_diaries",
+    responses=NOT_MODIFIED_RESPONSES,
+)
+def list_diaries(
+    pet_id: str,
+    response: Response,
+    start: date = Query(alias="from"),
+    end: date = Query(alias="to"),
+    limit: int = Query(default=31, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+    list_diaries_service: ListDiariesService = Depends(get_list_diaries_service),
+):
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="期間の開始日は終了日以前の日付を指定してください",
+        )
+
+    request = ListDiariesServiceRequest(
+        pet_id=pet_id,
+        start=start,
+        end=end,
+        limit=limit,
+        cursor=cursor,
+    )
+
+    try:
+        service_response = list_diaries_service.execute(request)
+    except InvalidCursorException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルの形式が不正です",
+        )
+
+    # 概要はバージョンを持たないため，レスポンスに含まれる値からETagを作る
+    etag = build_etag(
+        service_response.next_cursor,
+        *(
+            (diary.date, diary.picture_name, diary.reacted, diary.weather.value, diary.temperature)
+            for diary in service_response.diaries
+        ),
+    )
+    if is_not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return service_response
+
+
 @router.get(
     "/{date}",
     response_model=GetDiaryServiceResponse,
     tags=["Diary"],
     summary="日記を取得する",
     operation_id="get_diary",
+    responses=NOT_MODIFIED_RESPONSES,
 )
 def get_diary(
     pet_id: str,
     date: date,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     get_diary_service: GetDiaryService = Depends(get_get_diary_service),
 ):
     request = GetDiaryServiceRequest(pet_id=pet_id, date=date)
-    response = get_diary_service.execute(request)
+    service_response = get_diary_service.execute(request)
 
-    if response is None:
+    if service_response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="日記が見つかりませんでした",
         )
 
-    return response
+    etag = build_version_etag(service_response.version, service_response.updated_at)
+    if is_not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return service_response
 
 
 @router.post(
@@ -79,30 +170,143 @@ def create_diary(
 
     return create_diary_service.execute(request)
 
+
 @router.put(
     "/{date}",
     response_model=UpdateDiaryServiceResponse,
     tags=["Diary"],
     summary="日記を更新する",
     operation_id="update_diary",
+    responses={**PRECONDITION_FAILED_RESPONSES, **PRECONDITION_REQUIRED_RESPONSES},
 )
 def update_diary(
     pet_id: str,
     date: date,
     request_body: UpdateDiaryRequestBody,
+    response: Response,
+    if_match: str | None = Header(default=None),
     update_diary_service: UpdateDiaryService = Depends(get_update_diary_service),
 ):
+    # If-Match が指定された場合は本文のバージョンより優先し，競合してもマージせずに失敗させる
+    if_match_revision = get_if_match_revision(if_match)
+
+    expected_updated_at, expected_version = if_match_revision or (None, request_body.version)
+
     request = UpdateDiaryServiceRequest(
         pet_id=pet_id,
         date=date,
         reacted=request_body.reacted,
         comment=request_body.comment,
         tasks=request_body.tasks,
+        expected_version=expected_version,
+        require_expected_version=if_match_revision is not None,
+        expected_updated_at=expected_updated_at,
+        unconditional=is_if_match_any(if_match),
     )
-    response = update_diary_service.execute(request)
+
+    try:
+        service_response = update_diary_service.execute(request)
+    except VersionConflictException:
+        raise HTTPException(
+            status_code=(
+                status.HTTP_412_PRECONDITION_FAILED
+                if request.require_expected_version
+                else status.HTTP_409_CONFLICT
+            ),
+            detail="日記が他のリクエストによって更新されています",
+        )
+    except VersionRequiredException:
+        # 取得した時点のバージョンを条件に書き込まないと，他の端末の更新を上書きしてしまう
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match か version で取得した時点の日記のバージョンを指定してください",
+        )
+
+    if service_response is None:
+        raise_diary_not_found(request.unconditional)
+
+    response.headers["ETag"] = build_version_etag(
+        service_response.version, service_response.updated_at
+    )
+    return service_response
+
+
+@router.patch(
+    "/{date}/tasks/{task_index}",
+    response_model=UpdateDiaryTaskServiceResponse,
+    tags=["Diary"],
+    summary="日記のタスクの完了状態を更新する",
+    operation_id="update_diary_task",
+)
+def update_diary_task(
+    pet_id: str,
+    date: date,
+    request_body: UpdateDiaryTaskRequestBody,
+    task_index: int = Path(ge=0),
+    update_diary_task_service: UpdateDiaryTaskService = Depends(get_update_diary_task_service),
+):
+    request = UpdateDiaryTaskServiceRequest(
+        pet_id=pet_id,
+        date=date,
+        task_index=task_index,
+        completed=request_body.completed,
+    )
+
+    return execute_update_diary_task(update_diary_task_service, request)
+
+
+@router.patch(
+    "/{date}/tasks/{task_index}/sub_tasks/{sub_task_index}",
+    response_model=UpdateDiaryTaskServiceResponse,
+    tags=["Diary"],
+    summary="日記のサブタスクの完了状態を更新する",
+    operation_id="update_diary_sub_task",
+)
+def update_diary_sub_task(
+    pet_id: str,
+    date: date,
+    request_body: UpdateDiaryTaskRequestBody,
+    task_index: int = Path(ge=0),
+    sub_task_index: int = Path(ge=0),
+    update_diary_task_service: UpdateDiaryTaskService = Depends(get_update_diary_task_service),
+):
+    request = UpdateDiaryTaskServiceRequest(
+        pet_id=pet_id,
+        date=date,
+        task_index=task_index,
+        sub_task_index=sub_task_index,
+        completed=request_body.completed,
+    )
+
+    return execute_update_diary_task(update_diary_task_service, request)
+
+
+def execute_update_diary_task(
+    update_diary_task_service: UpdateDiaryTaskService,
+    request: UpdateDiaryTaskServiceRequest,
+) -> UpdateDiaryTaskServiceResponse:
+    try:
+        response = update_diary_task_service.execute(request)
+    except DiaryTaskNotFoundException:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="タスクが見つかりませんでした",
+        )
+
     if response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="日記が見つかりませんでした",
         )
+
     return response
+
+
+def raise_diary_not_found(unconditional: bool) -> None:
+    # If-Match: * は項目が存在する場合だけ更新するため，存在しない場合は 412 を返す (RFC 9110)
+    raise HTTPException(
+        status_code=(
+            status.HTTP_412_PRECONDITION_FAILED if unconditional else status.HTTP_404_NOT_FOUND
+        ),
+        detail="日記が見つかりませんでした",
+    )
@@ -1,7 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
 from app.api.dependencies import get_create_pet_service, get_get_pet_service, get_update_pet_service
+from app.api.etag import (
+    NOT_MODIFIED_RESPONSES,
+    PRECONDITION_FAILED_RESPONSES,
+    PRECONDITION_REQUIRED_RESPONSES,
+    build_version_etag,
+    get_if_match_revision,
+    is_if_match_any,
+    is_not_modified,
+    not_modified_response,
+)
 from app.api.schemas.pet_schema import CreatePetRequestBody, UpdatePetRequestBody
+from app.exceptions.version_conflict_exception import VersionConflictException
+from app.exceptions.version_required_exception import VersionRequiredException
 from app.services.pet_service.create_pet_service import (
     CreatePetService,
     CreatePetServiceRequest,
@@ -13,10 +25,11 @@ from app.services.pet_service.get_pet_service import (
     GetPetServiceResponse,
 )
 from app.services.pet_service.update_pet_service import (
-    UpdatePetService, 
-    UpdatePetServiceResponse, 
-    UpdatePetServiceRequest, 
+    UpdatePetService,
+    UpdatePetServiceRequest,
+    UpdatePetServiceResponse,
 )
+
 router = APIRouter()
 
 
@@ -26,21 +39,29 @@ router = APIRouter()
     tags=["Pet"],
     summary="ペットを取得する",
     operation_id="get_pet",
+    responses=NOT_MODIFIED_RESPONSES,
 )
 def get_pet(
     pet_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     get_pet_service: GetPetService = Depends(get_get_pet_service),
 ):
     request = GetPetServiceRequest(pet_id=pet_id)
-    response = get_pet_service.execute(request)
+    service_response = get_pet_service.execute(request)
 
-    if response is None:
+    if service_response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="ペットが見つかりませんでした",
         )
 
-    return response
+    etag = build_version_etag(service_response.version, service_response.updated_at)
+    if is_not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return service_response
 
 
 @router.post(
@@ -66,28 +87,68 @@ def create_pet(
 
     return create_pet_service.execute(request)
 
+
 @router.put(
     "/{pet_id}",
     response_model=UpdatePetServiceResponse,
     tags=["Pet"],
     summary="ペットを更新する",
     operation_id="update_pet",
+    responses={**PRECONDITION_FAILED_RESPONSES, **PRECONDITION_REQUIRED_RESPONSES},
 )
 def update_pet(
     pet_id: str,
     request_body: UpdatePetRequestBody,
+    response: Response,
+    if_match: str | None = Header(default=None),
     update_pet_service: UpdatePetService = Depends(get_update_pet_service),
 ):
+    # If-Match が指定された場合は本文のバージョンより優先し，競合しても再試行しない
+    if_match_revision = get_if_match_revision(if_match)
+
+    expected_updated_at, expected_version = if_match_revision or (None, request_body.version)
+
     request = UpdatePetServiceRequest(
         pet_id=pet_id,
-        care_notes=request_body.care_notes
+        care_notes=request_body.care_notes,
+        expected_version=expected_version,
+        require_expected_version=if_match_revision is not None,
+        expected_updated_at=expected_updated_at,
+        unconditional=is_if_match_any(if_match),
     )
-    response = update_pet_service.execute(request)
 
-    if response is None:
+    try:
+        service_response = update_pet_service.execute(request)
+    except VersionConflictException:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ペットが見つかりませんでした",
+            status_code=(
+                status.HTTP_412_PRECONDITION_FAILED
+                if request.require_expected_version
+                else status.HTTP_409_CONFLICT
+            ),
+            detail="ペットが他のリクエストによって更新されています",
+        )
+    except VersionRequiredException:
+        # 取得した時点のバージョンを条件に書き込まないと，他の端末の更新を上書きしてしまう
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match か version で取得した時点のペットのバージョンを指定してください",
         )
 
-    return response
\ No newline at end of file
+    if service_response is None:
+        raise_pet_not_found(request.unconditional)
+
+    response.headers["ETag"] = build_version_etag(
+        service_response.version, service_response.updated_at
+    )
+    return service_response
+
+
+def raise_pet_not_found(unconditional: bool) -> None:
+    # If-Match: * は項目が存在する場合だけ更新するため，存在しない場合は 412 を返す (RFC 9110)
+    raise HTTPException(
+        status_code=(
+            status.HTTP_412_PRECONDITION_FAILED if unconditional else status.HTTP_404_NOT_FOUND
+        ),
+        detail="ペットが見つかりませんでした",
+    )
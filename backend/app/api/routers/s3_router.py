@@ -1,13 +1,61 @@
 from typing import Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from app.api.dependencies import get_get_presigned_url_service
+from app.api.dependencies import (
+    get_abort_multipart_upload_service,
+    get_complete_multipart_upload_service,
+    get_create_multipart_upload_service,
+    get_create_upload_policy_service,
+    get_get_presigned_url_service,
+    get_get_presigned_urls_service,
+    get_list_pet_pictures_service,
+)
+from app.api.schemas.s3_schema import (
+    CompleteMultipartUploadRequestBody,
+    CreateMultipartUploadRequestBody,
+    CreateUploadPolicyRequestBody,
+    GetPresignedUrlsRequestBody,
+)
+from app.exceptions.invalid_cursor_exception import InvalidCursorException
+from app.exceptions.invalid_upload_part_exception import InvalidUploadPartException
+from app.exceptions.presigned_put_url_disabled_exception import PresignedPutUrlDisabledException
+from app.exceptions.upload_not_found_exception import UploadNotFoundException
+from app.exceptions.upload_too_large_exception import UploadTooLargeException
+from app.services.s3_service.abort_multipart_upload_service import (
+    AbortMultipartUploadService,
+    AbortMultipartUploadServiceRequest,
+)
+from app.services.s3_service.complete_multipart_upload_service import (
+    CompleteMultipartUploadService,
+    CompleteMultipartUploadServiceRequest,
+    CompleteMultipartUploadServiceResponse,
+)
+from app.services.s3_service.create_multipart_upload_service import (
+    CreateMultipartUploadService,
+    CreateMultipartUploadServiceRequest,
+    CreateMultipartUploadServiceResponse,
+)
+from app.services.s3_service.create_upload_policy_service import (
+    CreateUploadPolicyService,
+    CreateUploadPolicyServiceRequest,
+    CreateUploadPolicyServiceResponse,
+)
 from app.services.s3_service.get_presigned_url_service import (
     GetPresignedUrlService,
     GetPresignedUrlServiceRequest,
     GetPresignedUrlServiceResponse,
 )
+from app.services.s3_service.get_presigned_urls_service import (
+    GetPresignedUrlsService,
+    GetPresignedUrlsServiceRequest,
+    GetPresignedUrlsServiceResponse,
+)
+from app.services.s3_service.list_pet_pictures_service import (
+    ListPetPicturesService,
+    ListPetPicturesServiceRequest,
+    ListPetPicturesServiceResponse,
+)
 
 router = APIRouter()
 
@@ -31,4 +79,176 @@ def get_presigned_url(
         http_method=http_method,
     )
 
-    return get_presigned_url_service.execute(request)
+    try:
+        return get_presigned_url_service.execute(request)
+    except PresignedPutUrlDisabledException as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e),
+        )
+
+
+@router.post(
+    "/presigned-urls",
+    response_model=GetPresignedUrlsServiceResponse,
+    tags=["S3"],
+    summary="複数のファイルの閲覧用の署名付きURLをまとめて取得する",
+    operation_id="get_presigned_urls",
+)
+def get_presigned_urls(
+    pet_id: str,
+    request_body: GetPresignedUrlsRequestBody,
+    get_presigned_urls_service: GetPresignedUrlsService = Depends(get_get_presigned_urls_service),
+):
+    request = GetPresignedUrlsServiceRequest(
+        pet_id=pet_id,
+        file_names=request_body.file_names,
+    )
+
+    return get_presigned_urls_service.execute(request)
+
+
+@router.get(
+    "/pictures",
+    response_model=ListPetPicturesServiceResponse,
+    tags=["S3"],
+    summary="ペットの画像の一覧を閲覧用の署名付きURLとともに取得する",
+    operation_id="list_pet_pictures",
+)
+def list_pet_pictures(
+    pet_id: str,
+    limit: int = Query(default=30, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    list_pet_pictures_service: ListPetPicturesService = Depends(get_list_pet_pictures_service),
+):
+    request = ListPetPicturesServiceRequest(pet_id=pet_id, limit=limit, cursor=cursor)
+
+    try:
+        return list_pet_pictures_service.execute(request)
+    except InvalidCursorException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルの形式が不正です",
+        )
+
+
+@router.post(
+    "/upload-policy",
+    response_model=CreateUploadPolicyServiceResponse,
+    tags=["S3"],
+    summary="サイズと形式を制限した画像のアップロード用の署名付きPOSTを取得する",
+    operation_id="create_upload_policy",
+)
+def create_upload_policy(
+    pet_id: str,
+    file_name: str,
+    request_body: CreateUploadPolicyRequestBody,
+    create_upload_policy_service: CreateUploadPolicyService = Depends(
+        get_create_upload_policy_service
+    ),
+):
+    request = CreateUploadPolicyServiceRequest(
+        pet_id=pet_id,
+        file_name=file_name,
+        content_type=request_body.content_type,
+    )
+
+    return create_upload_policy_service.execute(request)
+
+
+@router.post(
+    "/multipart-uploads",
+    response_model=CreateMultipartUploadServiceResponse,
+    tags=["S3"],
+    summary="マルチパートアップロードを開始し，パートごとの署名付きURLを取得する",
+    operation_id="create_multipart_upload",
+)
+def create_multipart_upload(
+    pet_id: str,
+    file_name: str,
+    request_body: CreateMultipartUploadRequestBody,
+    create_multipart_upload_service: CreateMultipartUploadService = Depends(
+        get_create_multipart_upload_service
+    ),
+):
+    request = CreateMultipartUploadServiceRequest(
+        pet_id=pet_id,
+        file_name=file_name,
+        content_type=request_body.content_type,
+        file_size=request_body.file_size,
+    )
+
+    try:
+        return create_multipart_upload_service.execute(request)
+    except UploadTooLargeException as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+
+
+@router.post(
+    "/multipart-uploads/{upload_id}/complete",
+    response_model=CompleteMultipartUploadServiceResponse,
+    tags=["S3"],
+    summary="アップロードしたパートのサイズを確認してマルチパートアップロードを完了する",
+    operation_id="complete_multipart_upload",
+)
+def complete_multipart_upload(
+    pet_id: str,
+    file_name: str,
+    upload_id: str,
+    request_body: CompleteMultipartUploadRequestBody,
+    complete_multipart_upload_service: CompleteMultipartUploadService = Depends(
+        get_complete_multipart_upload_service
+    ),
+):
+    request = CompleteMultipartUploadServiceRequest(
+        pet_id=pet_id,
+        file_name=file_name,
+        upload_id=upload_id,
+        parts=request_body.parts,
+    )
+
+    try:
+        return complete_multipart_upload_service.execute(request)
+    except UploadTooLargeException as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+    except UploadNotFoundException:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="アップロードが見つかりませんでした",
+        )
+    except InvalidUploadPartException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="アップロードしたパートが一致しません",
+        )
+
+
+@router.delete(
+    "/multipart-uploads/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["S3"],
+    summary="マルチパートアップロードを中止する",
+    operation_id="abort_multipart_upload",
+)
+def abort_multipart_upload(
+    pet_id: str,
+    file_name: str,
+    upload_id: str,
+    abort_multipart_upload_service: AbortMultipartUploadService = Depends(
+        get_abort_multipart_upload_service
+    ),
+):
+    request = AbortMultipartUploadServiceRequest(
+        pet_id=pet_id,
+        file_name=file_name,
+        upload_id=upload_id,
+    )
+    abort_multipart_upload_service.execute(request)
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
 from app.api.dependencies import (
     get_create_user_service,
     get_get_user_service,
     get_update_user_service,
 )
+from app.api.etag import (
+    NOT_MODIFIED_RESPONSES,
+    build_etag,
+    is_not_modified,
+    not_modified_response,
+)
 from app.api.schemas.user_schema import (
     CreateUserRequestBody,
     GetUserResponseBody,
@@ -31,26 +37,35 @@ router = APIRouter()
     tags=["User"],
     summary="ユーザーを取得する",
     operation_id="get_user",
+    responses=NOT_MODIFIED_RESPONSES,
 )
 def get_user(
     user_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     get_user_service: GetUserService = Depends(get_get_user_service),
 ):
     request = GetUserServiceRequest(user_id=user_id)
-    response = get_user_service.execute(request)
+    service_response = get_user_service.execute(request)
 
-    if response is None:
+    if service_response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="ユーザーが見つかりませんでした",
         )
 
+    # ユーザーはバージョンを持たないため，更新のたびに変わる更新日時からETagを作る
+    etag = build_etag(service_response.user_id, service_response.updated_at)
+    if is_not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
     return GetUserResponseBody(
-        user_id=response.user_id,
-        pet_id=response.pet_id,
-        user_name=response.user_name,
-        user_role=response.user_role,
-        password=response.password,
+        user_id=service_response.user_id,
+        pet_id=service_response.pet_id,
+        user_name=service_response.user_name,
+        user_role=service_response.user_role,
+        password=service_response.password,
     )
 
 
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+from app.models.types import NonEmptyId
+from app.services.diary_service.get_diaries_service import DiaryKey
+
+# 1回のリクエストで取得できる項目数の上限
+MAX_BATCH_GET_SIZE = 500
+
+
+class GetPetsRequestBody(BaseModel):
+    pet_ids: list[NonEmptyId] = Field(min_length=1, max_length=MAX_BATCH_GET_SIZE)
+
+
+class GetUsersRequestBody(BaseModel):
+    user_ids: list[NonEmptyId] = Field(min_length=1, max_length=MAX_BATCH_GET_SIZE)
+
+
+class GetDiariesRequestBody(BaseModel):
+    keys: list[DiaryKey] = Field(min_length=1, max_length=MAX_BATCH_GET_SIZE)
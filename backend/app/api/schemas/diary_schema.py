@@ -15,4 +15,9 @@ class CreateDiaryResponseBody(BaseModel):
 class UpdateDiaryRequestBody(BaseModel):
     reacted: bool | None
     comment: str | None
-    tasks: list[DiaryTask] | None
\ No newline at end of file
+    tasks: list[DiaryTask] | None
+    version: int | None = None
+
+
+class UpdateDiaryTaskRequestBody(BaseModel):
+    completed: bool
\ No newline at end of file
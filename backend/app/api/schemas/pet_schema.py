@@ -14,3 +14,4 @@ class CreatePetRequestBody(BaseModel):
 
 class UpdatePetRequestBody(BaseModel):
     care_notes: list[PetCareNote]
+    version: int | None = None
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+
+from app.models.image import ImageContentType, UploadedPart
+
+# 1回のリクエストで署名できるファイル数の上限
+MAX_PRESIGNED_URL_COUNT = 100
+
+
+class GetPresignedUrlsRequestBody(BaseModel):
+    file_names: list[str] = Field(min_length=1, max_length=MAX_PRESIGNED_URL_COUNT)
+
+
+class CreateUploadPolicyRequestBody(BaseModel):
+    content_type: ImageContentType
+
+
+class CreateMultipartUploadRequestBody(BaseModel):
+    content_type: ImageContentType
+    file_size: int = Field(gt=0)
+
+
+class CompleteMultipartUploadRequestBody(BaseModel):
+    parts: list[UploadedPart] = Field(min_length=1)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import AsyncExitStack
+from typing import Any
+
+import aioboto3
+from aiobotocore.config import AioConfig
+
+from app.tracing.timing import instrument_session
+
+# 1つのイベントループで同時に使うAWSへの接続数の上限 (Bedrockの呼び出しを数百件並行させる)
+ASYNC_AWS_MAX_POOL_CONNECTIONS = int(os.getenv("ASYNC_AWS_MAX_POOL_CONNECTIONS", "256"))
+
+
+class AsyncAWSClientRegistry:
+    """
+    aioboto3のクライアントとリソースをイベントループ内で共有するレジストリ
+
+    aioboto3のクライアントは非同期のコンテキストマネージャーで，作成したイベントループの
+    接続プールを使う．そのため，イベントループが変わった場合は作り直す．
+    Lambdaでは Mangum がコンテナ内で同じイベントループを使い続けるため，
+    同期版の AWSClientRegistry と同様にコンテナごとに1回だけ作成する．
+    """
+
+    def __init__(self, config: AioConfig | None = None) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            config (AioConfig | None, optional): クライアントに渡すaiobotocoreの設定
+        """
+        self.session = aioboto3.Session()
+        self.config = config
+
+        # TIMING_ENABLED が有効な場合はAWSのAPI呼び出しごとの処理時間を記録する
+        instrument_session(self.session)
+
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.exit_stack = AsyncExitStack()
+        self.clients: dict[tuple[str, str, str, str | None], Any] = {}
+        self.lock: asyncio.Lock | None = None
+
+    async def client(
+        self,
+        service_name: str,
+        region_name: str,
+        endpoint_url: str | None = None,
+    ) -> Any:
+        """
+        クライアントを取得する (存在しない場合は作成する)
+
+        Args:
+            service_name (str): サービス名
+            region_name (str): リージョン名
+            endpoint_url (str | None, optional): エンドポイントURL
+
+        Returns:
+            Any: aioboto3のクライアント
+        """
+        return await self.get_or_create(
+            ("client", service_name, region_name, endpoint_url),
+            lambda: self.session.client(
+                service_name,
+                region_name=region_name,
+                endpoint_url=endpoint_url,
+                config=self.config,
+            ),
+        )
+
+    async def resource(
+        self,
+        service_name: str,
+        region_name: str,
+        endpoint_url: str | None = None,
+    ) -> Any:
+        """
+        リソースを取得する (存在しない場合は作成する)
+
+        Args:
+            service_name (str): サービス名
+            region_name (str): リージョン名
+            endpoint_url (str | None, optional): エンドポイントURL
+
+        Returns:
+            Any: aioboto3のリソース
+        """
+        return await self.get_or_create(
+            ("resource", service_name, region_name, endpoint_url),
+            lambda: self.session.resource(
+                service_name,
+                region_name=region_name,
+                endpoint_url=endpoint_url,
+                config=self.config,
+            ),
+        )
+
+    async def get_or_create(self, key: tuple[str, str, str, str | None], create) -> Any:
+        loop = asyncio.get_running_loop()
+
+        if self.loop is not loop:
+            # 別のイベントループで作成したクライアントは使えないため破棄する
+            self.loop = loop
+            self.exit_stack = AsyncExitStack()
+            self.clients = {}
+            self.lock = asyncio.Lock()
+
+        if key in self.clients:
+            return self.clients[key]
+
+        async with self.lock:
+            if key not in self.clients:
+                self.clients[key] = await self.exit_stack.enter_async_context(create())
+
+            return self.clients[key]
+
+    async def close(self) -> None:
+        """
+        保持しているクライアントとリソースの接続を閉じて破棄する
+        """
+        await self.exit_stack.aclose()
+        self.clients = {}
+
+
+# コンテナ内で共有するレジストリ
+async_aws_client_registry = AsyncAWSClientRegistry(
+    AioConfig(max_pool_connections=ASYNC_AWS_MAX_POOL_CONNECTIONS)
+)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+from app.tracing.timing import instrument_session
+
+
+class AWSClientRegistry:
+    """
+    boto3のクライアントをコンテナ内で共有するレジストリ
+
+    Lambdaのコンテナが再利用される間はクライアントを作り直さないため，
+    エンドポイントの解決やTLSハンドシェイクはコンテナごとに1回だけになる．
+    リソースはスレッドセーフではないため共有せず，呼び出すたびに共有のクライアントから作成する．
+    """
+
+    def __init__(self, config: Config | None = None) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            config (Config | None, optional): クライアントに渡すbotocoreの設定
+        """
+        # boto3のデフォルトセッションはスレッドセーフではないため専用のセッションを使う
+        self.session = boto3.session.Session()
+        self.config = config
+
+        # TIMING_ENABLED が有効な場合はAWSのAPI呼び出しごとの処理時間を記録する
+        instrument_session(self.session)
+
+        self.clients: dict[tuple[str, str, str | None], Any] = {}
+        self.resource_classes: dict[tuple[str, str, str | None], type] = {}
+        self.created_counts: Counter[tuple[str, str, str, str | None]] = Counter()
+
+        self.lock = threading.Lock()
+
+    def client(
+        self,
+        service_name: str,
+        region_name: str,
+        endpoint_url: str | None = None,
+    ) -> Any:
+        """
+        クライアントを取得する (存在しない場合は作成する)
+
+        Args:
+            service_name (str): サービス名
+            region_name (str): リージョン名
+            endpoint_url (str | None, optional): エンドポイントURL
+
+        Returns:
+            Any: boto3のクライアント
+        """
+        key = (service_name, region_name, endpoint_url)
+
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = self.session.client(
+                    service_name,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=self.config,
+                )
+                self.created_counts[("client", *key)] += 1
+
+            return self.clients[key]
+
+    def resource(
+        self,
+        service_name: str,
+        region_name: str,
+        endpoint_url: str | None = None,
+    ) -> Any:
+        """
+        共有のクライアントを使うリソースを作成する
+
+        Args:
+            service_name (str): サービス名
+            region_name (str): リージョン名
+            endpoint_url (str | None, optional): エンドポイントURL
+
+        Returns:
+            Any: boto3のリソース (呼び出すたびに新しく作成する)
+
+        Notes:
+            boto3のリソースはスレッドセーフではないため，リクエストやスレッドごとに作成する．
+            リソースのクラスだけを保持し，インスタンスの作成ではクライアントを作成しない
+        """
+        key = (service_name, region_name, endpoint_url)
+
+        with self.lock:
+            if key not in self.resource_classes:
+                resource = self.session.resource(
+                    service_name,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=self.config,
+                )
+                self.resource_classes[key] = type(resource)
+                self.created_counts[("resource", *key)] += 1
+
+            resource_class = self.resource_classes[key]
+
+        return resource_class(client=self.client(service_name, region_name, endpoint_url))
+
+    @property
+    def created_count(self) -> int:
+        """
+        これまでに作成したクライアントとリソースのクラスの総数
+
+        Returns:
+            int: 作成したクライアントとリソースのクラスの総数
+        """
+        with self.lock:
+            return sum(self.created_counts.values())
+
+    def clear(self) -> None:
+        """
+        保持しているクライアントとリソースのクラス，作成数をすべて破棄する
+        """
+        with self.lock:
+            self.clients.clear()
+            self.resource_classes.clear()
+            self.created_counts.clear()
+
+
+# コンテナ内で共有するレジストリ
+aws_client_registry = AWSClientRegistry()
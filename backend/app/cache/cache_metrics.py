@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import weakref
+from typing import Protocol
+
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+logger = Logger()
+metrics = Metrics()
+
+
+class CacheMetricsSource(Protocol):
+    """リクエストごとにメトリクスを出力するキャッシュ"""
+
+    def collect_metrics(self) -> dict[str, int]:
+        """
+        前回の収集以降に増えた統計情報をメトリクス名ごとに取得する
+
+        Returns:
+            dict[str, int]: メトリクス名と増えた回数
+        """
+        ...
+
+
+sources: weakref.WeakSet[CacheMetricsSource] = weakref.WeakSet()
+
+
+def register_cache_metrics(source: CacheMetricsSource) -> None:
+    """
+    リクエストの終わりにメトリクスを出力するキャッシュを登録する
+
+    Args:
+        source (CacheMetricsSource): キャッシュ
+    """
+    sources.add(source)
+
+
+def flush_cache_metrics() -> None:
+    """
+    登録したキャッシュの統計情報を，メトリクス名ごとに1つのデータポイントにまとめて記録する
+
+    Notes:
+        キャッシュの参照ごとに記録するとEMFの1回の出力の上限 (100個) に達するため，
+        リクエストごとにまとめる．メトリクスの記録に失敗してもリクエストは失敗させない
+    """
+    for source in list(sources):
+        try:
+            for name, value in source.collect_metrics().items():
+                if value:
+                    metrics.add_metric(name=name, unit=MetricUnit.Count, value=value)
+        except Exception as e:
+            logger.warning("キャッシュのメトリクスを記録できませんでした", extra={"error": str(e)})
+
+
+class CacheMetricsMiddleware:
+    """
+    リクエストを処理した後にキャッシュのメトリクスをまとめて記録するASGIミドルウェア
+
+    記録したメトリクスは Lambda のハンドラーの log_metrics がEMF形式で出力する．
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            flush_cache_metrics()
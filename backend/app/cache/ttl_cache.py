@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Generic, TypeVar
+
+from aws_lambda_powertools import Logger
+
+from app.cache.cache_metrics import register_cache_metrics
+
+logger = Logger()
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    """キャッシュのエントリ"""
+
+    value: V
+    loaded_at: float
+
+
+@dataclass
+class TTLCacheMetrics:
+    """キャッシュの統計情報"""
+
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+    stale_served: int = 0
+
+
+# 統計情報の属性名と，キャッシュの名前の後に続けるメトリクス名
+METRIC_NAMES = {
+    "hits": "CacheHits",
+    "misses": "CacheMisses",
+    "refreshes": "CacheRefreshes",
+    "refresh_failures": "CacheRefreshFailures",
+    "stale_served": "CacheStaleServed",
+}
+
+
+class TTLCache(Generic[K, V]):
+    """
+    有効期限付きのキャッシュ
+
+    有効期限が近づいたエントリは先読み更新し，
+    期限切れ後の再取得に失敗した場合は猶予期間内であれば古い値を返す．
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        refresh_ahead_ratio: float = 0.8,
+        max_stale_seconds: float = 3600,
+        background_refresh: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            name (str): メトリクスの名前に付けるキャッシュの名前 (Prompt など)
+            ttl_seconds (float): エントリの有効期限 (秒単位)
+            refresh_ahead_ratio (float, optional): 有効期限に対して先読み更新を始める経過時間の割合
+            max_stale_seconds (float, optional): 有効期限切れ後に古い値を返してよい猶予 (秒単位)
+            background_refresh (bool, optional): 先読み更新をバックグラウンドのスレッドで行うか
+            clock (Callable[[], float], optional): 現在時刻を返す関数
+
+        Notes:
+            Lambda はレスポンスを返すと実行環境を止めるため，バックグラウンドのスレッドが
+            途中で止まる．Lambda では background_refresh を無効にし，先読み更新を始める時間を
+            過ぎたエントリを最初に参照したリクエストの中で更新する
+        """
+        self.name = name
+        self.background_refresh = background_refresh
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = ttl_seconds * refresh_ahead_ratio
+        self.max_stale_seconds = max_stale_seconds
+        self.clock = clock
+
+        self.entries: dict[K, CacheEntry[V]] = {}
+        self.key_locks: dict[K, threading.Lock] = {}
+        self.refreshing: set[K] = set()
+        self.metrics = TTLCacheMetrics()
+        self.collected_metrics = TTLCacheMetrics()
+
+        self.lock = threading.Lock()
+        self.executor: ThreadPoolExecutor | None = None
+
+        register_cache_metrics(self)
+
+    def get(self, key: K, loader: Callable[[], V]) -> V:
+        """
+        値を取得する (キャッシュにない場合は loader で取得する)
+
+        Args:
+            key (K): キャッシュのキー
+            loader (Callable[[], V]): 値を取得する関数
+
+        Returns:
+            V: キャッシュされた値
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                age = self.clock() - entry.loaded_at
+
+                if age < self.ttl_seconds:
+                    self.metrics.hits += 1
+
+                    # 他のスレッドが更新している間は今の値を返す
+                    if age < self.refresh_ahead_seconds or key in self.refreshing:
+                        return entry.value
+
+                    self.refreshing.add(key)
+
+                    if self.background_refresh:
+                        self.schedule_refresh(key, loader)
+                        return entry.value
+
+        if entry is not None and age < self.ttl_seconds:
+            return self.refresh(key, loader)
+
+        return self.load(key, loader)
+
+    def load(self, key: K, loader: Callable[[], V]) -> V:
+        """
+        値を同期的に取得してキャッシュする
+
+        Args:
+            key (K): キャッシュのキー
+            loader (Callable[[], V]): 値を取得する関数
+
+        Returns:
+            V: 取得した値 (取得に失敗した場合は猶予期間内の古い値)
+        """
+        with self.get_key_lock(key):
+            # 同じキーを待っている間に他のスレッドが取得している場合がある
+            with self.lock:
+                entry = self.entries.get(key)
+
+                if entry is not None and self.clock() - entry.loaded_at < self.ttl_seconds:
+                    self.metrics.hits += 1
+                    return entry.value
+
+                self.metrics.misses += 1
+
+            try:
+                value = loader()
+            except Exception as e:
+                if entry is None:
+                    raise
+
+                age = self.clock() - entry.loaded_at
+                if age >= self.ttl_seconds + self.max_stale_seconds:
+                    raise
+
+                logger.warning(
+                    "キャッシュの再取得に失敗したため古い値を返します",
+                    extra={"cache_key": str(key), "age_seconds": age, "error": str(e)},
+                )
+                with self.lock:
+                    self.metrics.stale_served += 1
+
+                return entry.value
+
+            with self.lock:
+                self.entries[key] = CacheEntry(value=value, loaded_at=self.clock())
+
+            return value
+
+    def schedule_refresh(self, key: K, loader: Callable[[], V]) -> None:
+        """
+        バックグラウンドでの先読み更新を予約する
+
+        Args:
+            key (K): キャッシュのキー
+            loader (Callable[[], V]): 値を取得する関数
+
+        Notes:
+            self.lock を取得した状態で，self.refreshing にキーを追加してから呼び出す
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ttl-cache")
+
+        self.executor.submit(self.refresh, key, loader)
+
+    def refresh(self, key: K, loader: Callable[[], V]) -> V:
+        """
+        値を再取得してキャッシュを更新する
+
+        Args:
+            key (K): キャッシュのキー
+            loader (Callable[[], V]): 値を取得する関数
+
+        Returns:
+            V: 再取得した値 (再取得に失敗した場合は保持している値)
+
+        Raises:
+            Exception: 再取得に失敗し，値を保持していない場合は loader の例外をそのまま送出する
+
+        Notes:
+            self.refreshing にキーを追加してから呼び出す
+        """
+        try:
+            value = loader()
+        except Exception as e:
+            logger.warning(
+                "キャッシュの先読み更新に失敗しました",
+                extra={"cache_key": str(key), "error": str(e)},
+            )
+            with self.lock:
+                self.metrics.refresh_failures += 1
+                self.refreshing.discard(key)
+                entry = self.entries.get(key)
+
+            # 更新している間に破棄された場合は返す値がない
+            if entry is None:
+                raise
+
+            return entry.value
+
+        with self.lock:
+            self.entries[key] = CacheEntry(value=value, loaded_at=self.clock())
+            self.metrics.refreshes += 1
+            self.refreshing.discard(key)
+
+        return value
+
+    def get_key_lock(self, key: K) -> threading.Lock:
+        """
+        キーごとのロックを取得する
+
+        Args:
+            key (K): キャッシュのキー
+
+        Returns:
+            threading.Lock: キーごとのロック
+        """
+        with self.lock:
+            return self.key_locks.setdefault(key, threading.Lock())
+
+    def get_metrics(self) -> dict[str, int]:
+        """
+        キャッシュの統計情報を取得する
+
+        Returns:
+            dict[str, int]: ヒット数，ミス数，先読み更新数などの統計情報
+        """
+        with self.lock:
+            return asdict(self.metrics)
+
+    def collect_metrics(self) -> dict[str, int]:
+        """
+        前回の収集以降に増えた統計情報を，キャッシュの名前を付けたメトリクス名ごとに取得する
+
+        Returns:
+            dict[str, int]: メトリクス名と増えた回数 (PromptCacheHits など)
+        """
+        with self.lock:
+            current = asdict(self.metrics)
+            collected = asdict(self.collected_metrics)
+            self.collected_metrics = TTLCacheMetrics(**current)
+
+        return {
+            f"{self.name}{metric_name}": current[field_name] - collected[field_name]
+            for field_name, metric_name in METRIC_NAMES.items()
+        }
+
+    def invalidate(self, key: K) -> None:
+        """
+        エントリを破棄する
+
+        Args:
+            key (K): キャッシュのキー
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        すべてのエントリと統計情報を破棄する
+        """
+        with self.lock:
+            self.entries.clear()
+            self.metrics = TTLCacheMetrics()
+            self.collected_metrics = TTLCacheMetrics()
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, TypeVar
+
+from app.cache.cache_metrics import register_cache_metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class VersionedCacheEntry(Generic[V]):
+    """キャッシュのエントリ"""
+
+    value: V
+    revision: Any
+    validated_at: float
+
+
+@dataclass
+class VersionedLRUCacheMetrics:
+    """キャッシュの統計情報"""
+
+    hits: int = 0
+    revalidated_hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+# 統計情報の属性名と，エンティティ名の後に続けるメトリクス名
+METRIC_NAMES = {
+    "hits": "CacheHits",
+    "revalidated_hits": "CacheRevalidatedHits",
+    "misses": "CacheMisses",
+    "stale": "CacheStale",
+    "evictions": "CacheEvictions",
+    "invalidations": "CacheInvalidations",
+}
+
+
+class VersionedLRUCache(Generic[K, V]):
+    """
+    版 (バージョンや更新日時) で再検証する，エントリ数に上限のあるキャッシュ
+
+    有効期限内のエントリはそのまま返し，期限切れのエントリは版だけを取得して
+    変わっていなければそのまま返す．上限を超えた場合は最も長く使われていないエントリを破棄する．
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float,
+        revision_of: Callable[[V], Any],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            name (str): メトリクスの名前に付けるエンティティ名 (Pet など)
+            max_entries (int): 保持するエントリ数の上限
+            ttl_seconds (float): 再検証せずに返す期間 (秒単位)
+            revision_of (Callable[[V], Any]): 値から版を取得する関数 (書き込みのたびに大きくなる値)
+            clock (Callable[[], float], optional): 現在時刻を返す関数
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.revision_of = revision_of
+        self.clock = clock
+
+        self.entries: OrderedDict[K, VersionedCacheEntry[V]] = OrderedDict()
+        self.metrics = VersionedLRUCacheMetrics()
+        self.collected_metrics = VersionedLRUCacheMetrics()
+
+        self.lock = threading.Lock()
+
+        register_cache_metrics(self)
+
+    def get(
+        self,
+        key: K,
+        loader: Callable[[], V | None],
+        revision_loader: Callable[[], Any | None],
+    ) -> V | None:
+        """
+        値を取得する (キャッシュにない場合や版が変わった場合は loader で取得する)
+
+        Args:
+            key (K): キャッシュのキー
+            loader (Callable[[], V | None]): 値を取得する関数 (存在しない場合はNone)
+            revision_loader (Callable[[], Any | None]): 最新の版だけを取得する関数
+
+        Returns:
+            V | None: 値 (存在しない場合はNone)
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+
+                if self.clock() - entry.validated_at < self.ttl_seconds:
+                    self.record("hits")
+                    return entry.value
+
+        if entry is not None:
+            revision = revision_loader()
+
+            if revision is not None and revision == entry.revision:
+                with self.lock:
+                    entry.validated_at = self.clock()
+                    self.record("revalidated_hits")
+
+                return entry.value
+
+            with self.lock:
+                self.record("stale")
+
+                if revision is None:
+                    # 他のコンテナで削除された場合は取得し直さない
+                    self.record("misses")
+                    self.remove(key)
+                    return None
+
+        value = loader()
+
+        with self.lock:
+            self.record("misses")
+
+            if value is None:
+                self.remove(key)
+            else:
+                # 版を確認して取得し直した値は，他のコンテナで書き込まれた最新の値として置き換える
+                self.store(key, value, replace=True)
+
+        return value
+
+    def get_fresh(self, key: K) -> V | None:
+        """
+        有効期限内のエントリだけを取得する (再検証しない)
+
+        Args:
+            key (K): キャッシュのキー
+
+        Returns:
+            V | None: 値 (保持していない場合や期限切れの場合はNone)
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None or self.clock() - entry.validated_at >= self.ttl_seconds:
+                self.record("misses")
+                return None
+
+            self.entries.move_to_end(key)
+            self.record("hits")
+
+            return entry.value
+
+    def put(self, key: K, value: V, replace: bool = False) -> None:
+        """
+        値を保持する (自分で書き込んだ値や，まとめて取得した値)
+
+        Args:
+            key (K): キャッシュのキー
+            value (V): 値
+            replace (bool, optional): 保持している値より版が古い場合も置き換えるか
+
+        Notes:
+            並行して取得した古い値で上書きしないように，既定では版が古い場合は保持しない
+        """
+        with self.lock:
+            self.store(key, value, replace)
+
+    def invalidate(self, key: K) -> None:
+        """
+        エントリを破棄する
+
+        Args:
+            key (K): キャッシュのキー
+        """
+        with self.lock:
+            if self.remove(key):
+                self.record("invalidations")
+
+    def get_metrics(self) -> dict[str, int | float]:
+        """
+        キャッシュの統計情報を取得する
+
+        Returns:
+            dict[str, int | float]: ヒット数，ミス数，破棄数，ヒット率，エントリ数
+        """
+        with self.lock:
+            result: dict[str, int | float] = asdict(self.metrics)
+            lookups = self.metrics.hits + self.metrics.revalidated_hits + self.metrics.misses
+            result["hit_ratio"] = (
+                (self.metrics.hits + self.metrics.revalidated_hits) / lookups if lookups else 0.0
+            )
+            result["entries"] = len(self.entries)
+
+            return result
+
+    def clear(self) -> None:
+        """
+        すべてのエントリと統計情報を破棄する
+        """
+        with self.lock:
+            self.entries.clear()
+            self.metrics = VersionedLRUCacheMetrics()
+            self.collected_metrics = VersionedLRUCacheMetrics()
+
+    def collect_metrics(self) -> dict[str, int]:
+        """
+        前回の収集以降に増えた統計情報を，エンティティ名を付けたメトリクス名ごとに取得する
+
+        Returns:
+            dict[str, int]: メトリクス名と増えた回数 (PetCacheHits など)
+        """
+        with self.lock:
+            current = asdict(self.metrics)
+            collected = asdict(self.collected_metrics)
+            self.collected_metrics = VersionedLRUCacheMetrics(**current)
+
+        return {
+            f"{self.name}{metric_name}": current[field_name] - collected[field_name]
+            for field_name, metric_name in METRIC_NAMES.items()
+        }
+
+    def store(self, key: K, value: V, replace: bool) -> None:
+        """
+        値を保持し，上限を超えた分を破棄する
+
+        Args:
+            key (K): キャッシュのキー
+            value (V): 値
+            replace (bool): 保持している値より版が古い場合も置き換えるか
+
+        Notes:
+            self.lock を取得した状態で呼び出す
+        """
+        revision = self.revision_of(value)
+        entry = self.entries.get(key)
+
+        if not replace and entry is not None and entry.revision > revision:
+            return
+
+        self.entries[key] = VersionedCacheEntry(value, revision, self.clock())
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.record("evictions")
+
+    def remove(self, key: K) -> bool:
+        """
+        エントリを破棄する
+
+        Args:
+            key (K): キャッシュのキー
+
+        Returns:
+            bool: エントリを保持していた場合はTrue
+
+        Notes:
+            self.lock を取得した状態で呼び出す
+        """
+        return self.entries.pop(key, None) is not None
+
+    def record(self, field_name: str) -> None:
+        """
+        統計情報を1つ進める
+
+        Args:
+            field_name (str): VersionedLRUCacheMetrics の属性名
+
+        Notes:
+            self.lock を取得した状態で呼び出す．メトリクスはリクエストの終わりにまとめて記録する
+        """
+        setattr(self.metrics, field_name, getattr(self.metrics, field_name) + 1)
@@ -0,0 +1,2 @@
+class BatchGetException(Exception):
+    pass
@@ -0,0 +1,2 @@
+class DiaryTaskNotFoundException(Exception):
+    pass
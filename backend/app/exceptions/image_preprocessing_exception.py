@@ -0,0 +1,2 @@
+class ImagePreprocessingException(Exception):
+    pass
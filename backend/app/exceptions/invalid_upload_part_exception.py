@@ -0,0 +1,2 @@
+class InvalidUploadPartException(Exception):
+    pass
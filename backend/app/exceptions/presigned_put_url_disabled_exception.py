@@ -0,0 +1,2 @@
+class PresignedPutUrlDisabledException(Exception):
+    pass
@@ -0,0 +1,2 @@
+class UploadNotFoundException(Exception):
+    pass
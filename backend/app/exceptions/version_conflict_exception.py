@@ -0,0 +1,11 @@
+class VersionConflictException(Exception):
+    def __init__(self, message: str, current: object | None = None) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            message (str): エラーメッセージ
+            current (object | None, optional): 競合した時点の最新の項目
+        """
+        super().__init__(message)
+        self.current = current
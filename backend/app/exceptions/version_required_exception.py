@@ -0,0 +1,2 @@
+class VersionRequiredException(Exception):
+    pass
@@ -1,13 +1,50 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from pydantic import BaseModel, Field
 
 
 class ChatMessage(BaseModel):
     """メッセージ"""
 
     content: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
     @classmethod
     def from_dict(cls, data: dict) -> ChatMessage:
         return cls.model_validate(data)
+
+
+@dataclass(frozen=True, slots=True)
+class ChatHistoryEntry:
+    """
+    チャット履歴の1件 (読み込み専用)
+
+    履歴は数千件をまとめて読み込むため，ChatMessage の代わりに検証を行わない軽量な形で保持する．
+    """
+
+    content: str
+    created_at: datetime
+
+    @classmethod
+    def from_item(cls, item: dict) -> ChatHistoryEntry:
+        """
+        チャットメッセージのテーブルの項目から検証を行わずに作成する
+
+        Args:
+            item (dict): テーブルの項目 (ChatMessage から書き込んだもの)
+
+        Returns:
+            ChatHistoryEntry: チャット履歴の1件
+        """
+        return cls(item["content"], datetime.fromisoformat(item["created_at"]))
+
+
+@dataclass(frozen=True, slots=True)
+class ChatHistoryPage:
+    """チャット履歴の1ページ分"""
+
+    messages: list[ChatHistoryEntry] = field(default_factory=list)
+    next_cursor: str | None = None
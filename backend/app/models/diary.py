@@ -59,6 +59,36 @@ class DiaryTask(BaseModel):
         return self.model_dump(mode="json")
 
 
+class DiarySummary(BaseModel):
+    """カレンダーなどの一覧表示に使う日記の概要"""
+
+    date: date
+    picture_name: NonEmptyString
+    reacted: bool
+    weather: Weather
+    temperature: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> DiarySummary:
+        """
+        辞書からDiarySummaryインスタンスを作成する
+
+        Args:
+            data (dict): 日記の概要データ
+
+        Returns:
+            DiarySummary: 日記の概要のインスタンス
+        """
+        return cls.model_validate(data)
+
+
+class DiarySummaryPage(BaseModel):
+    """日記の概要の1ページ分"""
+
+    diaries: list[DiarySummary]
+    next_cursor: str | None = None
+
+
 class Diary(BaseModel):
     """日記"""
 
@@ -73,6 +103,7 @@ class Diary(BaseModel):
     tasks: list[DiaryTask]
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    version: int = 0
 
     @classmethod
     def from_dict(cls, data: dict) -> Diary:
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ImageObject(BaseModel):
+    """保存されている画像"""
+
+    key: str
+    size: int
+    last_modified: datetime
+
+
+class ImageObjectPage(BaseModel):
+    """保存されている画像の1ページ分"""
+
+    images: list[ImageObject]
+    next_cursor: str | None = None
+
+
+class ImageContentType(Enum):
+    """アップロードできる画像の形式 (Bedrockにそのまま渡せる形式)"""
+
+    JPEG = "image/jpeg"
+    PNG = "image/png"
+    WEBP = "image/webp"
+
+
+class PresignedPost(BaseModel):
+    """署名付きPOSTのアップロード先とフォームのフィールド"""
+
+    url: str
+    fields: dict[str, str]
+
+
+class UploadedPart(BaseModel):
+    """マルチパートアップロードでアップロードしたパート"""
+
+    part_number: int
+    etag: str
+
+
+class UploadedPartObject(UploadedPart):
+    """S3に保存されているアップロード済みのパート (ListParts の結果)"""
+
+    size: int
@@ -64,6 +64,7 @@ class Pet(BaseModel):
     image_name: NonEmptyString
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    version: int = 0
 
     @classmethod
     def from_dict(cls, data: dict) -> Pet:
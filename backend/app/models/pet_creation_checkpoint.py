@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.models.pet import PetCareNote
+from app.models.types import NonEmptyString
+
+
+class PetCreationCheckpoint(BaseModel):
+    """ペット作成の途中結果"""
+
+    pet_id: NonEmptyString
+    request_fingerprint: NonEmptyString
+    positive_prompt: str | None = None
+    negative_prompt: str | None = None
+    avatar_image_name: str | None = None
+    care_notes: list[PetCareNote] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PetCreationCheckpoint:
+        """
+        辞書からPetCreationCheckpointインスタンスを作成する
+
+        Args:
+            data (dict): 途中結果のデータ
+
+        Returns:
+            PetCreationCheckpoint: 途中結果のインスタンス
+        """
+        return cls.model_validate(data)
+
+    def to_dict(self) -> dict:
+        """
+        途中結果を辞書に変換する
+
+        Returns:
+            dict: 途中結果のデータ
+        """
+        return self.model_dump(mode="json")
@@ -3,3 +3,6 @@ from typing import Annotated
 from pydantic import StringConstraints
 
 NonEmptyString = Annotated[str, StringConstraints(min_length=1, strip_whitespace=True)]
+
+# キーとして使うIDは値を変えないように空白を取り除かない
+NonEmptyId = Annotated[str, StringConstraints(min_length=1)]
@@ -0,0 +1,114 @@
+import json
+
+from app.aws.client_registry import aws_client_registry
+from app.cache.ttl_cache import TTLCache
+from app.exceptions.prompt_not_found_exception import PromptNotFoundException
+from app.repositories.interface.prompt_repository import PromptRepository
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("repository")
+class BedrockPromptRepository(PromptRepository):
+    """
+    Secrets Manager と Bedrock のプロンプト管理からテンプレートを取得するリポジトリの実装
+
+    取得結果は TTLCache に保存し，コンテナ内のリクエスト間で共有する．
+    """
+
+    def __init__(
+        self,
+        cache: TTLCache,
+        region_name: str = "ap-northeast-1",
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            cache (TTLCache): シークレットとプロンプトを保存するキャッシュ
+            region_name (str, optional): リージョン名. デフォルトは "ap-northeast-1".
+        """
+        self.bedrock_agent_client = aws_client_registry.client(
+            "bedrock-agent",
+            region_name=region_name,
+        )
+        self.secrets_manager_client = aws_client_registry.client(
+            "secretsmanager",
+            region_name=region_name,
+        )
+
+        self.cache = cache
+
+    def get_secrets(self, secret_name: str) -> dict:
+        """
+        シークレットを取得する
+
+        Args:
+            secret_name (str): シークレット名
+
+        Returns:
+            dict: シークレットの内容
+        """
+        return self.cache.get(
+            ("secret", secret_name),
+            lambda: self.fetch_secrets(secret_name),
+        )
+
+    def get_prompt_text(self, prompt_identifier: str, prompt_version: str) -> str:
+        """
+        プロンプトのテンプレートを取得する
+
+        Args:
+            prompt_identifier (str): プロンプトのIDまたはARN
+            prompt_version (str): プロンプトのバージョン
+
+        Returns:
+            str: デフォルトのバリアントのテンプレート
+
+        Raises:
+            PromptNotFoundException: プロンプトが見つからない場合
+        """
+        return self.cache.get(
+            ("prompt", prompt_identifier, prompt_version),
+            lambda: self.fetch_prompt_text(prompt_identifier, prompt_version),
+        )
+
+    def fetch_secrets(self, secret_name: str) -> dict:
+        """
+        Secrets Manager からシークレットを取得する
+
+        Args:
+            secret_name (str): シークレット名
+
+        Returns:
+            dict: シークレットの内容
+        """
+        secrets_response = self.secrets_manager_client.get_secret_value(SecretId=secret_name)
+
+        return json.loads(secrets_response["SecretString"])
+
+    def fetch_prompt_text(self, prompt_identifier: str, prompt_version: str) -> str:
+        """
+        Bedrock のプロンプト管理からテンプレートを取得する
+
+        Args:
+            prompt_identifier (str): プロンプトのIDまたはARN
+            prompt_version (str): プロンプトのバージョン
+
+        Returns:
+            str: デフォルトのバリアントのテンプレート
+
+        Raises:
+            PromptNotFoundException: プロンプトが見つからない場合
+        """
+        response = self.bedrock_agent_client.get_prompt(
+            promptIdentifier=prompt_identifier,
+            promptVersion=prompt_version,
+        )
+
+        default_variant_name = response["defaultVariant"]
+
+        for variant in response["variants"]:
+            if variant["name"] == default_variant_name:
+                return variant["templateConfiguration"]["text"]["text"]
+
+        raise PromptNotFoundException("プロンプトが見つかりませんでした")
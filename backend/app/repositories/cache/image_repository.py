@@ -0,0 +1,343 @@
+import threading
+
+from app.cache.versioned_lru_cache import VersionedLRUCache
+from app.models.image import (
+    ImageContentType,
+    ImageObjectPage,
+    PresignedPost,
+    UploadedPart,
+    UploadedPartObject,
+)
+from app.repositories.interface.image_repository import (
+    DEFAULT_IMAGE_PAGE_SIZE,
+    DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ImageRepository,
+)
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("repository")
+class CachedImageRepository(ImageRepository):
+    """
+    取得した画像をリクエストの間だけ保持するリポジトリ
+
+    同じリクエストの中で複数のクライアントが同じ画像を使う場合に，
+    ダウンロードと base64 エンコードを1回にまとめる．
+    閲覧用の署名付きURLは，指定された場合はコンテナ内のリクエスト間で共有するキャッシュに保持する．
+    """
+
+    def __init__(
+        self,
+        image_repository: ImageRepository,
+        max_bytes: int = 20 * 1024 * 1024,
+        presigned_url_cache: VersionedLRUCache[tuple, str] | None = None,
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            image_repository (ImageRepository): 画像を取得するリポジトリ
+            max_bytes (int, optional): 保持する画像 (バイナリと base64 の合計) の上限 (バイト単位)
+            presigned_url_cache (VersionedLRUCache[tuple, str] | None, optional):
+                閲覧用の署名付きURLのキャッシュ (有効期限はURLの有効期限より短くする)
+        """
+        self.image_repository = image_repository
+        self.max_bytes = max_bytes
+        self.presigned_url_cache = presigned_url_cache
+
+        self.image_bytes: dict[str, bytes | None] = {}
+        self.base64_images: dict[str, str] = {}
+        self.cached_bytes = 0
+
+        self.downloaded_bytes = 0
+        self.download_count = 0
+        self.hit_count = 0
+
+        self.lock = threading.Lock()
+        # get_base64_by_key から get_by_key を呼び出すため再入可能なロックを使う
+        self.key_locks: dict[str, threading.RLock] = {}
+
+    def get_by_key(self, image_key: str) -> bytes | None:
+        """
+        画像を取得する (保持している場合はダウンロードしない)
+
+        Args:
+            image_key (str): 取得する画像のキー
+
+        Returns:
+            bytes | None: 画像のバイナリデータ (見つからない場合はNone)
+        """
+        with self.get_key_lock(image_key):
+            with self.lock:
+                if image_key in self.image_bytes:
+                    self.hit_count += 1
+                    return self.image_bytes[image_key]
+
+            image_bytes = self.image_repository.get_by_key(image_key)
+
+            with self.lock:
+                self.download_count += 1
+                self.downloaded_bytes += len(image_bytes or b"")
+                self.store(self.image_bytes, image_key, image_bytes, len(image_bytes or b""))
+
+            return image_bytes
+
+    def get_base64_by_key(self, image_key: str) -> str | None:
+        """
+        画像を取得して base64 エンコードする (保持している場合はエンコードしない)
+
+        Args:
+            image_key (str): 取得する画像のキー
+
+        Returns:
+            str | None: base64 エンコードされた画像の文字列 (見つからない場合はNone)
+        """
+        with self.get_key_lock(image_key):
+            with self.lock:
+                if image_key in self.base64_images:
+                    self.hit_count += 1
+                    return self.base64_images[image_key]
+
+            base64_image = super().get_base64_by_key(image_key)
+
+            if base64_image is not None:
+                with self.lock:
+                    self.store(self.base64_images, image_key, base64_image, len(base64_image))
+
+            return base64_image
+
+    def save(
+        self,
+        image_key: str,
+        image_bytes: bytes,
+    ) -> None:
+        """
+        画像を保存する
+
+        Args:
+            image_key (str): 保存する画像のキー
+            image_bytes (bytes): 保存する画像のバイナリデータ
+        """
+        self.image_repository.save(image_key, image_bytes)
+
+        with self.lock:
+            self.image_bytes.pop(image_key, None)
+            self.base64_images.pop(image_key, None)
+
+    def list_by_prefix(
+        self,
+        prefix: str,
+        limit: int = DEFAULT_IMAGE_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> ImageObjectPage:
+        """
+        キーが prefix で始まる画像を1ページ分取得する
+
+        Args:
+            prefix (str): キーのプレフィックス (例: pet_id/)
+            limit (int, optional): 1ページあたりの画像数の上限
+            cursor (str | None, optional): 前のページで返されたカーソル
+
+        Returns:
+            ImageObjectPage: ページ内の画像 (キーの順) と次のページのカーソル
+
+        Raises:
+            InvalidCursorException: カーソルが不正な場合
+        """
+        return self.image_repository.list_by_prefix(prefix, limit, cursor)
+
+    def get_presigned_url(
+        self,
+        client_method: str,
+        image_key: str,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+        http_method: str = None,
+    ) -> str:
+        """
+        署名付きURLを取得する (閲覧用のURLはキャッシュの有効期限内であれば署名し直さない)
+
+        Args:
+            client_method (str): 署名付きURLによって許可する操作
+            image_key (str): アクセスする画像のキー
+            expires_in (int, optional): URLの有効期限 (秒単位)
+            http_method (str, optional): 署名付きURLによって許可するHTTPメソッド
+
+        Returns:
+            str: 署名付きURL
+
+        Notes:
+            キャッシュから返したURLも，キャッシュとURLの有効期限の差以上の時間は使える．
+            URLの有効期限がキャッシュの有効期限以下の場合は毎回署名する
+        """
+        cache = self.presigned_url_cache
+
+        if cache is None or client_method != "get_object" or expires_in <= cache.ttl_seconds:
+            return self.image_repository.get_presigned_url(
+                client_method,
+                image_key,
+                expires_in,
+                http_method,
+            )
+
+        cache_key = (client_method, image_key, expires_in, http_method)
+        presigned_url = cache.get_fresh(cache_key)
+
+        if presigned_url is None:
+            presigned_url = self.image_repository.get_presigned_url(
+                client_method,
+                image_key,
+                expires_in,
+                http_method,
+            )
+            cache.put(cache_key, presigned_url)
+
+        return presigned_url
+
+    def get_presigned_post(
+        self,
+        image_key: str,
+        content_type: ImageContentType,
+        max_bytes: int,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ) -> PresignedPost:
+        """
+        サイズと形式を制限した，画像をアップロードする署名付きPOSTを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            content_type (ImageContentType): アップロードを許可する画像の形式
+            max_bytes (int): アップロードを許可する最大サイズ (バイト単位)
+            expires_in (int, optional): 署名の有効期限 (秒単位)
+
+        Returns:
+            PresignedPost: アップロード先のURLとフォームに含めるフィールド
+        """
+        return self.image_repository.get_presigned_post(
+            image_key,
+            content_type,
+            max_bytes,
+            expires_in,
+        )
+
+    def create_multipart_upload(self, image_key: str, content_type: ImageContentType) -> str:
+        """
+        マルチパートアップロードを開始する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            content_type (ImageContentType): アップロードする画像の形式
+
+        Returns:
+            str: アップロードID
+        """
+        return self.image_repository.create_multipart_upload(image_key, content_type)
+
+    def get_presigned_upload_part_url(
+        self,
+        image_key: str,
+        upload_id: str,
+        part_number: int,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ) -> str:
+        """
+        マルチパートアップロードのパートをアップロードする署名付きURLを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+            part_number (int): パート番号 (1から始まる)
+            expires_in (int, optional): URLの有効期限 (秒単位)
+
+        Returns:
+            str: 署名付きURL (PUTで送る)
+        """
+        return self.image_repository.get_presigned_upload_part_url(
+            image_key,
+            upload_id,
+            part_number,
+            expires_in,
+        )
+
+    def list_multipart_upload_parts(
+        self, image_key: str, upload_id: str
+    ) -> list[UploadedPartObject]:
+        """
+        マルチパートアップロードでアップロード済みのパートを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+
+        Returns:
+            list[UploadedPartObject]: アップロード済みのパート (パート番号の順)
+
+        Raises:
+            UploadNotFoundException: アップロードが存在しない場合 (完了済みや中止済みを含む)
+        """
+        return self.image_repository.list_multipart_upload_parts(image_key, upload_id)
+
+    def complete_multipart_upload(
+        self,
+        image_key: str,
+        upload_id: str,
+        parts: list[UploadedPart],
+    ) -> None:
+        """
+        マルチパートアップロードを完了する (保持している同じキーの画像は破棄する)
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+            parts (list[UploadedPart]): アップロードしたパート (パート番号の順)
+
+        Raises:
+            UploadNotFoundException: アップロードが存在しない場合
+            InvalidUploadPartException: パートが存在しない場合やETagが一致しない場合
+        """
+        self.image_repository.complete_multipart_upload(image_key, upload_id, parts)
+
+        with self.lock:
+            self.image_bytes.pop(image_key, None)
+            self.base64_images.pop(image_key, None)
+
+    def abort_multipart_upload(self, image_key: str, upload_id: str) -> None:
+        """
+        マルチパートアップロードを中止し，アップロード済みのパートを破棄する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+        """
+        self.image_repository.abort_multipart_upload(image_key, upload_id)
+
+    def store(self, cache: dict, image_key: str, value: bytes | str | None, size: int) -> None:
+        """
+        上限を超えない場合だけ値を保持する
+
+        Args:
+            cache (dict): 保持先
+            image_key (str): 画像のキー
+            value (bytes | str | None): 保持する値
+            size (int): 値の大きさ (バイト単位)
+
+        Notes:
+            self.lock を取得した状態で呼び出す
+        """
+        if self.cached_bytes + size > self.max_bytes:
+            return
+
+        cache[image_key] = value
+        self.cached_bytes += size
+
+    def get_key_lock(self, image_key: str) -> threading.RLock:
+        """
+        画像のキーごとのロックを取得する
+
+        Args:
+            image_key (str): 画像のキー
+
+        Returns:
+            threading.RLock: キーごとのロック
+        """
+        with self.lock:
+            return self.key_locks.setdefault(image_key, threading.RLock())
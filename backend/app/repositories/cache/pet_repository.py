@@ -0,0 +1,167 @@
+from datetime import datetime
+
+from app.cache.versioned_lru_cache import VersionedLRUCache
+from app.exceptions.version_conflict_exception import VersionConflictException
+from app.models.pet import Pet
+from app.repositories.interface.pet_repository import PetRepository
+from app.tracing.timing import timed_methods
+
+
+def get_pet_revision(pet: Pet) -> tuple[datetime, int]:
+    """
+    ペットの版を取得する
+
+    Args:
+        pet (Pet): ペット
+
+    Returns:
+        tuple[datetime, int]: 更新日時とバージョン
+
+    Notes:
+        作成し直した場合はバージョンが0に戻るため，バージョンより先に更新日時で比べる
+    """
+    return pet.updated_at, pet.version
+
+
+@timed_methods("repository")
+class CachedPetRepository(PetRepository):
+    """
+    取得したペットをコンテナ内のリクエスト間で共有するリポジトリ
+
+    同じペットはページの読み込み，エージェントのツール呼び出し，チャットで何度も取得されるため，
+    有効期限内はDynamoDBを呼び出さず，期限切れの場合は版だけを取得して再検証する．
+    このリポジトリを通した書き込みはキャッシュに反映する．
+    """
+
+    def __init__(self, pet_repository: PetRepository, cache: VersionedLRUCache[str, Pet]):
+        """
+        コンストラクタ
+
+        Args:
+            pet_repository (PetRepository): ペットを取得するリポジトリ
+            cache (VersionedLRUCache[str, Pet]): ペットIDをキーにしたキャッシュ
+        """
+        self.pet_repository = pet_repository
+        self.cache = cache
+
+    def get_by_id(self, pet_id: str) -> Pet | None:
+        """ペットを取得する (有効期限内はキャッシュから返す)
+
+        Args:
+            pet_id (str): ペットID
+
+        Returns:
+            Pet | None: ペット (存在しない場合はNone)
+        """
+        return self.cache.get(
+            pet_id,
+            lambda: self.pet_repository.get_by_id(pet_id),
+            lambda: self.pet_repository.get_revision(pet_id),
+        )
+
+    def get_revision(self, pet_id: str) -> tuple[datetime, int] | None:
+        """ペットの版 (更新日時とバージョン) だけを取得する
+
+        Args:
+            pet_id (str): ペットID
+
+        Returns:
+            tuple[datetime, int] | None: 更新日時とバージョン (存在しない場合はNone)
+        """
+        return self.pet_repository.get_revision(pet_id)
+
+    def get_many(self, pet_ids: list[str]) -> list[Pet | None]:
+        """複数のペットをまとめて取得する (有効期限内のペットは取得しない)
+
+        Args:
+            pet_ids (list[str]): ペットIDのリスト
+
+        Returns:
+            list[Pet | None]: 引数と同じ順序のペット (存在しない場合はNone)
+
+        Notes:
+            期限切れのペットは再検証せずにまとめて取得し直す
+        """
+        pets = {pet_id: self.cache.get_fresh(pet_id) for pet_id in dict.fromkeys(pet_ids)}
+        missing_pet_ids = [pet_id for pet_id, pet in pets.items() if pet is None]
+
+        if missing_pet_ids:
+            loaded_pets = self.pet_repository.get_many(missing_pet_ids)
+
+            for pet_id, pet in zip(missing_pet_ids, loaded_pets, strict=True):
+                pets[pet_id] = pet
+                if pet is not None:
+                    self.cache.put(pet_id, pet)
+
+        return [pets[pet_id] for pet_id in pet_ids]
+
+    def create(self, pet: Pet) -> Pet:
+        """ペットを作成する
+
+        Args:
+            pet (Pet): 作成するペット
+
+        Returns:
+            Pet: 作成したペット
+        """
+        created_pet = self.pet_repository.create(pet)
+        # 作成し直した場合は古いエントリより版が古く見えることがあるため，比べずに置き換える
+        self.cache.put(pet.pet_id, created_pet, replace=True)
+
+        return created_pet
+
+    def update(self, pet: Pet) -> Pet:
+        """ペットを更新する
+
+        Args:
+            pet (Pet): 更新するペット
+
+        Returns:
+            Pet: 更新したペット
+        """
+        updated_pet = self.pet_repository.update(pet)
+        self.cache.put(pet.pet_id, updated_pet, replace=True)
+
+        return updated_pet
+
+    def update_attributes(
+        self,
+        pet_id: str,
+        attributes: dict,
+        expected_version: int | None = None,
+        expected_updated_at: datetime | None = None,
+    ) -> Pet | None:
+        """ペットの指定した属性だけを更新し，バージョンを1つ進める
+
+        Args:
+            pet_id (str): ペットID
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+            expected_version (int | None, optional): 更新前に期待するバージョン (Noneは確認しない)
+            expected_updated_at (datetime | None, optional): 更新前に期待する更新日時
+                (Noneは確認しない)
+
+        Returns:
+            Pet | None: 更新後のペット (存在しない場合はNone)
+
+        Raises:
+            VersionConflictException: バージョンか更新日時が一致しない場合
+                (current に最新のペットを持つ)
+        """
+        try:
+            updated_pet = self.pet_repository.update_attributes(
+                pet_id,
+                attributes,
+                expected_version,
+                expected_updated_at,
+            )
+        except VersionConflictException as e:
+            # 競合した時点の最新のペットを保持する
+            self.cache.put(pet_id, e.current)
+            raise
+
+        if updated_pet is None:
+            self.cache.invalidate(pet_id)
+        else:
+            self.cache.put(pet_id, updated_pet)
+
+        return updated_pet
@@ -0,0 +1,138 @@
+from datetime import datetime
+
+from app.cache.versioned_lru_cache import VersionedLRUCache
+from app.models.user import User
+from app.repositories.interface.user_repository import UserRepository
+from app.tracing.timing import timed_methods
+
+
+def get_user_revision(user: User) -> datetime:
+    """
+    ユーザーの版を取得する
+
+    Args:
+        user (User): ユーザー
+
+    Returns:
+        datetime: 更新日時 (ユーザーはバージョンを持たず，更新のたびに更新日時が変わる)
+    """
+    return user.updated_at
+
+
+@timed_methods("repository")
+class CachedUserRepository(UserRepository):
+    """
+    取得したユーザーをコンテナ内のリクエスト間で共有するリポジトリ
+
+    有効期限内はDynamoDBを呼び出さず，期限切れの場合は更新日時だけを取得して再検証する．
+    このリポジトリを通した書き込みはキャッシュに反映する．
+    """
+
+    def __init__(self, user_repository: UserRepository, cache: VersionedLRUCache[str, User]):
+        """
+        コンストラクタ
+
+        Args:
+            user_repository (UserRepository): ユーザーを取得するリポジトリ
+            cache (VersionedLRUCache[str, User]): ユーザーIDをキーにしたキャッシュ
+        """
+        self.user_repository = user_repository
+        self.cache = cache
+
+    def get_by_id(self, user_id: str) -> User | None:
+        """ユーザーを取得する (有効期限内はキャッシュから返す)
+
+        Args:
+            user_id (str): ユーザーID
+
+        Returns:
+            User | None: ユーザー (存在しない場合はNone)
+        """
+        return self.cache.get(
+            user_id,
+            lambda: self.user_repository.get_by_id(user_id),
+            lambda: self.user_repository.get_revision(user_id),
+        )
+
+    def get_revision(self, user_id: str) -> datetime | None:
+        """ユーザーの版 (更新日時) だけを取得する
+
+        Args:
+            user_id (str): ユーザーID
+
+        Returns:
+            datetime | None: 更新日時 (存在しない場合はNone)
+        """
+        return self.user_repository.get_revision(user_id)
+
+    def get_many(self, user_ids: list[str]) -> list[User | None]:
+        """複数のユーザーをまとめて取得する (有効期限内のユーザーは取得しない)
+
+        Args:
+            user_ids (list[str]): ユーザーIDのリスト
+
+        Returns:
+            list[User | None]: 引数と同じ順序のユーザー (存在しない場合はNone)
+
+        Notes:
+            期限切れのユーザーは再検証せずにまとめて取得し直す
+        """
+        users = {user_id: self.cache.get_fresh(user_id) for user_id in dict.fromkeys(user_ids)}
+        missing_user_ids = [user_id for user_id, user in users.items() if user is None]
+
+        if missing_user_ids:
+            loaded_users = self.user_repository.get_many(missing_user_ids)
+
+            for user_id, user in zip(missing_user_ids, loaded_users, strict=True):
+                users[user_id] = user
+                if user is not None:
+                    self.cache.put(user_id, user)
+
+        return [users[user_id] for user_id in user_ids]
+
+    def create(self, user: User) -> User:
+        """ユーザーを作成する
+
+        Args:
+            user (User): 作成するユーザー
+
+        Returns:
+            User: 作成したユーザー
+        """
+        created_user = self.user_repository.create(user)
+        self.cache.put(user.user_id, created_user, replace=True)
+
+        return created_user
+
+    def update(self, user: User) -> User:
+        """ユーザーを更新する
+
+        Args:
+            user (User): 更新するユーザー
+
+        Returns:
+            User: 更新したユーザー
+        """
+        updated_user = self.user_repository.update(user)
+        self.cache.put(user.user_id, updated_user, replace=True)
+
+        return updated_user
+
+    def update_attributes(self, user_id: str, attributes: dict) -> User | None:
+        """ユーザーの指定した属性だけを更新する
+
+        Args:
+            user_id (str): ユーザーID
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+
+        Returns:
+            User | None: 更新後のユーザー (存在しない場合はNone)
+        """
+        updated_user = self.user_repository.update_attributes(user_id, attributes)
+
+        if updated_user is None:
+            self.cache.invalidate(user_id)
+        else:
+            self.cache.put(user_id, updated_user)
+
+        return updated_user
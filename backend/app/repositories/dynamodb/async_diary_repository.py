@@ -0,0 +1,67 @@
+from datetime import date
+
+from app.aws.async_client_registry import async_aws_client_registry
+from app.models.diary import Diary
+from app.repositories.interface.async_diary_repository import AsyncDiaryRepository
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("repository")
+class AsyncDynamoDBDiaryRepository(AsyncDiaryRepository):
+    """DynamoDBの日記リポジトリの非同期の実装"""
+
+    def __init__(
+        self,
+        table_name: str,
+        dynamodb_endpoint_url: str,
+        region_name: str = "ap-northeast-1",
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            table_name (str): テーブル名
+            dynamodb_endpoint_url (str): DynamoDBのエンドポイントURL
+            region_name (str, optional): リージョン名
+        """
+        self.table_name = table_name
+        self.dynamodb_endpoint_url = dynamodb_endpoint_url
+        self.region_name = region_name
+
+    async def get_by_id(self, pet_id: str, date: date) -> Diary | None:
+        """日記を取得する
+
+        Args:
+            pet_id (str): ペットID
+            date (date): 日付
+
+        Returns:
+            Diary | None: 日記
+        """
+        table = await self.get_table()
+        response = await table.get_item(Key={"pet_id": pet_id, "date": date.isoformat()})
+
+        if "Item" not in response:
+            return None
+
+        return Diary.from_dict(response["Item"])
+
+    async def create(self, diary: Diary) -> Diary:
+        """日記を作成する
+
+        Args:
+            diary (Diary): 日記
+        """
+        table = await self.get_table()
+        await table.put_item(Item=diary.to_dict())
+
+        return diary
+
+    async def get_table(self):
+        dynamodb = await async_aws_client_registry.resource(
+            "dynamodb",
+            region_name=self.region_name,
+            endpoint_url=self.dynamodb_endpoint_url,
+        )
+
+        return await dynamodb.Table(self.table_name)
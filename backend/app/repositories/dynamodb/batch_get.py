@@ -0,0 +1,73 @@
+import random
+import time
+from collections.abc import Callable
+
+from app.exceptions.batch_get_exception import BatchGetException
+
+# BatchGetItem で1回に取得できるキーの上限
+MAX_BATCH_GET_KEYS = 100
+
+
+def batch_get_items(
+    table,
+    keys: list[dict],
+    max_retry_count: int = 8,
+    base_delay_seconds: float = 0.05,
+    max_delay_seconds: float = 2.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> list[dict | None]:
+    """
+    BatchGetItem で複数の項目をまとめて取得する
+
+    Args:
+        table: DynamoDBのテーブル (boto3のリソース)
+        keys (list[dict]): 取得する項目のキー
+        max_retry_count (int, optional): 未処理のキーを再取得する最大回数
+        base_delay_seconds (float, optional): 再取得までの待ち時間の初期値 (秒単位)
+        max_delay_seconds (float, optional): 再取得までの待ち時間の上限 (秒単位)
+        sleep (Callable[[float], None], optional): 待機する関数
+
+    Returns:
+        list[dict | None]: keys と同じ順序の項目 (存在しない場合はNone)
+
+    Raises:
+        BatchGetException: 再取得を繰り返しても未処理のキーが残った場合
+
+    Notes:
+        キーは100件ずつに分割し，重複したキーは1回だけ取得する．
+        スロットリングなどで返されなかったキー (UnprocessedKeys) は指数バックオフで再取得する
+    """
+    key_names = [key_schema["AttributeName"] for key_schema in table.key_schema]
+
+    def to_identity(key_or_item: dict) -> tuple:
+        return tuple(key_or_item[name] for name in key_names)
+
+    unique_keys = list({to_identity(key): key for key in keys}.values())
+    items: dict[tuple, dict] = {}
+
+    for start in range(0, len(unique_keys), MAX_BATCH_GET_KEYS):
+        request_items = {
+            table.name: {"Keys": unique_keys[start : start + MAX_BATCH_GET_KEYS]},
+        }
+
+        for retry_count in range(max_retry_count + 1):
+            if retry_count > 0:
+                # 再取得が同時に集中しないように待ち時間をばらつかせる
+                delay = min(max_delay_seconds, base_delay_seconds * 2 ** (retry_count - 1))
+                sleep(random.uniform(0, delay))
+
+            response = table.meta.client.batch_get_item(RequestItems=request_items)
+
+            for item in response["Responses"].get(table.name, []):
+                items[to_identity(item)] = item
+
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                break
+        else:
+            raise BatchGetException(
+                f"{table.name} から取得できなかったキーがあります: "
+                f"{len(request_items[table.name]['Keys'])}件"
+            )
+
+    return [items.get(to_identity(key)) for key in keys]
@@ -1,49 +1,94 @@
-import boto3
+import hashlib
+from datetime import UTC, datetime
 
-from app.exceptions.pet_not_found_exception import PetNotFoundException
-from app.models.chat import ChatMessage
-from app.repositories.interface.chat_repository import ChatRepository
+from app.aws.client_registry import aws_client_registry
+from app.exceptions.invalid_cursor_exception import InvalidCursorException
+from app.models.chat import ChatHistoryEntry, ChatHistoryPage, ChatMessage
+from app.repositories.dynamodb.pagination import decode_cursor, encode_cursor
+from app.repositories.interface.chat_repository import DEFAULT_CHAT_PAGE_SIZE, ChatRepository
+from app.tracing.timing import timed_methods
 
+KEY_NAMES = {"pet_id", "message_id"}
 
+# TransactWriteItems で1回に書き込める項目数の上限
+MAX_TRANSACT_ITEMS = 100
+
+
+@timed_methods("repository")
 class DynamoDBChatRepository(ChatRepository):
+    """
+    DynamoDBのチャットリポジトリ
+
+    メッセージはペットIDをパーティションキー，送信日時から作るメッセージIDをソートキーとして
+    1件ずつ保存するため，最新N件の取得はN件分の読み込みで済む．
+    """
+
     def __init__(
         self,
         table_name: str,
         dynamodb_endpoint_url: str,
         region_name: str = "ap-northeast-1",
     ):
-        dynamodb = boto3.resource(
+        """
+        コンストラクタ
+
+        Args:
+            table_name (str): チャットメッセージのテーブル名
+            dynamodb_endpoint_url (str): DynamoDBのエンドポイントURL
+            region_name (str, optional): リージョン名
+        """
+        dynamodb = aws_client_registry.resource(
             "dynamodb",
             region_name=region_name,
             endpoint_url=dynamodb_endpoint_url,
         )
         self.table = dynamodb.Table(table_name)
 
-    def get_by_pet_id(self, pet_id: str) -> list[ChatMessage] | None:
+    def get_by_pet_id(
+        self,
+        pet_id: str,
+        limit: int = DEFAULT_CHAT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> ChatHistoryPage:
         """
-        ペットIDに基づいてチャット履歴を取得する
+        チャット履歴を新しい順に1ページ分取得する
 
         Args:
             pet_id (str): ペットID
+            limit (int, optional): 1ページあたりのメッセージ数
+            cursor (str | None, optional): 前のページで返されたカーソル
 
         Returns:
-            list[ChatMessage] | None: チャット履歴（存在しない場合はNone）
+            ChatHistoryPage: ページ内のメッセージ (古い順) と次のページのカーソル
 
         Raises:
-            PetNotFoundException: ペットが存在しない場合
+            InvalidCursorException: カーソルが不正な場合
         """
-        response = self.table.get_item(Key={"pet_id": pet_id}, ProjectionExpression="chat_history")
+        query_kwargs = {
+            "KeyConditionExpression": "pet_id = :pet_id",
+            "ExpressionAttributeValues": {":pet_id": pet_id},
+            "ProjectionExpression": "content, created_at",
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
 
-        if "Item" not in response:
-            raise PetNotFoundException(f"ペットが見つかりませんでした: {pet_id}")
+        if cursor is not None:
+            exclusive_start_key = decode_cursor(cursor, KEY_NAMES)
 
-        item = response["Item"]
+            if exclusive_start_key["pet_id"] != pet_id:
+                raise InvalidCursorException("別のペットのカーソルが指定されました")
 
-        if "chat_history" not in item:
-            return None
+            query_kwargs["ExclusiveStartKey"] = exclusive_start_key
 
-        chat_history = item["chat_history"]
-        return [ChatMessage.from_dict(message) for message in chat_history]
+        response = self.table.query(**query_kwargs)
+
+        # 自分で書き込んだ項目のため，1件ずつモデルで検証せずに軽量な形で読み込む
+        messages = [ChatHistoryEntry.from_item(item) for item in reversed(response["Items"])]
+
+        return ChatHistoryPage(
+            messages=messages,
+            next_cursor=encode_cursor(response.get("LastEvaluatedKey")),
+        )
 
     def append_message(self, pet_id: str, message: ChatMessage) -> None:
         """
@@ -53,19 +98,75 @@ class DynamoDBChatRepository(ChatRepository):
             pet_id (str): ペットID
             message (ChatMessage): 追加するメッセージ
         """
-        self.table.update_item(
-            Key={"pet_id": pet_id},
-            UpdateExpression="""
-                SET chat_history = list_append(
-                    if_not_exists(
-                        chat_history,
-                        :empty_list
-                    ),
-                    :chat_message
-                )
-            """,
-            ExpressionAttributeValues={
-                ":empty_list": [],
-                ":chat_message": [message.model_dump()],
-            },
+        self.table.put_item(Item=to_item(pet_id, message))
+
+    def append_messages(self, pet_id: str, messages: list[ChatMessage]) -> None:
+        """
+        チャット履歴に複数のメッセージを1回のトランザクションで追加する
+
+        Args:
+            pet_id (str): ペットID
+            messages (list[ChatMessage]): 追加するメッセージ
+
+        Raises:
+            ValueError: メッセージ数がトランザクションの上限を超える場合
+        """
+        if not messages:
+            return
+
+        if len(messages) > MAX_TRANSACT_ITEMS:
+            raise ValueError(f"一度に追加できるメッセージは{MAX_TRANSACT_ITEMS}件までです")
+
+        # リソースのクライアントは属性値を自動で変換するため，項目をそのまま渡せる
+        self.table.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": self.table.name,
+                        "Item": to_item(pet_id, message),
+                    },
+                }
+                for message in messages
+            ],
         )
+
+
+def to_item(pet_id: str, message: ChatMessage) -> dict:
+    """
+    メッセージをテーブルの項目に変換する
+
+    Args:
+        pet_id (str): ペットID
+        message (ChatMessage): メッセージ
+
+    Returns:
+        dict: テーブルの項目
+
+    Notes:
+        メッセージIDは送信日時と内容から決まるため，同じメッセージは同じ項目に上書きされる
+    """
+    created_at = format_created_at(message.created_at)
+    digest = hashlib.sha256(f"{created_at}\n{message.content}".encode()).hexdigest()
+
+    return {
+        "pet_id": pet_id,
+        "message_id": f"{created_at}#{digest[:8]}",
+        "content": message.content,
+        "created_at": created_at,
+    }
+
+
+def format_created_at(created_at: datetime) -> str:
+    """
+    ソートキーとして辞書順に並ぶ形式で日時を文字列にする
+
+    Args:
+        created_at (datetime): 日時 (タイムゾーンがない場合はUTCとみなす)
+
+    Returns:
+        str: マイクロ秒までのUTCの日時 (例: 2025-01-01T00:00:00.000000Z)
+    """
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+
+    return created_at.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
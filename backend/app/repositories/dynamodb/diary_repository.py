@@ -1,11 +1,26 @@
-from datetime import date
+from datetime import date, datetime
 
-import boto3
+from app.aws.client_registry import aws_client_registry
+from app.exceptions.diary_task_not_found_exception import DiaryTaskNotFoundException
+from app.exceptions.invalid_cursor_exception import InvalidCursorException
+from app.exceptions.version_conflict_exception import VersionConflictException
+from app.models.diary import Diary, DiarySummary, DiarySummaryPage
+from app.repositories.dynamodb.batch_get import batch_get_items
+from app.repositories.dynamodb.pagination import decode_cursor, encode_cursor
+from app.repositories.dynamodb.update_expression import (
+    build_versioned_update,
+    get_item_on_condition_check_failure,
+)
+from app.repositories.interface.diary_repository import DEFAULT_DIARY_PAGE_SIZE, DiaryRepository
+from app.tracing.timing import timed_methods
 
-from app.models.diary import Diary
-from app.repositories.interface.diary_repository import DiaryRepository
+KEY_NAMES = {"pet_id", "date"}
 
+# 一覧表示に必要な属性だけを取得する (date は予約語のため別名を使う)
+SUMMARY_PROJECTION_EXPRESSION = "#date, picture_name, reacted, weather, temperature"
 
+
+@timed_methods("repository")
 class DynamoDBDiaryRepository(DiaryRepository):
     """DynamoDBの日記リポジトリ"""
 
@@ -23,7 +38,7 @@ class DynamoDBDiaryRepository(DiaryRepository):
             dynamodb_endpoint_url (str): DynamoDBのエンドポイントURL
             region_name (str, optional): リージョン名
         """
-        dynamodb = boto3.resource(
+        dynamodb = aws_client_registry.resource(
             "dynamodb",
             region_name=region_name,
             endpoint_url=dynamodb_endpoint_url,
@@ -48,6 +63,75 @@ class DynamoDBDiaryRepository(DiaryRepository):
 
         return Diary.from_dict(response["Item"])
 
+    def list_range(
+        self,
+        pet_id: str,
+        start: date,
+        end: date,
+        limit: int = DEFAULT_DIARY_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> DiarySummaryPage:
+        """期間内の日記の概要を日付の古い順に取得する
+
+        Args:
+            pet_id (str): ペットID
+            start (date): 期間の開始日 (この日を含む)
+            end (date): 期間の終了日 (この日を含む)
+            limit (int, optional): 1ページあたりの日記数
+            cursor (str | None, optional): 前のページで返されたカーソル
+
+        Returns:
+            DiarySummaryPage: ページ内の日記の概要と次のページのカーソル
+
+        Raises:
+            InvalidCursorException: カーソルが不正な場合
+        """
+        query_kwargs = {
+            "KeyConditionExpression": "pet_id = :pet_id AND #date BETWEEN :start AND :end",
+            "ExpressionAttributeNames": {"#date": "date"},
+            "ExpressionAttributeValues": {
+                ":pet_id": pet_id,
+                ":start": start.isoformat(),
+                ":end": end.isoformat(),
+            },
+            "ProjectionExpression": SUMMARY_PROJECTION_EXPRESSION,
+            "Limit": limit,
+        }
+
+        if cursor is not None:
+            exclusive_start_key = decode_cursor(cursor, KEY_NAMES)
+
+            if exclusive_start_key["pet_id"] != pet_id:
+                raise InvalidCursorException("別のペットのカーソルが指定されました")
+
+            query_kwargs["ExclusiveStartKey"] = exclusive_start_key
+
+        response = self.table.query(**query_kwargs)
+
+        return DiarySummaryPage(
+            diaries=[DiarySummary.from_dict(item) for item in response["Items"]],
+            next_cursor=encode_cursor(response.get("LastEvaluatedKey")),
+        )
+
+    def get_many(self, keys: list[tuple[str, date]]) -> list[Diary | None]:
+        """複数の日記を BatchGetItem でまとめて取得する
+
+        Args:
+            keys (list[tuple[str, date]]): ペットIDと日付の組のリスト
+
+        Returns:
+            list[Diary | None]: 引数と同じ順序の日記 (存在しない場合はNone)
+
+        Raises:
+            BatchGetException: 再取得を繰り返しても取得できなかった日記がある場合
+        """
+        items = batch_get_items(
+            self.table,
+            [{"pet_id": pet_id, "date": diary_date.isoformat()} for pet_id, diary_date in keys],
+        )
+
+        return [None if item is None else Diary.from_dict(item) for item in items]
+
     def create(self, diary: Diary) -> Diary:
         """日記を作成する
 
@@ -67,3 +151,102 @@ class DynamoDBDiaryRepository(DiaryRepository):
         self.table.put_item(Item=diary.to_dict())
 
         return diary
+
+    def update_attributes(
+        self,
+        pet_id: str,
+        date: date,
+        attributes: dict,
+        expected_version: int | None = None,
+        expected_updated_at: datetime | None = None,
+    ) -> Diary | None:
+        """日記の指定した属性だけを更新し，バージョンを1つ進める
+
+        Args:
+            pet_id (str): ペットID
+            date (date): 日付
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+            expected_version (int | None, optional): 更新前に期待するバージョン (Noneは確認しない)
+            expected_updated_at (datetime | None, optional): 更新前に期待する更新日時
+                (Noneは確認しない)
+
+        Returns:
+            Diary | None: 更新後の日記 (存在しない場合はNone)
+
+        Raises:
+            VersionConflictException: バージョンか更新日時が一致しない場合
+                (current に最新の日記を持つ)
+        """
+        try:
+            response = self.table.update_item(
+                Key={"pet_id": pet_id, "date": date.isoformat()},
+                ReturnValues="ALL_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                **build_versioned_update(
+                    "pet_id", attributes, expected_version, expected_updated_at
+                ),
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException as e:
+            item = get_item_on_condition_check_failure(e)
+
+            if item is None:
+                return None
+
+            raise VersionConflictException(
+                "日記が他のリクエストによって更新されています",
+                current=Diary.from_dict(item),
+            ) from e
+
+        return Diary.from_dict(response["Attributes"])
+
+    def update_task_completed(
+        self,
+        pet_id: str,
+        date: date,
+        task_index: int,
+        sub_task_index: int | None,
+        completed: bool,
+        attributes: dict,
+    ) -> Diary | None:
+        """日記の1つのタスクまたはサブタスクの完了状態だけを更新し，バージョンを1つ進める
+
+        Args:
+            pet_id (str): ペットID
+            date (date): 日付
+            task_index (int): タスクの位置
+            sub_task_index (int | None): サブタスクの位置 (タスク自体を更新する場合はNone)
+            completed (bool): 完了状態
+            attributes (dict): 合わせて更新する属性とその値 (JSONに変換済みの値)
+
+        Returns:
+            Diary | None: 更新後の日記 (存在しない場合はNone)
+
+        Raises:
+            DiaryTaskNotFoundException: 指定した位置にタスクまたはサブタスクが存在しない場合
+        """
+        # リストの位置はプレースホルダにできないため，整数に変換してから式に埋め込む
+        document_path = f"tasks[{int(task_index)}]"
+        if sub_task_index is not None:
+            document_path += f".sub_tasks[{int(sub_task_index)}]"
+
+        update_kwargs = build_versioned_update("pet_id", attributes)
+        update_kwargs["UpdateExpression"] += f", {document_path}.completed = :completed"
+        update_kwargs["ConditionExpression"] += f" AND attribute_exists({document_path})"
+        update_kwargs["ExpressionAttributeValues"][":completed"] = completed
+
+        try:
+            response = self.table.update_item(
+                Key={"pet_id": pet_id, "date": date.isoformat()},
+                ReturnValues="ALL_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                **update_kwargs,
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException as e:
+            if get_item_on_condition_check_failure(e) is None:
+                return None
+
+            raise DiaryTaskNotFoundException(
+                f"タスクが見つかりませんでした: {document_path}",
+            ) from e
+
+        return Diary.from_dict(response["Attributes"])
@@ -0,0 +1,52 @@
+import base64
+import binascii
+import json
+
+from app.exceptions.invalid_cursor_exception import InvalidCursorException
+
+
+def encode_cursor(last_evaluated_key: dict | None) -> str | None:
+    """
+    クエリの LastEvaluatedKey をクライアントに返すカーソルに変換する
+
+    Args:
+        last_evaluated_key (dict | None): クエリの LastEvaluatedKey
+
+    Returns:
+        str | None: URLセーフなカーソル (続きがない場合はNone)
+    """
+    if not last_evaluated_key:
+        return None
+
+    payload = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True)
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_names: set[str]) -> dict:
+    """
+    カーソルをクエリの ExclusiveStartKey に変換する
+
+    Args:
+        cursor (str): encode_cursor で生成したカーソル
+        key_names (set[str]): テーブルのキー属性名
+
+    Returns:
+        dict: クエリの ExclusiveStartKey
+
+    Raises:
+        InvalidCursorException: カーソルの形式が不正な場合
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        exclusive_start_key = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorException("カーソルの形式が不正です") from e
+
+    if not isinstance(exclusive_start_key, dict) or set(exclusive_start_key) != key_names:
+        raise InvalidCursorException("カーソルの形式が不正です")
+
+    if not all(isinstance(value, str) for value in exclusive_start_key.values()):
+        raise InvalidCursorException("カーソルの形式が不正です")
+
+    return exclusive_start_key
@@ -0,0 +1,119 @@
+import time
+
+from app.aws.client_registry import aws_client_registry
+from app.models.pet_creation_checkpoint import PetCreationCheckpoint
+from app.repositories.dynamodb.update_expression import build_set_update
+from app.repositories.interface.pet_creation_checkpoint_repository import (
+    PetCreationCheckpointRepository,
+)
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("repository")
+class DynamoDBPetCreationCheckpointRepository(PetCreationCheckpointRepository):
+    """DynamoDBのペット作成の途中結果リポジトリ"""
+
+    def __init__(
+        self,
+        table_name: str,
+        dynamodb_endpoint_url: str,
+        ttl_seconds: int = 86400,
+        region_name: str = "ap-northeast-1",
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            table_name (str): テーブル名
+            dynamodb_endpoint_url (str): DynamoDBのエンドポイントURL
+            ttl_seconds (int, optional): 途中結果を保持する期間 (秒単位)
+            region_name (str, optional): リージョン名
+        """
+        dynamodb = aws_client_registry.resource(
+            "dynamodb",
+            region_name=region_name,
+            endpoint_url=dynamodb_endpoint_url,
+        )
+        self.table = dynamodb.Table(table_name)
+        self.ttl_seconds = ttl_seconds
+
+    def get_by_pet_id(self, pet_id: str) -> PetCreationCheckpoint | None:
+        """
+        途中結果を取得する
+
+        Args:
+            pet_id (str): ペットID
+
+        Returns:
+            PetCreationCheckpoint | None: 途中結果 (存在しない場合はNone)
+        """
+        response = self.table.get_item(Key={"pet_id": pet_id}, ConsistentRead=True)
+
+        if "Item" not in response:
+            return None
+
+        item = response["Item"]
+
+        # TTLによる削除は即時ではないため期限切れの途中結果は無視する
+        if item.get("expires_at", 0) < time.time():
+            return None
+
+        return PetCreationCheckpoint.from_dict(item)
+
+    def update(self, pet_id: str, request_fingerprint: str, attributes: dict) -> None:
+        """
+        途中結果を保存する
+
+        Args:
+            pet_id (str): ペットID
+            request_fingerprint (str): 途中結果を生成したリクエストの識別子
+            attributes (dict): 保存する属性とその値
+
+        Raises:
+            ConditionalCheckFailedException: 別のリクエストの途中結果が残っている場合
+
+        Notes:
+            並行して実行される段階が互いの途中結果を上書きしないように，
+            指定した属性だけを UpdateExpression で更新する
+        """
+        attributes = {
+            **attributes,
+            "request_fingerprint": request_fingerprint,
+            "expires_at": int(time.time()) + self.ttl_seconds,
+        }
+
+        update_kwargs = build_set_update(attributes)
+        update_kwargs["ConditionExpression"] = (
+            "attribute_not_exists(#pet_id) OR #request_fingerprint = :request_fingerprint"
+        )
+        update_kwargs["ExpressionAttributeNames"].update(
+            {"#pet_id": "pet_id", "#request_fingerprint": "request_fingerprint"}
+        )
+        update_kwargs["ExpressionAttributeValues"][":request_fingerprint"] = request_fingerprint
+
+        self.table.update_item(Key={"pet_id": pet_id}, **update_kwargs)
+
+    def replace(self, pet_id: str, request_fingerprint: str) -> None:
+        """
+        途中結果を空の状態で作り直す
+
+        Args:
+            pet_id (str): ペットID
+            request_fingerprint (str): これから途中結果を保存するリクエストの識別子
+        """
+        self.table.put_item(
+            Item={
+                "pet_id": pet_id,
+                "request_fingerprint": request_fingerprint,
+                "expires_at": int(time.time()) + self.ttl_seconds,
+            }
+        )
+
+    def delete(self, pet_id: str) -> None:
+        """
+        途中結果を削除する
+
+        Args:
+            pet_id (str): ペットID
+        """
+        self.table.delete_item(Key={"pet_id": pet_id})
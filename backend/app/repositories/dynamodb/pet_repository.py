@@ -1,9 +1,18 @@
-import boto3
+from datetime import datetime
 
+from app.aws.client_registry import aws_client_registry
+from app.exceptions.version_conflict_exception import VersionConflictException
 from app.models.pet import Pet
+from app.repositories.dynamodb.batch_get import batch_get_items
+from app.repositories.dynamodb.update_expression import (
+    build_versioned_update,
+    get_item_on_condition_check_failure,
+)
 from app.repositories.interface.pet_repository import PetRepository
+from app.tracing.timing import timed_methods
 
 
+@timed_methods("repository")
 class DynamoDBPetRepository(PetRepository):
     """DynamoDBのペットリポジトリ"""
 
@@ -21,7 +30,7 @@ class DynamoDBPetRepository(PetRepository):
             dynamodb_endpoint_url (str): DynamoDBのエンドポイントURL
             region_name (str, optional): リージョン名
         """
-        dynamodb = boto3.resource(
+        dynamodb = aws_client_registry.resource(
             "dynamodb",
             region_name=region_name,
             endpoint_url=dynamodb_endpoint_url,
@@ -44,6 +53,47 @@ class DynamoDBPetRepository(PetRepository):
 
         return Pet.from_dict(response["Item"])
 
+    def get_revision(self, pet_id: str) -> tuple[datetime, int] | None:
+        """ペットの版 (更新日時とバージョン) だけを取得する
+
+        Args:
+            pet_id (str): ペットID
+
+        Returns:
+            tuple[datetime, int] | None: 更新日時とバージョン (存在しない場合はNone)
+
+        Notes:
+            キャッシュの再検証に使うため，2つの属性だけを取得して項目全体の転送と変換を省く
+        """
+        response = self.table.get_item(
+            Key={"pet_id": pet_id},
+            ProjectionExpression="#updated_at, #version",
+            ExpressionAttributeNames={"#updated_at": "updated_at", "#version": "version"},
+        )
+
+        if "Item" not in response:
+            return None
+
+        item = response["Item"]
+
+        return datetime.fromisoformat(item["updated_at"]), int(item.get("version", 0))
+
+    def get_many(self, pet_ids: list[str]) -> list[Pet | None]:
+        """複数のペットを BatchGetItem でまとめて取得する
+
+        Args:
+            pet_ids (list[str]): ペットIDのリスト
+
+        Returns:
+            list[Pet | None]: 引数と同じ順序のペット (存在しない場合はNone)
+
+        Raises:
+            BatchGetException: 再取得を繰り返しても取得できなかったペットがある場合
+        """
+        items = batch_get_items(self.table, [{"pet_id": pet_id} for pet_id in pet_ids])
+
+        return [None if item is None else Pet.from_dict(item) for item in items]
+
     def create(self, pet: Pet) -> Pet:
         """ペットを作成する
 
@@ -69,3 +119,48 @@ class DynamoDBPetRepository(PetRepository):
         self.table.put_item(Item=pet.to_dict())
 
         return pet
+
+    def update_attributes(
+        self,
+        pet_id: str,
+        attributes: dict,
+        expected_version: int | None = None,
+        expected_updated_at: datetime | None = None,
+    ) -> Pet | None:
+        """ペットの指定した属性だけを更新し，バージョンを1つ進める
+
+        Args:
+            pet_id (str): ペットID
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+            expected_version (int | None, optional): 更新前に期待するバージョン (Noneは確認しない)
+            expected_updated_at (datetime | None, optional): 更新前に期待する更新日時
+                (Noneは確認しない)
+
+        Returns:
+            Pet | None: 更新後のペット (存在しない場合はNone)
+
+        Raises:
+            VersionConflictException: バージョンか更新日時が一致しない場合
+                (current に最新のペットを持つ)
+        """
+        try:
+            response = self.table.update_item(
+                Key={"pet_id": pet_id},
+                ReturnValues="ALL_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                **build_versioned_update(
+                    "pet_id", attributes, expected_version, expected_updated_at
+                ),
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException as e:
+            item = get_item_on_condition_check_failure(e)
+
+            if item is None:
+                return None
+
+            raise VersionConflictException(
+                "ペットが他のリクエストによって更新されています",
+                current=Pet.from_dict(item),
+            ) from e
+
+        return Pet.from_dict(response["Attributes"])
@@ -0,0 +1,139 @@
+from datetime import UTC, datetime
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+deserializer = TypeDeserializer()
+
+
+def build_set_update(attributes: dict) -> dict:
+    """
+    指定した属性だけを上書きする update_item の引数を生成する
+
+    Args:
+        attributes (dict): 更新する属性とその値
+
+    Returns:
+        dict: UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues
+
+    Notes:
+        属性名は予約語と衝突しないようにすべてプレースホルダに置き換える
+    """
+    return {
+        "UpdateExpression": "SET "
+        + ", ".join(f"#attr{i} = :value{i}" for i in range(len(attributes))),
+        "ExpressionAttributeNames": {f"#attr{i}": name for i, name in enumerate(attributes)},
+        "ExpressionAttributeValues": {
+            f":value{i}": value for i, value in enumerate(attributes.values())
+        },
+    }
+
+
+def build_versioned_update(
+    hash_key_name: str,
+    attributes: dict,
+    expected_version: int | None = None,
+    expected_updated_at: datetime | None = None,
+) -> dict:
+    """
+    指定した属性を上書きし，バージョンを1つ進める update_item の引数を生成する
+
+    Args:
+        hash_key_name (str): パーティションキーの属性名 (項目の存在確認に使う)
+        attributes (dict): 更新する属性とその値
+        expected_version (int | None, optional): 更新前に期待するバージョン (Noneは確認しない)
+        expected_updated_at (datetime | None, optional): 更新前に期待する更新日時 (Noneは確認しない)
+
+    Returns:
+        dict: UpdateExpression, ConditionExpression, ExpressionAttributeNames,
+            ExpressionAttributeValues
+
+    Notes:
+        バージョンがない既存の項目はバージョン0として扱う．
+        作成し直した項目はバージョンが0に戻るため，If-Match では更新日時も条件にする
+    """
+    update_kwargs = build_set_update(attributes)
+
+    update_kwargs["UpdateExpression"] += (
+        ", #version = if_not_exists(#version, :version_zero) + :version_one"
+    )
+    update_kwargs["ExpressionAttributeNames"]["#version"] = "version"
+    update_kwargs["ExpressionAttributeValues"].update({":version_zero": 0, ":version_one": 1})
+
+    condition_expression = f"attribute_exists({hash_key_name})"
+
+    if expected_version is not None:
+        update_kwargs["ExpressionAttributeValues"][":expected_version"] = expected_version
+
+        if expected_version == 0:
+            condition_expression += (
+                " AND (attribute_not_exists(#version) OR #version = :expected_version)"
+            )
+        else:
+            condition_expression += " AND #version = :expected_version"
+
+    if expected_updated_at is not None:
+        candidates = format_datetime_candidates(expected_updated_at)
+        update_kwargs["ExpressionAttributeNames"]["#expected_updated_at"] = "updated_at"
+        update_kwargs["ExpressionAttributeValues"].update(
+            {f":expected_updated_at{i}": value for i, value in enumerate(candidates)}
+        )
+        condition_expression += " AND #expected_updated_at IN ({})".format(
+            ", ".join(f":expected_updated_at{i}" for i in range(len(candidates)))
+        )
+
+    update_kwargs["ConditionExpression"] = condition_expression
+
+    return update_kwargs
+
+
+def format_datetime_candidates(value: datetime) -> list[str]:
+    """
+    保存されている可能性のある日時の文字列を列挙する
+
+    Args:
+        value (datetime): 日時 (タイムゾーンがない場合はUTCとして扱う)
+
+    Returns:
+        list[str]: 日時の文字列 (重複なし)
+
+    Notes:
+        アプリは末尾を Z で保存するが，シードやLambdaは +00:00 やタイムゾーンなしで保存するため，
+        文字列の比較で同じ日時を取りこぼさないようにする
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+
+    value = value.astimezone(UTC)
+    isoformat = value.isoformat()
+
+    return list(
+        dict.fromkeys(
+            [
+                isoformat.removesuffix("+00:00") + "Z",
+                isoformat,
+                value.replace(tzinfo=None).isoformat(),
+            ]
+        )
+    )
+
+
+def get_item_on_condition_check_failure(error: ClientError) -> dict | None:
+    """
+    条件付き書き込みが失敗した時点の項目を取得する
+
+    Args:
+        error (ClientError): ReturnValuesOnConditionCheckFailure=ALL_OLD を指定した書き込みの例外
+
+    Returns:
+        dict | None: 失敗した時点の項目 (項目が存在しない場合はNone)
+
+    Notes:
+        例外に含まれる項目はリソースによる型の変換を経ないため，ここでPythonの値に変換する
+    """
+    item = error.response.get("Item")
+
+    if item is None:
+        return None
+
+    return {name: deserializer.deserialize(value) for name, value in item.items()}
@@ -1,9 +1,14 @@
-import boto3
+from datetime import datetime
 
+from app.aws.client_registry import aws_client_registry
 from app.models.user import User
+from app.repositories.dynamodb.batch_get import batch_get_items
+from app.repositories.dynamodb.update_expression import build_set_update
 from app.repositories.interface.user_repository import UserRepository
+from app.tracing.timing import timed_methods
 
 
+@timed_methods("repository")
 class DynamoDBUserRepository(UserRepository):
     """DynamoDBのユーザーリポジトリ"""
 
@@ -21,7 +26,7 @@ class DynamoDBUserRepository(UserRepository):
             dynamodb_endpoint_url (str): DynamoDBのエンドポイントURL
             region_name (str, optional): リージョン名
         """
-        dynamodb = boto3.resource(
+        dynamodb = aws_client_registry.resource(
             "dynamodb",
             region_name=region_name,
             endpoint_url=dynamodb_endpoint_url,
@@ -44,6 +49,45 @@ class DynamoDBUserRepository(UserRepository):
 
         return User.from_dict(response["Item"])
 
+    def get_revision(self, user_id: str) -> datetime | None:
+        """ユーザーの版 (更新日時) だけを取得する
+
+        Args:
+            user_id (str): ユーザーID
+
+        Returns:
+            datetime | None: 更新日時 (存在しない場合はNone)
+
+        Notes:
+            キャッシュの再検証に使うため，更新日時だけを取得して項目全体の転送と変換を省く
+        """
+        response = self.table.get_item(
+            Key={"user_id": user_id},
+            ProjectionExpression="#updated_at",
+            ExpressionAttributeNames={"#updated_at": "updated_at"},
+        )
+
+        if "Item" not in response:
+            return None
+
+        return datetime.fromisoformat(response["Item"]["updated_at"])
+
+    def get_many(self, user_ids: list[str]) -> list[User | None]:
+        """複数のユーザーを BatchGetItem でまとめて取得する
+
+        Args:
+            user_ids (list[str]): ユーザーIDのリスト
+
+        Returns:
+            list[User | None]: 引数と同じ順序のユーザー (存在しない場合はNone)
+
+        Raises:
+            BatchGetException: 再取得を繰り返しても取得できなかったユーザーがある場合
+        """
+        items = batch_get_items(self.table, [{"user_id": user_id} for user_id in user_ids])
+
+        return [None if item is None else User.from_dict(item) for item in items]
+
     def create(self, user: User) -> User:
         """ユーザーを作成する
 
@@ -69,3 +113,25 @@ class DynamoDBUserRepository(UserRepository):
         self.table.put_item(Item=user.to_dict())
 
         return user
+
+    def update_attributes(self, user_id: str, attributes: dict) -> User | None:
+        """ユーザーの指定した属性だけを更新する
+
+        Args:
+            user_id (str): ユーザーID
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+
+        Returns:
+            User | None: 更新後のユーザー (存在しない場合はNone)
+        """
+        try:
+            response = self.table.update_item(
+                Key={"user_id": user_id},
+                ConditionExpression="attribute_exists(user_id)",
+                ReturnValues="ALL_NEW",
+                **build_set_update(attributes),
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return None
+
+        return User.from_dict(response["Attributes"])
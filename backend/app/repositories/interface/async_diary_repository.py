@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+from app.models.diary import Diary
+
+
+class AsyncDiaryRepository(ABC):
+    """日記リポジトリの非同期のインターフェース"""
+
+    @abstractmethod
+    async def get_by_id(self, pet_id: str, date: date) -> Diary | None:
+        """日記を取得する
+
+        Args:
+            pet_id (str): ペットID
+            date (date): 日付
+
+        Returns:
+            Diary | None: 日記
+        """
+        pass
+
+    @abstractmethod
+    async def create(self, diary: Diary) -> Diary:
+        """日記を作成する
+
+        Args:
+            diary (Diary): 日記
+        """
+        pass
@@ -0,0 +1,53 @@
+import base64
+from abc import ABC, abstractmethod
+
+
+class AsyncImageRepository(ABC):
+    """
+    画像を保存するリポジトリの非同期のインタフェース
+    """
+
+    @abstractmethod
+    async def get_by_key(self, image_key: str) -> bytes | None:
+        """
+        画像を取得する
+
+        Args:
+            image_key (str): 取得する画像のキー
+
+        Returns:
+            bytes | None: 画像のバイナリデータ (見つからない場合はNone)
+        """
+        pass
+
+    async def get_base64_by_key(self, image_key: str) -> str | None:
+        """
+        画像を取得して base64 エンコードする
+
+        Args:
+            image_key (str): 取得する画像のキー
+
+        Returns:
+            str | None: base64 エンコードされた画像の文字列 (見つからない場合はNone)
+        """
+        image_bytes = await self.get_by_key(image_key)
+
+        if image_bytes is None:
+            return None
+
+        return base64.b64encode(image_bytes).decode("utf-8")
+
+    @abstractmethod
+    async def save(
+        self,
+        image_key: str,
+        image_bytes: bytes,
+    ) -> None:
+        """
+        画像を保存する
+
+        Args:
+            image_key (str): 保存する画像のキー
+            image_bytes (bytes): 保存する画像のバイナリデータ
+        """
+        pass
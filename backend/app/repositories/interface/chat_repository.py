@@ -1,16 +1,31 @@
 from abc import ABC, abstractmethod
 
-from app.models.chat import ChatMessage
+from app.models.chat import ChatHistoryPage, ChatMessage
+
+DEFAULT_CHAT_PAGE_SIZE = 50
 
 
 class ChatRepository(ABC):
     @abstractmethod
-    def get_by_pet_id(self, pet_id: str) -> list[ChatMessage] | None:
+    def get_by_pet_id(
+        self,
+        pet_id: str,
+        limit: int = DEFAULT_CHAT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> ChatHistoryPage:
         """
-        チャット履歴を取得する
+        チャット履歴を新しい順に1ページ分取得する
 
         Args:
             pet_id (str): ペットID
+            limit (int, optional): 1ページあたりのメッセージ数
+            cursor (str | None, optional): 前のページで返されたカーソル
+
+        Returns:
+            ChatHistoryPage: ページ内のメッセージ (古い順) と次のページのカーソル
+
+        Raises:
+            InvalidCursorException: カーソルが不正な場合
         """
         pass
 
@@ -22,8 +37,20 @@ class ChatRepository(ABC):
         Args:
             pet_id (str): ペットID
             message (ChatMessage): チャットメッセージ
+        """
+        pass
+
+    @abstractmethod
+    def append_messages(self, pet_id: str, messages: list[ChatMessage]) -> None:
+        """
+        チャット履歴に複数のメッセージをまとめて追加する
+
+        Args:
+            pet_id (str): ペットID
+            messages (list[ChatMessage]): チャットメッセージ
 
         Notes:
-            チャット履歴がない時は新規作成する
+            すべてのメッセージが追加されるか，1件も追加されないかのどちらかになる．
+            追加済みのメッセージを再度追加しても重複しない
         """
         pass
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from datetime import date
+from datetime import date, datetime
+
+from app.models.diary import Diary, DiarySummaryPage
+
+DEFAULT_DIARY_PAGE_SIZE = 31
+
 
-from app.models.diary import Diary
 class DiaryRepository(ABC):
     """日記リポジトリのインターフェース"""
 
@@ -18,6 +22,72 @@ class DiaryRepository(ABC):
             """
         pass
     
+    @abstractmethod
+    def list_range(
+        self,
+        pet_id: str,
+        start: date,
+        end: date,
+        limit: int = DEFAULT_DIARY_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> DiarySummaryPage:
+        """期間内の日記の概要を日付の古い順に取得する
+
+        Args:
+            pet_id (str): ペットID
+            start (date): 期間の開始日 (この日を含む)
+            end (date): 期間の終了日 (この日を含む)
+            limit (int, optional): 1ページあたりの日記数
+            cursor (str | None, optional): 前のページで返されたカーソル
+
+        Returns:
+            DiarySummaryPage: ページ内の日記の概要と次のページのカーソル
+
+        Raises:
+            InvalidCursorException: カーソルが不正な場合
+        """
+        pass
+
+    @abstractmethod
+    def update_task_completed(
+        self,
+        pet_id: str,
+        date: date,
+        task_index: int,
+        sub_task_index: int | None,
+        completed: bool,
+        attributes: dict,
+    ) -> Diary | None:
+        """日記の1つのタスクまたはサブタスクの完了状態だけを更新し，バージョンを1つ進める
+
+        Args:
+            pet_id (str): ペットID
+            date (date): 日付
+            task_index (int): タスクの位置
+            sub_task_index (int | None): サブタスクの位置 (タスク自体を更新する場合はNone)
+            completed (bool): 完了状態
+            attributes (dict): 合わせて更新する属性とその値 (JSONに変換済みの値)
+
+        Returns:
+            Diary | None: 更新後の日記 (存在しない場合はNone)
+
+        Raises:
+            DiaryTaskNotFoundException: 指定した位置にタスクまたはサブタスクが存在しない場合
+        """
+        pass
+
+    @abstractmethod
+    def get_many(self, keys: list[tuple[str, date]]) -> list[Diary | None]:
+        """複数の日記をまとめて取得する
+
+        Args:
+            keys (list[tuple[str, date]]): ペットIDと日付の組のリスト
+
+        Returns:
+            list[Diary | None]: 引数と同じ順序の日記 (存在しない場合はNone)
+        """
+        pass
+
     @abstractmethod
     def create(self, diary: Diary) -> Diary:
         """日記を作成する
@@ -34,4 +104,32 @@ class DiaryRepository(ABC):
             Args:
                 diary (Diary): 日記
             """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def update_attributes(
+        self,
+        pet_id: str,
+        date: date,
+        attributes: dict,
+        expected_version: int | None = None,
+        expected_updated_at: datetime | None = None,
+    ) -> Diary | None:
+        """日記の指定した属性だけを更新し，バージョンを1つ進める
+
+        Args:
+            pet_id (str): ペットID
+            date (date): 日付
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+            expected_version (int | None, optional): 更新前に期待するバージョン (Noneは確認しない)
+            expected_updated_at (datetime | None, optional): 更新前に期待する更新日時
+                (Noneは確認しない)
+
+        Returns:
+            Diary | None: 更新後の日記 (存在しない場合はNone)
+
+        Raises:
+            VersionConflictException: バージョンか更新日時が一致しない場合
+                (current に最新の日記を持つ)
+        """
+        pass
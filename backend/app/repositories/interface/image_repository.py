@@ -1,5 +1,19 @@
+import base64
 from abc import ABC, abstractmethod
 
+from app.models.image import (
+    ImageContentType,
+    ImageObjectPage,
+    PresignedPost,
+    UploadedPart,
+    UploadedPartObject,
+)
+
+DEFAULT_IMAGE_PAGE_SIZE = 30
+DEFAULT_PRESIGNED_URL_EXPIRES_IN = 3600
+# マルチパートアップロードの最後以外のパートの最小サイズ (S3の制約)
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
 
 class ImageRepository(ABC):
     """
@@ -19,6 +33,23 @@ class ImageRepository(ABC):
         """
         pass
 
+    def get_base64_by_key(self, image_key: str) -> str | None:
+        """
+        画像を取得して base64 エンコードする
+
+        Args:
+            image_key (str): 取得する画像のキー
+
+        Returns:
+            str | None: base64 エンコードされた画像の文字列 (見つからない場合はNone)
+        """
+        image_bytes = self.get_by_key(image_key)
+
+        if image_bytes is None:
+            return None
+
+        return base64.b64encode(image_bytes).decode("utf-8")
+
     @abstractmethod
     def save(
         self,
@@ -34,12 +65,38 @@ class ImageRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def list_by_prefix(
+        self,
+        prefix: str,
+        limit: int = DEFAULT_IMAGE_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> ImageObjectPage:
+        """
+        キーが prefix で始まる画像を1ページ分取得する
+
+        Args:
+            prefix (str): キーのプレフィックス (例: pet_id/)
+            limit (int, optional): 1ページあたりの画像数の上限
+            cursor (str | None, optional): 前のページで返されたカーソル
+
+        Returns:
+            ImageObjectPage: ページ内の画像 (キーの順) と次のページのカーソル
+
+        Raises:
+            InvalidCursorException: カーソルが不正な場合
+
+        Notes:
+            prefix の直下の画像だけを返し，下の階層 (縮小した画像など) は含めない
+        """
+        pass
+
     @abstractmethod
     def get_presigned_url(
         self,
         client_method: str,
         image_key: str,
-        expires_in: int = 3600,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
         http_method: str = None,
     ) -> str:
         """
@@ -55,3 +112,112 @@ class ImageRepository(ABC):
             str: 署名付きURL
         """
         pass
+
+    @abstractmethod
+    def get_presigned_post(
+        self,
+        image_key: str,
+        content_type: ImageContentType,
+        max_bytes: int,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ) -> PresignedPost:
+        """
+        サイズと形式を制限した，画像をアップロードする署名付きPOSTを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            content_type (ImageContentType): アップロードを許可する画像の形式
+            max_bytes (int): アップロードを許可する最大サイズ (バイト単位)
+            expires_in (int, optional): 署名の有効期限 (秒単位)
+
+        Returns:
+            PresignedPost: アップロード先のURLとフォームに含めるフィールド
+        """
+        pass
+
+    @abstractmethod
+    def create_multipart_upload(self, image_key: str, content_type: ImageContentType) -> str:
+        """
+        マルチパートアップロードを開始する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            content_type (ImageContentType): アップロードする画像の形式
+
+        Returns:
+            str: アップロードID
+        """
+        pass
+
+    @abstractmethod
+    def get_presigned_upload_part_url(
+        self,
+        image_key: str,
+        upload_id: str,
+        part_number: int,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ) -> str:
+        """
+        マルチパートアップロードのパートをアップロードする署名付きURLを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+            part_number (int): パート番号 (1から始まる)
+            expires_in (int, optional): URLの有効期限 (秒単位)
+
+        Returns:
+            str: 署名付きURL (PUTで送る)
+        """
+        pass
+
+    @abstractmethod
+    def list_multipart_upload_parts(
+        self, image_key: str, upload_id: str
+    ) -> list[UploadedPartObject]:
+        """
+        マルチパートアップロードでアップロード済みのパートを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+
+        Returns:
+            list[UploadedPartObject]: アップロード済みのパート (パート番号の順)
+
+        Raises:
+            UploadNotFoundException: アップロードが存在しない場合 (完了済みや中止済みを含む)
+        """
+        pass
+
+    @abstractmethod
+    def complete_multipart_upload(
+        self,
+        image_key: str,
+        upload_id: str,
+        parts: list[UploadedPart],
+    ) -> None:
+        """
+        マルチパートアップロードを完了する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+            parts (list[UploadedPart]): アップロードしたパート (パート番号の順)
+
+        Raises:
+            UploadNotFoundException: アップロードが存在しない場合
+            InvalidUploadPartException: パートが存在しない場合やETagが一致しない場合
+        """
+        pass
+
+    @abstractmethod
+    def abort_multipart_upload(self, image_key: str, upload_id: str) -> None:
+        """
+        マルチパートアップロードを中止し，アップロード済みのパートを破棄する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+        """
+        pass
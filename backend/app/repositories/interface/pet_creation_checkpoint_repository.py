@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+
+from app.models.pet_creation_checkpoint import PetCreationCheckpoint
+
+
+class PetCreationCheckpointRepository(ABC):
+    """ペット作成の途中結果を保存するリポジトリのインターフェース"""
+
+    @abstractmethod
+    def get_by_pet_id(self, pet_id: str) -> PetCreationCheckpoint | None:
+        """
+        途中結果を取得する
+
+        Args:
+            pet_id (str): ペットID
+
+        Returns:
+            PetCreationCheckpoint | None: 途中結果 (存在しない場合はNone)
+        """
+        pass
+
+    @abstractmethod
+    def update(self, pet_id: str, request_fingerprint: str, attributes: dict) -> None:
+        """
+        途中結果を保存する
+
+        Args:
+            pet_id (str): ペットID
+            request_fingerprint (str): 途中結果を生成したリクエストの識別子
+            attributes (dict): 保存する属性とその値
+
+        Notes:
+            指定した属性だけを保存し，他の段階の途中結果は上書きしない．
+            別のリクエストの途中結果が残っている場合は保存しない
+        """
+        pass
+
+    @abstractmethod
+    def replace(self, pet_id: str, request_fingerprint: str) -> None:
+        """
+        途中結果を空の状態で作り直す
+
+        Args:
+            pet_id (str): ペットID
+            request_fingerprint (str): これから途中結果を保存するリクエストの識別子
+
+        Notes:
+            別のリクエストの途中結果をすべて破棄し，以降の update で混ざらないようにする
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, pet_id: str) -> None:
+        """
+        途中結果を削除する
+
+        Args:
+            pet_id (str): ペットID
+        """
+        pass
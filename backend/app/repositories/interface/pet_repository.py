@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from app.models.pet import Pet
 
@@ -18,6 +19,30 @@ class PetRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_revision(self, pet_id: str) -> tuple[datetime, int] | None:
+        """ペットの版 (更新日時とバージョン) だけを取得する
+
+        Args:
+            pet_id (str): ペットID
+
+        Returns:
+            tuple[datetime, int] | None: 更新日時とバージョン (見つからない場合はNone)
+        """
+        pass
+
+    @abstractmethod
+    def get_many(self, pet_ids: list[str]) -> list[Pet | None]:
+        """複数のペットをまとめて取得する
+
+        Args:
+            pet_ids (list[str]): ペットIDのリスト
+
+        Returns:
+            list[Pet | None]: 引数と同じ順序のペット (存在しない場合はNone)
+        """
+        pass
+
     @abstractmethod
     def create(self, pet: Pet) -> Pet:
         """ペットを作成する
@@ -41,3 +66,29 @@ class PetRepository(ABC):
             Pet: 更新後のペット
         """
         pass
+
+    @abstractmethod
+    def update_attributes(
+        self,
+        pet_id: str,
+        attributes: dict,
+        expected_version: int | None = None,
+        expected_updated_at: datetime | None = None,
+    ) -> Pet | None:
+        """ペットの指定した属性だけを更新し，バージョンを1つ進める
+
+        Args:
+            pet_id (str): ペットID
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+            expected_version (int | None, optional): 更新前に期待するバージョン (Noneは確認しない)
+            expected_updated_at (datetime | None, optional): 更新前に期待する更新日時
+                (Noneは確認しない)
+
+        Returns:
+            Pet | None: 更新後のペット (存在しない場合はNone)
+
+        Raises:
+            VersionConflictException: バージョンか更新日時が一致しない場合
+                (current に最新のペットを持つ)
+        """
+        pass
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+
+
+class PromptRepository(ABC):
+    """シークレットとプロンプトのテンプレートを取得するリポジトリのインターフェース"""
+
+    @abstractmethod
+    def get_secrets(self, secret_name: str) -> dict:
+        """
+        シークレットを取得する
+
+        Args:
+            secret_name (str): シークレット名
+
+        Returns:
+            dict: シークレットの内容
+        """
+        pass
+
+    @abstractmethod
+    def get_prompt_text(self, prompt_identifier: str, prompt_version: str) -> str:
+        """
+        プロンプトのテンプレートを取得する
+
+        Args:
+            prompt_identifier (str): プロンプトのIDまたはARN
+            prompt_version (str): プロンプトのバージョン
+
+        Returns:
+            str: デフォルトのバリアントのテンプレート
+
+        Raises:
+            PromptNotFoundException: プロンプトが見つからない場合
+        """
+        pass
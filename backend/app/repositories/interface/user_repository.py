@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from app.models.user import User
 
@@ -18,6 +19,30 @@ class UserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_revision(self, user_id: str) -> datetime | None:
+        """ユーザーの版 (更新日時) だけを取得する
+
+        Args:
+            user_id (str): ユーザーID
+
+        Returns:
+            datetime | None: 更新日時 (見つからない場合はNone)
+        """
+        pass
+
+    @abstractmethod
+    def get_many(self, user_ids: list[str]) -> list[User | None]:
+        """複数のユーザーをまとめて取得する
+
+        Args:
+            user_ids (list[str]): ユーザーIDのリスト
+
+        Returns:
+            list[User | None]: 引数と同じ順序のユーザー (存在しない場合はNone)
+        """
+        pass
+
     @abstractmethod
     def create(self, user: User) -> User:
         """ユーザーを作成する
@@ -41,3 +66,16 @@ class UserRepository(ABC):
             User: 更新後のユーザー
         """
         pass
+
+    @abstractmethod
+    def update_attributes(self, user_id: str, attributes: dict) -> User | None:
+        """ユーザーの指定した属性だけを更新する
+
+        Args:
+            user_id (str): ユーザーID
+            attributes (dict): 更新する属性とその値 (JSONに変換済みの値)
+
+        Returns:
+            User | None: 更新後のユーザー (存在しない場合はNone)
+        """
+        pass
@@ -0,0 +1,85 @@
+import threading
+
+from app.models.pet_creation_checkpoint import PetCreationCheckpoint
+from app.repositories.interface.pet_creation_checkpoint_repository import (
+    PetCreationCheckpointRepository,
+)
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("repository")
+class InMemoryPetCreationCheckpointRepository(PetCreationCheckpointRepository):
+    """
+    ペット作成の途中結果をメモリ上に保存するリポジトリの実装
+
+    テストやローカルでの動作確認で使う．途中結果はコンテナが破棄されると失われる．
+    """
+
+    def __init__(self):
+        """
+        コンストラクタ
+        """
+        self.items: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def get_by_pet_id(self, pet_id: str) -> PetCreationCheckpoint | None:
+        """
+        途中結果を取得する
+
+        Args:
+            pet_id (str): ペットID
+
+        Returns:
+            PetCreationCheckpoint | None: 途中結果 (存在しない場合はNone)
+        """
+        with self.lock:
+            item = self.items.get(pet_id)
+
+            if item is None:
+                return None
+
+            return PetCreationCheckpoint.from_dict(item)
+
+    def update(self, pet_id: str, request_fingerprint: str, attributes: dict) -> None:
+        """
+        途中結果を保存する
+
+        Args:
+            pet_id (str): ペットID
+            request_fingerprint (str): 途中結果を生成したリクエストの識別子
+            attributes (dict): 保存する属性とその値
+
+        Raises:
+            ValueError: 別のリクエストの途中結果が残っている場合
+        """
+        with self.lock:
+            item = self.items.setdefault(
+                pet_id,
+                {"pet_id": pet_id, "request_fingerprint": request_fingerprint},
+            )
+
+            if item["request_fingerprint"] != request_fingerprint:
+                raise ValueError(f"別のリクエストの途中結果が残っています: {pet_id}")
+
+            item.update(attributes)
+
+    def replace(self, pet_id: str, request_fingerprint: str) -> None:
+        """
+        途中結果を空の状態で作り直す
+
+        Args:
+            pet_id (str): ペットID
+            request_fingerprint (str): これから途中結果を保存するリクエストの識別子
+        """
+        with self.lock:
+            self.items[pet_id] = {"pet_id": pet_id, "request_fingerprint": request_fingerprint}
+
+    def delete(self, pet_id: str) -> None:
+        """
+        途中結果を削除する
+
+        Args:
+            pet_id (str): ペットID
+        """
+        with self.lock:
+            self.items.pop(pet_id, None)
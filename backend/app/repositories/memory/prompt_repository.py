@@ -0,0 +1,64 @@
+from app.exceptions.prompt_not_found_exception import PromptNotFoundException
+from app.repositories.interface.prompt_repository import PromptRepository
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("repository")
+class InMemoryPromptRepository(PromptRepository):
+    """
+    メモリ上のシークレットとプロンプトを返すリポジトリの実装
+
+    テストやローカルでの動作確認でAWSに接続せずに使う．
+    """
+
+    def __init__(
+        self,
+        secrets: dict[str, dict] | None = None,
+        prompts: dict[tuple[str, str], str] | None = None,
+    ):
+        """
+        コンストラクタ
+
+        Args:
+            secrets (dict[str, dict] | None, optional): シークレット名とその内容
+            prompts (dict[tuple[str, str], str] | None, optional): プロンプトのIDとバージョンの組と
+                テンプレート
+        """
+        self.secrets = secrets or {}
+        self.prompts = prompts or {}
+
+    def get_secrets(self, secret_name: str) -> dict:
+        """
+        シークレットを取得する
+
+        Args:
+            secret_name (str): シークレット名
+
+        Returns:
+            dict: シークレットの内容
+
+        Raises:
+            KeyError: シークレットが登録されていない場合
+        """
+        return self.secrets[secret_name]
+
+    def get_prompt_text(self, prompt_identifier: str, prompt_version: str) -> str:
+        """
+        プロンプトのテンプレートを取得する
+
+        Args:
+            prompt_identifier (str): プロンプトのIDまたはARN
+            prompt_version (str): プロンプトのバージョン
+
+        Returns:
+            str: プロンプトのテンプレート
+
+        Raises:
+            PromptNotFoundException: プロンプトが登録されていない場合
+        """
+        prompt_text = self.prompts.get((prompt_identifier, prompt_version))
+
+        if prompt_text is None:
+            raise PromptNotFoundException("プロンプトが見つかりませんでした")
+
+        return prompt_text
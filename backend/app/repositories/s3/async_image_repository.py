@@ -0,0 +1,73 @@
+from app.aws.async_client_registry import async_aws_client_registry
+from app.repositories.interface.async_image_repository import AsyncImageRepository
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("repository")
+class AsyncS3ImageRepository(AsyncImageRepository):
+    """
+    S3に画像を保存するリポジトリの非同期の実装
+    """
+
+    def __init__(self, bucket_name: str, s3_endpoint_url: str, region_name: str = "ap-northeast-1"):
+        """
+        コンストラクタ
+
+        Args:
+            bucket_name (str): バケット名
+            s3_endpoint_url (str): S3のエンドポイントURL
+            region_name (str, optional): リージョン名
+        """
+        self.bucket_name = bucket_name
+        self.s3_endpoint_url = s3_endpoint_url
+        self.region_name = region_name
+
+    async def get_by_key(self, image_key: str) -> bytes | None:
+        """
+        S3から画像を取得する
+
+        Args:
+            image_key (str): 画像のキー
+
+        Returns:
+            bytes | None: 画像のバイナリデータ（存在しない場合はNone）
+        """
+        bucket = await self.get_bucket()
+
+        try:
+            response = await bucket.get_object(Bucket=self.bucket_name, Key=image_key)
+        except bucket.exceptions.NoSuchKey:
+            return None
+
+        if "Body" not in response:
+            return None
+
+        async with response["Body"] as body:
+            return await body.read()
+
+    async def save(
+        self,
+        image_key: str,
+        image_bytes: bytes,
+    ) -> None:
+        """
+        S3に画像を保存する
+
+        Args:
+            image_key (str): 保存する画像のキー
+            image_bytes (bytes): 保存する画像のバイナリデータ
+        """
+        bucket = await self.get_bucket()
+
+        await bucket.put_object(
+            Bucket=self.bucket_name,
+            Key=image_key,
+            Body=image_bytes,
+        )
+
+    async def get_bucket(self):
+        return await async_aws_client_registry.client(
+            "s3",
+            region_name=self.region_name,
+            endpoint_url=self.s3_endpoint_url,
+        )
@@ -1,8 +1,29 @@
-import boto3
+from botocore.exceptions import ClientError
 
-from app.repositories.interface.image_repository import ImageRepository
+from app.aws.client_registry import aws_client_registry
+from app.exceptions.invalid_cursor_exception import InvalidCursorException
+from app.exceptions.invalid_upload_part_exception import InvalidUploadPartException
+from app.exceptions.upload_not_found_exception import UploadNotFoundException
+from app.models.image import (
+    ImageContentType,
+    ImageObject,
+    ImageObjectPage,
+    PresignedPost,
+    UploadedPart,
+    UploadedPartObject,
+)
+from app.repositories.interface.image_repository import (
+    DEFAULT_IMAGE_PAGE_SIZE,
+    DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ImageRepository,
+)
+from app.tracing.timing import timed_methods
 
+# CompleteMultipartUpload でパートの指定が誤っている場合のエラーコード
+INVALID_UPLOAD_PART_ERROR_CODES = {"InvalidPart", "InvalidPartOrder", "EntityTooSmall"}
 
+
+@timed_methods("repository")
 class S3ImageRepository(ImageRepository):
     """
     S3に画像を保存するリポジトリの実装
@@ -17,7 +38,7 @@ class S3ImageRepository(ImageRepository):
             s3_endpoint_url (str): S3のエンドポイントURL
             region_name (str, optional): リージョン名
         """
-        self.bucket = boto3.client(
+        self.bucket = aws_client_registry.client(
             "s3",
             region_name=region_name,
             endpoint_url=s3_endpoint_url,
@@ -35,7 +56,10 @@ class S3ImageRepository(ImageRepository):
         Returns:
             bytes | None: 画像のバイナリデータ（存在しない場合はNone）
         """
-        response = self.bucket.get_object(Bucket=self.bucket_name, Key=image_key)
+        try:
+            response = self.bucket.get_object(Bucket=self.bucket_name, Key=image_key)
+        except self.bucket.exceptions.NoSuchKey:
+            return None
 
         if "Body" not in response:
             return None
@@ -60,11 +84,60 @@ class S3ImageRepository(ImageRepository):
             Body=image_bytes,
         )
 
+    def list_by_prefix(
+        self,
+        prefix: str,
+        limit: int = DEFAULT_IMAGE_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> ImageObjectPage:
+        """
+        ListObjectsV2 でキーが prefix で始まる画像を1ページ分取得する
+
+        Args:
+            prefix (str): キーのプレフィックス (例: pet_id/)
+            limit (int, optional): 1ページあたりの画像数の上限
+            cursor (str | None, optional): 前のページで返されたカーソル (ContinuationToken)
+
+        Returns:
+            ImageObjectPage: ページ内の画像 (キーの順) と次のページのカーソル
+
+        Raises:
+            InvalidCursorException: カーソルが不正な場合
+        """
+        list_kwargs = {
+            "Bucket": self.bucket_name,
+            "Prefix": prefix,
+            # 下の階層のキーは CommonPrefixes にまとめられ，Contents には含まれない
+            "Delimiter": "/",
+            "MaxKeys": limit,
+        }
+        if cursor is not None:
+            list_kwargs["ContinuationToken"] = cursor
+
+        try:
+            response = self.bucket.list_objects_v2(**list_kwargs)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "InvalidArgument":
+                raise InvalidCursorException("カーソルの形式が不正です") from e
+            raise
+
+        return ImageObjectPage(
+            images=[
+                ImageObject(
+                    key=content["Key"],
+                    size=content["Size"],
+                    last_modified=content["LastModified"],
+                )
+                for content in response.get("Contents", [])
+            ],
+            next_cursor=response.get("NextContinuationToken"),
+        )
+
     def get_presigned_url(
         self,
         client_method: str,
         image_key: str,
-        expires_in: int = 3600,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
         http_method: str = None,
     ) -> str:
         """
@@ -88,3 +161,176 @@ class S3ImageRepository(ImageRepository):
             ExpiresIn=expires_in,
             HttpMethod=http_method,
         )
+
+    def get_presigned_post(
+        self,
+        image_key: str,
+        content_type: ImageContentType,
+        max_bytes: int,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ) -> PresignedPost:
+        """
+        サイズと形式をポリシーの条件で制限した，S3の署名付きPOSTを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            content_type (ImageContentType): アップロードを許可する画像の形式
+            max_bytes (int): アップロードを許可する最大サイズ (バイト単位)
+            expires_in (int, optional): 署名の有効期限 (秒単位)
+
+        Returns:
+            PresignedPost: アップロード先のURLとフォームに含めるフィールド
+
+        Notes:
+            条件を満たさないアップロードはS3が 403 で拒否するため，バケットに保存されない
+        """
+        presigned_post = self.bucket.generate_presigned_post(
+            self.bucket_name,
+            image_key,
+            Fields={"Content-Type": content_type.value},
+            Conditions=[
+                ["content-length-range", 1, max_bytes],
+                {"Content-Type": content_type.value},
+            ],
+            ExpiresIn=expires_in,
+        )
+
+        return PresignedPost(url=presigned_post["url"], fields=presigned_post["fields"])
+
+    def create_multipart_upload(self, image_key: str, content_type: ImageContentType) -> str:
+        """
+        S3のマルチパートアップロードを開始する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            content_type (ImageContentType): アップロードする画像の形式
+
+        Returns:
+            str: アップロードID
+        """
+        response = self.bucket.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=image_key,
+            ContentType=content_type.value,
+        )
+
+        return response["UploadId"]
+
+    def get_presigned_upload_part_url(
+        self,
+        image_key: str,
+        upload_id: str,
+        part_number: int,
+        expires_in: int = DEFAULT_PRESIGNED_URL_EXPIRES_IN,
+    ) -> str:
+        """
+        S3のマルチパートアップロードのパートをアップロードする署名付きURLを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+            part_number (int): パート番号 (1から始まる)
+            expires_in (int, optional): URLの有効期限 (秒単位)
+
+        Returns:
+            str: 署名付きURL (PUTで送る)
+        """
+        return self.bucket.generate_presigned_url(
+            "upload_part",
+            Params={
+                "Bucket": self.bucket_name,
+                "Key": image_key,
+                "UploadId": upload_id,
+                "PartNumber": part_number,
+            },
+            ExpiresIn=expires_in,
+        )
+
+    def list_multipart_upload_parts(
+        self, image_key: str, upload_id: str
+    ) -> list[UploadedPartObject]:
+        """
+        ListParts でアップロード済みのパートを取得する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+
+        Returns:
+            list[UploadedPartObject]: アップロード済みのパート (パート番号の順)
+
+        Raises:
+            UploadNotFoundException: アップロードが存在しない場合 (完了済みや中止済みを含む)
+        """
+        list_kwargs = {"Bucket": self.bucket_name, "Key": image_key, "UploadId": upload_id}
+        parts = []
+
+        while True:
+            try:
+                response = self.bucket.list_parts(**list_kwargs)
+            except self.bucket.exceptions.NoSuchUpload as e:
+                raise UploadNotFoundException("アップロードが見つかりませんでした") from e
+
+            parts.extend(
+                UploadedPartObject(
+                    part_number=part["PartNumber"],
+                    etag=part["ETag"],
+                    size=part["Size"],
+                )
+                for part in response.get("Parts", [])
+            )
+
+            if not response.get("IsTruncated"):
+                return parts
+
+            list_kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+
+    def complete_multipart_upload(
+        self,
+        image_key: str,
+        upload_id: str,
+        parts: list[UploadedPart],
+    ) -> None:
+        """
+        S3のマルチパートアップロードを完了する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+            parts (list[UploadedPart]): アップロードしたパート (パート番号の順)
+
+        Raises:
+            UploadNotFoundException: アップロードが存在しない場合
+            InvalidUploadPartException: パートが存在しない場合やETagが一致しない場合
+        """
+        try:
+            self.bucket.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=image_key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": part.part_number, "ETag": part.etag} for part in parts
+                    ],
+                },
+            )
+        except self.bucket.exceptions.NoSuchUpload as e:
+            raise UploadNotFoundException("アップロードが見つかりませんでした") from e
+        except ClientError as e:
+            if e.response["Error"]["Code"] in INVALID_UPLOAD_PART_ERROR_CODES:
+                raise InvalidUploadPartException("アップロードしたパートが一致しません") from e
+            raise
+
+    def abort_multipart_upload(self, image_key: str, upload_id: str) -> None:
+        """
+        S3のマルチパートアップロードを中止し，アップロード済みのパートを破棄する
+
+        Args:
+            image_key (str): アップロードする画像のキー
+            upload_id (str): アップロードID
+        """
+        self.bucket.abort_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=image_key,
+            UploadId=upload_id,
+        )
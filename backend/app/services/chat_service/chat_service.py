@@ -1,3 +1,6 @@
+import time
+from collections.abc import Iterator
+
 from aws_lambda_powertools import Logger
 from pydantic import BaseModel
 
@@ -5,6 +8,7 @@ from app.ai.interface.pet_chat_assistant import PetChatAssistant
 from app.exceptions.chat_response_exception import ChatResponseException
 from app.models.chat import ChatMessage
 from app.repositories.interface.chat_repository import ChatRepository
+from app.tracing.timing import timed_methods
 
 logger = Logger()
 
@@ -18,27 +22,105 @@ class ChatServiceResponse(BaseModel):
     assistant_response: ChatMessage
 
 
+@timed_methods("service")
 class ChatService:
     def __init__(
         self,
         pet_chat_assistant: PetChatAssistant,
         chat_repository: ChatRepository,
+        write_ahead: bool = False,
     ) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            pet_chat_assistant (PetChatAssistant): AIアシスタント
+            chat_repository (ChatRepository): チャットリポジトリ
+            write_ahead (bool, optional): 応答の生成前にユーザーのメッセージを保存するかどうか
+
+        Notes:
+            ユーザーのメッセージとAIアシスタントの応答は応答の生成後に1回の書き込みで保存する．
+            write_ahead を有効にすると応答の生成中に失敗してもユーザーのメッセージが残る
+        """
         self.pet_chat_assistant = pet_chat_assistant
         self.chat_repository = chat_repository
+        self.write_ahead = write_ahead
 
     def execute(self, request: ChatServiceRequest) -> ChatServiceResponse:
         try:
-            self.chat_repository.append_message(request.pet_id, request.user_message)
+            if self.write_ahead:
+                self.chat_repository.append_message(request.pet_id, request.user_message)
 
             assistant_response = self.pet_chat_assistant.converse(
                 request.pet_id,
                 request.user_message,
             )
 
-            self.chat_repository.append_message(request.pet_id, assistant_response)
+            self.chat_repository.append_messages(
+                request.pet_id,
+                [request.user_message, assistant_response],
+            )
         except Exception as e:
             logger.exception(e)
             raise ChatResponseException("チャットの応答を生成する過程で例外が発生しました") from e
 
         return ChatServiceResponse(assistant_response=assistant_response)
+
+    def execute_stream(self, request: ChatServiceRequest) -> Iterator[str]:
+        """
+        AIアシスタントの応答を生成された順に逐次返す
+
+        Args:
+            request (ChatServiceRequest): リクエスト
+
+        Yields:
+            str: AIアシスタントからの応答の断片
+
+        Raises:
+            ChatResponseException: 応答の生成または保存に失敗した場合
+
+        Notes:
+            AIアシスタントの応答は最後まで受信した後にチャット履歴へ保存する
+        """
+        started_at = time.perf_counter()
+        first_chunk_at = None
+
+        try:
+            if self.write_ahead:
+                self.chat_repository.append_message(request.pet_id, request.user_message)
+
+            chunks: list[str] = []
+            for chunk in self.pet_chat_assistant.converse_stream(
+                request.pet_id,
+                request.user_message,
+            ):
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+
+                chunks.append(chunk)
+                yield chunk
+
+            completed_at = time.perf_counter()
+
+            assistant_response = ChatMessage(content="".join(chunks))
+            self.chat_repository.append_messages(
+                request.pet_id,
+                [request.user_message, assistant_response],
+            )
+        except Exception as e:
+            logger.exception(e)
+            raise ChatResponseException("チャットの応答を生成する過程で例外が発生しました") from e
+
+        logger.info(
+            "チャットの応答のストリーミングが完了しました",
+            extra={
+                "pet_id": request.pet_id,
+                "chunk_count": len(chunks),
+                "time_to_first_chunk_ms": (
+                    None
+                    if first_chunk_at is None
+                    else round((first_chunk_at - started_at) * 1000, 1)
+                ),
+                "generation_ms": round((completed_at - started_at) * 1000, 1),
+            },
+        )
@@ -1,25 +1,40 @@
-from pydantic import BaseModel
+from typing import Annotated
 
-from app.models.chat import ChatMessage
-from app.repositories.interface.chat_repository import ChatRepository
+from pydantic import BaseModel, SkipValidation
+
+from app.exceptions.pet_not_found_exception import PetNotFoundException
+from app.models.chat import ChatHistoryEntry
+from app.repositories.interface.chat_repository import DEFAULT_CHAT_PAGE_SIZE, ChatRepository
+from app.repositories.interface.pet_repository import PetRepository
+from app.tracing.timing import timed_methods
 
 
 class GetChatServiceRequest(BaseModel):
     pet_id: str
+    limit: int = DEFAULT_CHAT_PAGE_SIZE
+    cursor: str | None = None
 
 
 class GetChatServiceResponse(BaseModel):
-    chat_history: list[ChatMessage]
+    # リポジトリで作成した履歴をそのまま返すため，1件ずつ検証し直さない
+    chat_history: Annotated[list[ChatHistoryEntry], SkipValidation]
+    next_cursor: str | None = None
 
 
+@timed_methods("service")
 class GetChatService:
-    def __init__(self, chat_repository: ChatRepository):
+    def __init__(self, chat_repository: ChatRepository, pet_repository: PetRepository):
         self.chat_repository = chat_repository
+        self.pet_repository = pet_repository
 
     def execute(self, request: GetChatServiceRequest) -> GetChatServiceResponse | None:
-        chat_history = self.chat_repository.get_by_pet_id(request.pet_id)
+        page = self.chat_repository.get_by_pet_id(request.pet_id, request.limit, request.cursor)
+
+        if not page.messages and request.cursor is None:
+            # メッセージがない場合だけペットの存在を確認する
+            if self.pet_repository.get_by_id(request.pet_id) is None:
+                raise PetNotFoundException(f"ペットが見つかりませんでした: {request.pet_id}")
 
-        if chat_history is None:
             return None
 
-        return GetChatServiceResponse(chat_history=chat_history)
+        return GetChatServiceResponse(chat_history=page.messages, next_cursor=page.next_cursor)
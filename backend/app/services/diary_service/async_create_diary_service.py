@@ -0,0 +1,200 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from aws_lambda_powertools import Logger
+
+from app.ai.interface.async_pet_care_advice_client import AsyncPetCareAdviceClient
+from app.ai.interface.async_pet_care_tasks_client import AsyncPetCareTasksClient
+from app.ai.interface.pet_care_advice_client import CareAdvicePromptVariables
+from app.ai.interface.pet_care_tasks_client import CareTasksPromptVariables
+from app.exceptions.diary_creation_exception import DiaryCreationException
+from app.models.diary import Diary, DiaryTask
+from app.repositories.interface.async_diary_repository import AsyncDiaryRepository
+from app.services.diary_service.create_diary_service import (
+    CreateDiaryService,
+    CreateDiaryServiceRequest,
+    CreateDiaryServiceResponse,
+)
+from app.tracing.timing import timed_methods
+
+logger = Logger()
+
+
+@timed_methods("service")
+class AsyncCreateDiaryService:
+    """
+    日記を作成するサービス (非同期版)
+
+    飼育タスクと飼育アドバイスの生成をスレッドではなくタスクとして並行して待つため，
+    1つのイベントループで多くのリクエストの生成を同時に待てる．
+    リトライとタイムアウトの扱いは同期版の CreateDiaryService と同じ．
+    """
+
+    MAX_RETRY_COUNT = CreateDiaryService.MAX_RETRY_COUNT
+
+    CARE_TASKS = CreateDiaryService.CARE_TASKS
+    CARE_ADVICE = CreateDiaryService.CARE_ADVICE
+
+    # 飼育タスクと飼育アドバイスそれぞれの生成を待つ時間 (秒単位)
+    CARE_TASKS_TIMEOUT_SECONDS = CreateDiaryService.CARE_TASKS_TIMEOUT_SECONDS
+    CARE_ADVICE_TIMEOUT_SECONDS = CreateDiaryService.CARE_ADVICE_TIMEOUT_SECONDS
+
+    def __init__(
+        self,
+        pet_care_tasks_client: AsyncPetCareTasksClient,
+        pet_care_advice_client: AsyncPetCareAdviceClient,
+        diary_repository: AsyncDiaryRepository,
+    ):
+        self.pet_care_tasks_client = pet_care_tasks_client
+        self.pet_care_advice_client = pet_care_advice_client
+        self.diary_repository = diary_repository
+
+    async def execute(self, request: CreateDiaryServiceRequest) -> CreateDiaryServiceResponse:
+        # 成功した (または実行中の) 生成処理はリトライ時に使い回し，失敗したものだけを生成し直す
+        branch_tasks: dict[str, asyncio.Task] = {}
+
+        try:
+            for _ in range(self.MAX_RETRY_COUNT):
+                try:
+                    return await self.try_create_diary(request, branch_tasks)
+                except Exception as e:
+                    logger.exception(str(e))
+                    last_exception = e
+        finally:
+            # 最終的に失敗した場合 (またはリクエストが中断された場合) は実行中の生成処理を止める
+            for task in branch_tasks.values():
+                task.cancel()
+
+        raise DiaryCreationException("日記の作成に失敗しました") from last_exception
+
+    async def try_create_diary(
+        self,
+        request: CreateDiaryServiceRequest,
+        branch_tasks: dict[str, asyncio.Task],
+    ) -> CreateDiaryServiceResponse:
+        # 飼育タスクと飼育アドバイスを並行して生成
+        generated_results = await self.generate_concurrently(request, branch_tasks)
+
+        # 日記を作成
+        new_diary = Diary(
+            pet_id=request.pet_id,
+            date=request.date,
+            picture_name=request.picture_name,
+            reacted=False,
+            advice=generated_results[self.CARE_ADVICE],
+            comment="",
+            weather=request.weather,
+            temperature=request.temperature,
+            tasks=generated_results[self.CARE_TASKS],
+        )
+        created_diary = await self.diary_repository.create(new_diary)
+
+        return CreateDiaryServiceResponse.model_validate(created_diary)
+
+    async def generate_concurrently(
+        self,
+        request: CreateDiaryServiceRequest,
+        branch_tasks: dict[str, asyncio.Task],
+    ) -> dict[str, Any]:
+        """
+        飼育タスクと飼育アドバイスを並行して生成する
+
+        Args:
+            request (CreateDiaryServiceRequest): 日記作成のリクエスト
+            branch_tasks (dict[str, asyncio.Task]): 以前の試行で開始した生成処理
+
+        Returns:
+            dict[str, Any]: 生成したものの名前と結果
+
+        Raises:
+            TimeoutError: 生成が制限時間内に終わらなかった場合
+            Exception: どちらかの生成に失敗した場合
+        """
+        branches: dict[
+            str, tuple[Callable[[CreateDiaryServiceRequest], Coroutine[Any, Any, Any]], float]
+        ] = {
+            self.CARE_TASKS: (self.generate_care_tasks, self.CARE_TASKS_TIMEOUT_SECONDS),
+            self.CARE_ADVICE: (self.generate_care_advice, self.CARE_ADVICE_TIMEOUT_SECONDS),
+        }
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        deadlines: dict[asyncio.Task, float] = {}
+        branch_names: dict[asyncio.Task, str] = {}
+
+        for name, (generate, timeout_seconds) in branches.items():
+            task = branch_tasks.get(name)
+
+            if task is None or task.cancelled() or (task.done() and task.exception() is not None):
+                logger.info("生成を開始します", extra={"branch": name})
+                task = asyncio.create_task(generate(request))
+                branch_tasks[name] = task
+
+            deadlines[task] = started_at + timeout_seconds
+            branch_names[task] = name
+
+        not_done = set(branch_names)
+
+        while not_done:
+            timeout = min(deadlines[task] for task in not_done) - loop.time()
+            done, not_done = await asyncio.wait(
+                not_done, timeout=max(timeout, 0.0), return_when=asyncio.FIRST_EXCEPTION
+            )
+
+            for task in done:
+                exception = task.exception()
+                if exception is not None:
+                    raise exception
+
+            for task in not_done:
+                if loop.time() >= deadlines[task]:
+                    # スレッドと違ってタスクは中断できるため，待っている呼び出しごと取り消す
+                    task.cancel()
+                    del branch_tasks[branch_names[task]]
+                    raise TimeoutError(f"{branch_names[task]} の生成がタイムアウトしました")
+
+        return {name: task.result() for name, task in branch_tasks.items()}
+
+    async def generate_care_tasks(self, request: CreateDiaryServiceRequest) -> list[DiaryTask]:
+        """
+        飼育タスクを生成する
+
+        Args:
+            request (CreateDiaryServiceRequest): 日記作成のリクエスト
+
+        Returns:
+            list[DiaryTask]: 飼育タスク
+        """
+        care_task_prompt_variables = CareTasksPromptVariables(
+            category=request.category,
+            birth_date=request.birth_date,
+        )
+
+        return await self.pet_care_tasks_client.generate(
+            prompt_variables=care_task_prompt_variables,
+            pet_picture_key=f"{request.pet_id}/{request.picture_name}",
+        )
+
+    async def generate_care_advice(self, request: CreateDiaryServiceRequest) -> str:
+        """
+        飼育アドバイスを生成する
+
+        Args:
+            request (CreateDiaryServiceRequest): 日記作成のリクエスト
+
+        Returns:
+            str: 飼育アドバイス
+        """
+        care_advice_prompt_variables = CareAdvicePromptVariables(
+            birth_date=request.birth_date,
+            category=request.category,
+            date=request.date,
+            weather=request.weather,
+            temperature=request.temperature,
+        )
+
+        return await self.pet_care_advice_client.generate(
+            prompt_variables=care_advice_prompt_variables,
+            pet_picture_key=f"{request.pet_id}/{request.picture_name}",
+        )
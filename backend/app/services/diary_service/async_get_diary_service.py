@@ -0,0 +1,20 @@
+from app.repositories.interface.async_diary_repository import AsyncDiaryRepository
+from app.services.diary_service.get_diary_service import (
+    GetDiaryServiceRequest,
+    GetDiaryServiceResponse,
+)
+from app.tracing.timing import timed_methods
+
+
+@timed_methods("service")
+class AsyncGetDiaryService:
+    def __init__(self, diary_repository: AsyncDiaryRepository):
+        self.diary_repository = diary_repository
+
+    async def execute(self, request: GetDiaryServiceRequest) -> GetDiaryServiceResponse | None:
+        diary = await self.diary_repository.get_by_id(request.pet_id, request.date)
+
+        if diary is None:
+            return None
+
+        return GetDiaryServiceResponse.model_validate(diary)
@@ -1,16 +1,26 @@
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
 from datetime import date, datetime
+from typing import Any
 
 from aws_lambda_powertools import Logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.ai.interface.pet_care_advice_client import CareAdvicePromptVariables, PetCareAdviceClient
 from app.ai.interface.pet_care_tasks_client import CareTasksPromptVariables, PetCareTasksClient
 from app.exceptions.diary_creation_exception import DiaryCreationException
 from app.models.diary import Diary, DiaryTask, Weather
 from app.repositories.interface.diary_repository import DiaryRepository
+from app.tracing.timing import timed_methods
 
 logger = Logger()
 
+# 飼育タスクと飼育アドバイスを生成するスレッドプール (コンテナ内のリクエスト間で共有する)
+# タイムアウトした生成処理は中断できないため，リクエストごとにスレッドが増えないように上限を設ける
+executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="create-diary")
+
 
 class CreateDiaryServiceRequest(BaseModel):
     pet_id: str
@@ -23,6 +33,8 @@ class CreateDiaryServiceRequest(BaseModel):
 
 
 class CreateDiaryServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     pet_id: str
     date: date
     picture_name: str
@@ -36,9 +48,19 @@ class CreateDiaryServiceResponse(BaseModel):
     updated_at: datetime
 
 
+@timed_methods("service")
 class CreateDiaryService:
     MAX_RETRY_COUNT = 3
 
+    CARE_TASKS = "care_tasks"
+    CARE_ADVICE = "care_advice"
+
+    # 飼育タスクと飼育アドバイスそれぞれの生成を待つ時間 (秒単位)
+    CARE_TASKS_TIMEOUT_SECONDS = 40
+    CARE_ADVICE_TIMEOUT_SECONDS = 40
+    # すべての試行を合わせて生成を待つ時間 (秒単位)
+    TIMEOUT_SECONDS = 60
+
     def __init__(
         self,
         pet_care_tasks_client: PetCareTasksClient,
@@ -50,27 +72,151 @@ class CreateDiaryService:
         self.diary_repository = diary_repository
 
     def execute(self, request: CreateDiaryServiceRequest) -> CreateDiaryServiceResponse:
-        for _ in range(self.MAX_RETRY_COUNT):
-            try:
-                return self.try_create_diary(request)
-            except Exception as e:
-                logger.exception(str(e))
-                last_exception = e
+        # リトライしても最初の試行から TIMEOUT_SECONDS を超えて待たない
+        deadline = time.monotonic() + self.TIMEOUT_SECONDS
+        # 成功した (または実行中の) 生成処理は期限ごと使い回し，失敗したものだけを生成し直す
+        branch_futures: dict[str, tuple[Future, float]] = {}
+
+        try:
+            for _ in range(self.MAX_RETRY_COUNT):
+                try:
+                    return self.try_create_diary(request, branch_futures, deadline)
+                except Exception as e:
+                    logger.exception(str(e))
+                    last_exception = e
+
+                if time.monotonic() >= deadline:
+                    break
+        finally:
+            # 最終的に失敗した場合は実行待ちの生成処理を取り消す
+            for future, _ in branch_futures.values():
+                future.cancel()
 
         raise DiaryCreationException("日記の作成に失敗しました") from last_exception
 
-    def try_create_diary(self, request: CreateDiaryServiceRequest) -> CreateDiaryServiceResponse:
-        # 飼育タスクを生成
+    def try_create_diary(
+        self,
+        request: CreateDiaryServiceRequest,
+        branch_futures: dict[str, tuple[Future, float]],
+        deadline: float,
+    ) -> CreateDiaryServiceResponse:
+        # 飼育タスクと飼育アドバイスを並行して生成
+        generated_results = self.generate_concurrently(request, branch_futures, deadline)
+
+        # 日記を作成
+        new_diary = Diary(
+            pet_id=request.pet_id,
+            date=request.date,
+            picture_name=request.picture_name,
+            reacted=False,
+            advice=generated_results[self.CARE_ADVICE],
+            comment="",
+            weather=request.weather,
+            temperature=request.temperature,
+            tasks=generated_results[self.CARE_TASKS],
+        )
+        created_diary = self.diary_repository.create(new_diary)
+
+        return CreateDiaryServiceResponse.model_validate(created_diary)
+
+    def generate_concurrently(
+        self,
+        request: CreateDiaryServiceRequest,
+        branch_futures: dict[str, tuple[Future, float]],
+        deadline: float,
+    ) -> dict[str, Any]:
+        """
+        飼育タスクと飼育アドバイスを並行して生成する
+
+        Args:
+            request (CreateDiaryServiceRequest): 日記作成のリクエスト
+            branch_futures (dict[str, tuple[Future, float]]): 以前の試行で開始した生成処理と期限
+            deadline (float): すべての試行を合わせた期限 (time.monotonic の値)
+
+        Returns:
+            dict[str, Any]: 生成したものの名前と結果
+
+        Raises:
+            TimeoutError: 生成が制限時間内に終わらなかった場合
+            Exception: どちらかの生成に失敗した場合
+        """
+        branches: dict[str, tuple[Callable[[CreateDiaryServiceRequest], Any], float]] = {
+            self.CARE_TASKS: (self.generate_care_tasks, self.CARE_TASKS_TIMEOUT_SECONDS),
+            self.CARE_ADVICE: (self.generate_care_advice, self.CARE_ADVICE_TIMEOUT_SECONDS),
+        }
+
+        started_at = time.monotonic()
+        deadlines: dict[Future, float] = {}
+        branch_names: dict[Future, str] = {}
+
+        for name, (generate, timeout_seconds) in branches.items():
+            future, future_deadline = branch_futures.get(name, (None, deadline))
+
+            if (
+                future is None
+                or future.cancelled()
+                or (future.done() and future.exception() is not None)
+            ):
+                logger.info("生成を開始します", extra={"branch": name})
+                # 処理時間の計測などのコンテキストを引き継いで別スレッドで実行する
+                future = executor.submit(copy_context().run, generate, request)
+                future_deadline = min(started_at + timeout_seconds, deadline)
+                branch_futures[name] = (future, future_deadline)
+
+            # 使い回す生成処理は開始したときの期限のまま待つ
+            deadlines[future] = future_deadline
+            branch_names[future] = name
+
+        not_done = set(branch_names)
+
+        while not_done:
+            timeout = min(deadlines[future] for future in not_done) - time.monotonic()
+            done, not_done = wait(not_done, timeout=max(timeout, 0.0), return_when=FIRST_EXCEPTION)
+
+            for future in done:
+                exception = future.exception()
+                if exception is not None:
+                    raise exception
+
+            for future in not_done:
+                if time.monotonic() >= deadlines[future]:
+                    # 中断できないため結果を待たずに次の試行で生成し直す
+                    future.cancel()
+                    del branch_futures[branch_names[future]]
+                    raise TimeoutError(f"{branch_names[future]} の生成がタイムアウトしました")
+
+        return {name: future.result() for name, (future, _) in branch_futures.items()}
+
+    def generate_care_tasks(self, request: CreateDiaryServiceRequest) -> list[DiaryTask]:
+        """
+        飼育タスクを生成する
+
+        Args:
+            request (CreateDiaryServiceRequest): 日記作成のリクエスト
+
+        Returns:
+            list[DiaryTask]: 飼育タスク
+        """
         care_task_prompt_variables = CareTasksPromptVariables(
             category=request.category,
             birth_date=request.birth_date,
         )
-        care_tasks = self.pet_care_tasks_client.generate(
+
+        return self.pet_care_tasks_client.generate(
             prompt_variables=care_task_prompt_variables,
             pet_picture_key=f"{request.pet_id}/{request.picture_name}",
         )
 
-        # 飼育アドバイスを生成
+    def generate_care_advice(self, request: CreateDiaryServiceRequest) -> str:
+        """
+        飼育アドバイスを生成する
+
+        Args:
+            request (CreateDiaryServiceRequest): 日記作成のリクエスト
+
+        Returns:
+            str: 飼育アドバイス
+        """
         care_advice_prompt_variables = CareAdvicePromptVariables(
             birth_date=request.birth_date,
             category=request.category,
@@ -78,23 +224,8 @@ class CreateDiaryService:
             weather=request.weather,
             temperature=request.temperature,
         )
-        care_advice = self.pet_care_advice_client.generate(
+
+        return self.pet_care_advice_client.generate(
             prompt_variables=care_advice_prompt_variables,
             pet_picture_key=f"{request.pet_id}/{request.picture_name}",
         )
-
-        # 日記を作成
-        new_diary = Diary(
-            pet_id=request.pet_id,
-            date=request.date,
-            picture_name=request.picture_name,
-            reacted=False,
-            advice=care_advice,
-            comment="",
-            weather=request.weather,
-            temperature=request.temperature,
-            tasks=care_tasks,
-        )
-        created_diary = self.diary_repository.create(new_diary)
-
-        return CreateDiaryServiceResponse(**created_diary.to_dict())
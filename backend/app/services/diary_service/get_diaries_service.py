@@ -0,0 +1,37 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.models.types import NonEmptyId
+from app.repositories.interface.diary_repository import DiaryRepository
+from app.services.diary_service.get_diary_service import GetDiaryServiceResponse
+from app.tracing.timing import timed_methods
+
+
+class DiaryKey(BaseModel):
+    pet_id: NonEmptyId
+    date: date
+
+
+class GetDiariesServiceRequest(BaseModel):
+    keys: list[DiaryKey]
+
+
+class GetDiariesServiceResponse(BaseModel):
+    diaries: list[GetDiaryServiceResponse | None]
+
+
+@timed_methods("service")
+class GetDiariesService:
+    def __init__(self, diary_repository: DiaryRepository):
+        self.diary_repository = diary_repository
+
+    def execute(self, request: GetDiariesServiceRequest) -> GetDiariesServiceResponse:
+        diaries = self.diary_repository.get_many([(key.pet_id, key.date) for key in request.keys])
+
+        return GetDiariesServiceResponse(
+            diaries=[
+                None if diary is None else GetDiaryServiceResponse.model_validate(diary)
+                for diary in diaries
+            ],
+        )
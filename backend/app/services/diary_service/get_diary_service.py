@@ -1,9 +1,10 @@
 from datetime import date, datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.models.diary import DiaryTask, Weather
 from app.repositories.interface.diary_repository import DiaryRepository
+from app.tracing.timing import timed_methods
 
 
 class GetDiaryServiceRequest(BaseModel):
@@ -12,6 +13,8 @@ class GetDiaryServiceRequest(BaseModel):
 
 
 class GetDiaryServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     pet_id: str
     date: date
     picture_name: str
@@ -23,8 +26,10 @@ class GetDiaryServiceResponse(BaseModel):
     tasks: list[DiaryTask]
     created_at: datetime
     updated_at: datetime
+    version: int = 0
 
 
+@timed_methods("service")
 class GetDiaryService:
     def __init__(self, diary_repository: DiaryRepository):
         self.diary_repository = diary_repository
@@ -35,4 +40,4 @@ class GetDiaryService:
         if diary is None:
             return None
 
-        return GetDiaryServiceResponse(**diary.to_dict())
+        return GetDiaryServiceResponse.model_validate(diary)
@@ -0,0 +1,37 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.models.diary import DiarySummary
+from app.repositories.interface.diary_repository import DEFAULT_DIARY_PAGE_SIZE, DiaryRepository
+from app.tracing.timing import timed_methods
+
+
+class ListDiariesServiceRequest(BaseModel):
+    pet_id: str
+    start: date
+    end: date
+    limit: int = DEFAULT_DIARY_PAGE_SIZE
+    cursor: str | None = None
+
+
+class ListDiariesServiceResponse(BaseModel):
+    diaries: list[DiarySummary]
+    next_cursor: str | None = None
+
+
+@timed_methods("service")
+class ListDiariesService:
+    def __init__(self, diary_repository: DiaryRepository):
+        self.diary_repository = diary_repository
+
+    def execute(self, request: ListDiariesServiceRequest) -> ListDiariesServiceResponse:
+        page = self.diary_repository.list_range(
+            request.pet_id,
+            request.start,
+            request.end,
+            request.limit,
+            request.cursor,
+        )
+
+        return ListDiariesServiceResponse(diaries=page.diaries, next_cursor=page.next_cursor)
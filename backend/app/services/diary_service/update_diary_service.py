@@ -1,8 +1,21 @@
-from datetime import date, datetime
-from pydantic import BaseModel
+from datetime import UTC, date, datetime
 
-from app.repositories.interface.diary_repository import DiaryRepository
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import to_jsonable_python
+
+from app.exceptions.version_conflict_exception import VersionConflictException
+from app.exceptions.version_required_exception import VersionRequiredException
 from app.models.diary import Diary, DiaryTask, Weather
+from app.repositories.interface.diary_repository import DiaryRepository
+from app.tracing.timing import timed_methods
+
+logger = Logger()
+metrics = Metrics()
+
+MAX_RETRY_COUNT = 3
+
 
 class UpdateDiaryServiceRequest(BaseModel):
     pet_id: str
@@ -10,8 +23,18 @@ class UpdateDiaryServiceRequest(BaseModel):
     reacted: bool | None
     comment: str | None
     tasks: list[DiaryTask] | None
+    expected_version: int | None = None
+    # True の場合は競合しても再試行しない (If-Match で指定されたバージョンを書き込みの条件にする)
+    require_expected_version: bool = False
+    # If-Match のETagに含まれる更新日時 (作成し直してバージョンが0に戻った項目と区別する)
+    expected_updated_at: datetime | None = None
+    # True の場合はバージョンを指定せずに存在する項目を更新する (If-Match: *)
+    unconditional: bool = False
+
 
 class UpdateDiaryServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     pet_id: str
     date: date
     picture_name: str
@@ -23,18 +46,125 @@ class UpdateDiaryServiceResponse(BaseModel):
     tasks: list[DiaryTask]
     created_at: datetime
     updated_at: datetime
+    version: int
+
 
+@timed_methods("service")
 class UpdateDiaryService:
-    def __init__(self, diary_repository: DiaryRepository):
+    def __init__(self, diary_repository: DiaryRepository, allow_unversioned_update: bool = False):
+        """
+        コンストラクタ
+
+        Args:
+            diary_repository (DiaryRepository): 日記リポジトリ
+            allow_unversioned_update (bool, optional): バージョンを指定しない更新を許可するか
+                (許可した場合は他の端末の更新を確認せずに上書きする)
+        """
         self.diary_repository = diary_repository
+        self.allow_unversioned_update = allow_unversioned_update
+
+    def execute(self, request: UpdateDiaryServiceRequest) -> UpdateDiaryServiceResponse | None:
+        """
+        日記の指定された属性だけを更新する
+
+        Args:
+            request (UpdateDiaryServiceRequest): リクエスト
+
+        Returns:
+            UpdateDiaryServiceResponse | None: 更新後の日記 (存在しない場合はNone)
+
+        Raises:
+            VersionRequiredException: バージョンを指定せず，更新も許可していない場合
+            VersionConflictException: 再試行しても競合が解消しなかった場合
+                (require_expected_version が True の場合は最初に競合した時点で送出する)
+
+        Notes:
+            expected_version を条件に書き込み，他のリクエストと競合した時は
+            最新の日記とマージして最大 MAX_RETRY_COUNT 回まで再試行する．
+            タスクが最新の日記と異なる場合はどちらの変更を優先するか判断できないため再試行しない．
+            expected_updated_at が指定された場合は更新日時も書き込みの条件にする
+        """
+        if request.expected_version is None and not (
+            request.unconditional or self.allow_unversioned_update
+        ):
+            raise VersionRequiredException("取得した時点の日記のバージョンを指定してください")
+
+        # 読み込まずに指定された属性だけを更新する
+        # exclude_none はタスクの中の None (サブタスクを持つタスクの時刻) も除くため使わない
+        requested_attributes = {
+            name: value
+            for name, value in request.model_dump(
+                mode="json", include={"reacted", "comment", "tasks"}
+            ).items()
+            if value is not None
+        }
+        attributes = requested_attributes
+        expected_version = request.expected_version
+
+        for retry_count in range(MAX_RETRY_COUNT + 1):
+            attributes["updated_at"] = to_jsonable_python(datetime.now(UTC))
+
+            try:
+                updated_diary = self.diary_repository.update_attributes(
+                    request.pet_id,
+                    request.date,
+                    attributes,
+                    expected_version,
+                    request.expected_updated_at,
+                )
+            except VersionConflictException as e:
+                metrics.add_metric(name="DiaryUpdateConflicts", unit=MetricUnit.Count, value=1)
+
+                if request.require_expected_version:
+                    raise
+
+                current_diary: Diary = e.current
+                attributes = merge_diary_attributes(requested_attributes, current_diary)
+                expected_version = current_diary.version
+                continue
+
+            if retry_count > 0:
+                metrics.add_metric(
+                    name="DiaryUpdateRetries",
+                    unit=MetricUnit.Count,
+                    value=retry_count,
+                )
+                logger.info(
+                    "競合した日記の更新をマージして再試行しました",
+                    extra={"pet_id": request.pet_id, "retry_count": retry_count},
+                )
+
+            if updated_diary is None:
+                return None
+
+            return UpdateDiaryServiceResponse.model_validate(updated_diary)
+
+        metrics.add_metric(name="DiaryUpdateConflictsExhausted", unit=MetricUnit.Count, value=1)
+        raise VersionConflictException("日記の更新が他のリクエストと競合しました")
+
+
+def merge_diary_attributes(requested_attributes: dict, current_diary: Diary) -> dict:
+    """
+    リクエストされた属性を競合した最新の日記にマージする
+
+    Args:
+        requested_attributes (dict): リクエストされた属性 (JSONに変換済みの値)
+        current_diary (Diary): 競合した時点の最新の日記
+
+    Returns:
+        dict: 最新の日記に対して書き込む属性
 
-    def execute(self, request: UpdateDiaryServiceRequest) -> UpdateDiaryServiceResponse:
-        current_diary = self.diary_repository.get_by_id(request.pet_id, request.date)
+    Raises:
+        VersionConflictException: リクエストされたタスクが最新の日記のタスクと異なる場合
 
-        if current_diary is None:
-            return None
-        
-        updated_diary: Diary = current_diary.update(**request.model_dump())
-        self.diary_repository.update(updated_diary)
+    Notes:
+        リアクションとコメントはリクエストの値を優先する．
+        取得した時点のタスクが分からないため，タスクが異なる場合はどちらで変更したか判断できない．
+        完了状態を1つだけ変更する場合はタスクごとの更新 (PATCH) を使う
+    """
+    if "tasks" in requested_attributes and requested_attributes["tasks"] != to_jsonable_python(
+        current_diary.tasks
+    ):
+        raise VersionConflictException("日記のタスクが他のリクエストによって更新されています")
 
-        return UpdateDiaryServiceResponse(**updated_diary.to_dict())
\ No newline at end of file
+    return dict(requested_attributes)
@@ -0,0 +1,72 @@
+from datetime import UTC, date, datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic_core import to_jsonable_python
+
+from app.models.diary import DiaryTask, Weather
+from app.repositories.interface.diary_repository import DiaryRepository
+from app.tracing.timing import timed_methods
+
+
+class UpdateDiaryTaskServiceRequest(BaseModel):
+    pet_id: str
+    date: date
+    task_index: int = Field(ge=0)
+    sub_task_index: int | None = Field(default=None, ge=0)
+    completed: bool
+
+
+class UpdateDiaryTaskServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    pet_id: str
+    date: date
+    picture_name: str
+    reacted: bool
+    advice: str
+    comment: str
+    weather: Weather
+    temperature: str
+    tasks: list[DiaryTask]
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+
+@timed_methods("service")
+class UpdateDiaryTaskService:
+    def __init__(self, diary_repository: DiaryRepository):
+        self.diary_repository = diary_repository
+
+    def execute(
+        self,
+        request: UpdateDiaryTaskServiceRequest,
+    ) -> UpdateDiaryTaskServiceResponse | None:
+        """
+        日記の1つのタスクまたはサブタスクの完了状態を更新する
+
+        Args:
+            request (UpdateDiaryTaskServiceRequest): リクエスト
+
+        Returns:
+            UpdateDiaryTaskServiceResponse | None: 更新後の日記 (存在しない場合はNone)
+
+        Raises:
+            DiaryTaskNotFoundException: 指定した位置にタスクまたはサブタスクが存在しない場合
+
+        Notes:
+            完了状態だけを書き換えるため，別のタスクへの並行した更新とは競合しない
+        """
+        updated_diary = self.diary_repository.update_task_completed(
+            request.pet_id,
+            request.date,
+            request.task_index,
+            request.sub_task_index,
+            request.completed,
+            {"updated_at": to_jsonable_python(datetime.now(UTC))},
+        )
+
+        if updated_diary is None:
+            return None
+
+        return UpdateDiaryTaskServiceResponse.model_validate(updated_diary)
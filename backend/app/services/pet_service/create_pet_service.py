@@ -1,6 +1,12 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import copy_context
 from datetime import UTC, date, datetime
 
 from aws_lambda_powertools import Logger
@@ -8,11 +14,19 @@ from pydantic import BaseModel
 
 from app.ai.interface.pet_avatar_image_client import PetAvatarImageClient
 from app.ai.interface.pet_care_notes_client import CareNotesPromptVariables, PetCareNotesClient
-from app.ai.interface.pet_picture_description_client import PetPictureDescriptionClient
+from app.ai.interface.pet_picture_description_client import (
+    PetPictureDescription,
+    PetPictureDescriptionClient,
+)
 from app.exceptions.pet_creation_exception import PetCreationException
 from app.models.pet import Pet, PetCareNote, PetGender
+from app.models.pet_creation_checkpoint import PetCreationCheckpoint
 from app.repositories.interface.image_repository import ImageRepository
+from app.repositories.interface.pet_creation_checkpoint_repository import (
+    PetCreationCheckpointRepository,
+)
 from app.repositories.interface.pet_repository import PetRepository
+from app.tracing.timing import timed_methods
 
 logger = Logger()
 
@@ -28,6 +42,15 @@ class CreatePetServiceRequest(BaseModel):
     def get_picture_image_key(self) -> str:
         return f"{self.pet_id}/{self.picture_name}"
 
+    def get_fingerprint(self) -> str:
+        """
+        途中結果を使い回せるかを判定するためのリクエストの識別子を取得する
+
+        Returns:
+            str: リクエストの内容から計算したハッシュ値
+        """
+        return hashlib.sha256(self.model_dump_json().encode()).hexdigest()
+
 
 class CreatePetServiceResponse(BaseModel):
     pet_id: str
@@ -55,6 +78,7 @@ class CreatePetServiceResponse(BaseModel):
         )
 
 
+@timed_methods("service")
 class CreatePetService:
     MAX_RETRY = 3
 
@@ -68,12 +92,14 @@ class CreatePetService:
         pet_care_notes_client: PetCareNotesClient,
         pet_repository: PetRepository,
         image_repository: ImageRepository,
+        checkpoint_repository: PetCreationCheckpointRepository,
     ):
         self.pet_picture_description_client = pet_picture_description_client
         self.pet_avatar_image_client = pet_avatar_image_client
         self.pet_care_notes_client = pet_care_notes_client
         self.pet_repository = pet_repository
         self.image_repository = image_repository
+        self.checkpoint_repository = checkpoint_repository
 
     def execute(self, request: CreatePetServiceRequest) -> CreatePetServiceResponse:
         last_exception = None
@@ -88,38 +114,252 @@ class CreatePetService:
         raise PetCreationException("ペットの作成に失敗しました") from last_exception
 
     def try_create_pet(self, request: CreatePetServiceRequest) -> CreatePetServiceResponse:
+        stage_timings: dict[str, float] = {}
+
+        # 前回の試行で完了した段階は途中結果から再開する
+        checkpoint = self.load_checkpoint(request)
+
+        # 飼育情報の生成はアバター画像の生成と依存関係がないため並行して実行する
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="create-pet") as executor:
+            # 処理時間の計測などのコンテキストを引き継いで別スレッドで実行する
+            care_notes_future = executor.submit(
+                copy_context().run,
+                self.generate_care_notes,
+                request,
+                checkpoint,
+                stage_timings,
+            )
+
+            try:
+                with self.measure_stage(stage_timings, "avatar_pipeline"):
+                    avatar_image_name = self.create_avatar(request, checkpoint, stage_timings)
+            except Exception:
+                care_notes_future.cancel()
+                raise
+
+            care_notes = care_notes_future.result()
+
+        # ペットを作成
+        with self.measure_stage(stage_timings, "create_pet"):
+            new_pet = Pet(
+                pet_id=request.pet_id,
+                name=request.name,
+                category=request.category,
+                birth_date=request.birth_date,
+                gender=request.gender,
+                care_notes=care_notes,
+                image_name=avatar_image_name,
+                created_at=datetime.now(UTC),
+                updated_at=datetime.now(UTC),
+            )
+            self.pet_repository.create(new_pet)
+
+        self.delete_checkpoint(request)
+
+        critical_path = (
+            "avatar_pipeline"
+            if stage_timings["avatar_pipeline"] >= stage_timings["generate_care_notes"]
+            else "generate_care_notes"
+        )
+        logger.info(
+            "ペットの作成が完了しました",
+            extra={
+                "pet_id": request.pet_id,
+                "stage_timings_ms": stage_timings,
+                "critical_path": critical_path,
+                "resumed_from_checkpoint": checkpoint is not None,
+            },
+        )
+
+        return CreatePetServiceResponse.from_pet(new_pet)
+
+    def create_avatar(
+        self,
+        request: CreatePetServiceRequest,
+        checkpoint: PetCreationCheckpoint | None,
+        stage_timings: dict[str, float],
+    ) -> str:
+        """
+        ペットの画像からアバター画像を生成して保存する
+
+        Args:
+            request (CreatePetServiceRequest): ペット作成のリクエスト
+            checkpoint (PetCreationCheckpoint | None): 前回の試行の途中結果
+            stage_timings (dict[str, float]): 段階ごとの処理時間 (ミリ秒) の格納先
+
+        Returns:
+            str: 保存したアバター画像のファイル名
+        """
+        if checkpoint is not None and checkpoint.avatar_image_name is not None:
+            return checkpoint.avatar_image_name
+
         # ペットの画像から説明文を生成
-        picture_image_key = request.get_picture_image_key()
-        description = self.pet_picture_description_client.describe(picture_image_key)
+        if checkpoint is not None and checkpoint.positive_prompt is not None:
+            description = PetPictureDescription(
+                positive_prompt=checkpoint.positive_prompt,
+                negative_prompt=checkpoint.negative_prompt or "",
+            )
+        else:
+            with self.measure_stage(stage_timings, "describe_picture"):
+                picture_image_key = request.get_picture_image_key()
+                description = self.pet_picture_description_client.describe(picture_image_key)
+
+            self.save_checkpoint(
+                request,
+                {
+                    "positive_prompt": description.positive_prompt,
+                    "negative_prompt": description.negative_prompt,
+                },
+            )
 
         # ペットのアバター画像を生成
-        pet_avatar_base64_image = self.pet_avatar_image_client.generate(description)
-        pet_avatar_image_bytes = base64.b64decode(pet_avatar_base64_image)
+        with self.measure_stage(stage_timings, "generate_avatar"):
+            pet_avatar_base64_image = self.pet_avatar_image_client.generate(description)
+            pet_avatar_image_bytes = base64.b64decode(pet_avatar_base64_image)
 
         # ペットのアバター画像を保存
-        avatar_image_key = f"{request.pet_id}/{self.AVATAR_IMAGE_NAME}"
-        self.image_repository.save(avatar_image_key, pet_avatar_image_bytes)
-
-        # ペットの飼育情報を生成
-        cate_notes_prompt_variables = CareNotesPromptVariables(
-            category=request.category,
-            birth_date=request.birth_date,
-            gender=request.gender,
-        )
-        care_notes = self.pet_care_notes_client.generate(cate_notes_prompt_variables)
+        with self.measure_stage(stage_timings, "save_avatar"):
+            avatar_image_key = f"{request.pet_id}/{self.AVATAR_IMAGE_NAME}"
+            self.image_repository.save(avatar_image_key, pet_avatar_image_bytes)
 
-        # ペットを作成
-        new_pet = Pet(
-            pet_id=request.pet_id,
-            name=request.name,
-            category=request.category,
-            birth_date=request.birth_date,
-            gender=request.gender,
-            care_notes=care_notes,
-            image_name=self.AVATAR_IMAGE_NAME,
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC),
+        self.save_checkpoint(request, {"avatar_image_name": self.AVATAR_IMAGE_NAME})
+
+        return self.AVATAR_IMAGE_NAME
+
+    def generate_care_notes(
+        self,
+        request: CreatePetServiceRequest,
+        checkpoint: PetCreationCheckpoint | None,
+        stage_timings: dict[str, float],
+    ) -> list[PetCareNote]:
+        """
+        ペットの飼育情報を生成する
+
+        Args:
+            request (CreatePetServiceRequest): ペット作成のリクエスト
+            checkpoint (PetCreationCheckpoint | None): 前回の試行の途中結果
+            stage_timings (dict[str, float]): 段階ごとの処理時間 (ミリ秒) の格納先
+
+        Returns:
+            list[PetCareNote]: ペットの飼育情報
+        """
+        if checkpoint is not None and checkpoint.care_notes is not None:
+            stage_timings["generate_care_notes"] = 0.0
+            return checkpoint.care_notes
+
+        with self.measure_stage(stage_timings, "generate_care_notes"):
+            care_notes_prompt_variables = CareNotesPromptVariables(
+                category=request.category,
+                birth_date=request.birth_date,
+                gender=request.gender,
+            )
+            care_notes = self.pet_care_notes_client.generate(care_notes_prompt_variables)
+
+        self.save_checkpoint(
+            request,
+            {"care_notes": [care_note.model_dump(mode="json") for care_note in care_notes]},
         )
-        self.pet_repository.create(new_pet)
 
-        return CreatePetServiceResponse.from_pet(new_pet)
+        return care_notes
+
+    def load_checkpoint(self, request: CreatePetServiceRequest) -> PetCreationCheckpoint | None:
+        """
+        前回の試行の途中結果を取得する
+
+        Args:
+            request (CreatePetServiceRequest): ペット作成のリクエスト
+
+        Returns:
+            PetCreationCheckpoint | None: 途中結果 (使い回せるものがない場合はNone)
+        """
+        try:
+            checkpoint = self.checkpoint_repository.get_by_pet_id(request.pet_id)
+        except Exception as e:
+            logger.warning(
+                "途中結果の取得に失敗しました",
+                extra={"pet_id": request.pet_id, "error": str(e)},
+            )
+            return None
+
+        if checkpoint is None:
+            return None
+
+        # 別の画像や属性で作成し直す場合は，前のリクエストの途中結果が混ざらないように作り直す
+        if checkpoint.request_fingerprint != request.get_fingerprint():
+            self.replace_checkpoint(request)
+            return None
+
+        return checkpoint
+
+    def save_checkpoint(self, request: CreatePetServiceRequest, attributes: dict) -> None:
+        """
+        段階の途中結果を保存する
+
+        Args:
+            request (CreatePetServiceRequest): ペット作成のリクエスト
+            attributes (dict): 保存する属性とその値
+
+        Notes:
+            途中結果の保存に失敗してもペットの作成は続ける
+        """
+        try:
+            self.checkpoint_repository.update(
+                request.pet_id,
+                request.get_fingerprint(),
+                attributes,
+            )
+        except Exception as e:
+            logger.warning(
+                "途中結果の保存に失敗しました",
+                extra={"pet_id": request.pet_id, "stages": list(attributes), "error": str(e)},
+            )
+
+    def replace_checkpoint(self, request: CreatePetServiceRequest) -> None:
+        """
+        別のリクエストの途中結果を破棄し，空の途中結果を作り直す
+
+        Args:
+            request (CreatePetServiceRequest): ペット作成のリクエスト
+
+        Notes:
+            作り直しに失敗した場合は，前のリクエストの途中結果に保存しないため再開できない
+        """
+        try:
+            self.checkpoint_repository.replace(request.pet_id, request.get_fingerprint())
+        except Exception as e:
+            logger.warning(
+                "途中結果の作り直しに失敗しました",
+                extra={"pet_id": request.pet_id, "error": str(e)},
+            )
+
+    def delete_checkpoint(self, request: CreatePetServiceRequest) -> None:
+        """
+        途中結果を削除する
+
+        Args:
+            request (CreatePetServiceRequest): ペット作成のリクエスト
+        """
+        try:
+            self.checkpoint_repository.delete(request.pet_id)
+        except Exception as e:
+            logger.warning(
+                "途中結果の削除に失敗しました",
+                extra={"pet_id": request.pet_id, "error": str(e)},
+            )
+
+    @staticmethod
+    @contextmanager
+    def measure_stage(stage_timings: dict[str, float], stage: str) -> Iterator[None]:
+        """
+        段階の処理時間を計測する
+
+        Args:
+            stage_timings (dict[str, float]): 段階ごとの処理時間 (ミリ秒) の格納先
+            stage (str): 段階の名前
+        """
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            stage_timings[stage] = round((time.perf_counter() - started_at) * 1000, 1)
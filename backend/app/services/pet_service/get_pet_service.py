@@ -1,9 +1,10 @@
 from datetime import date, datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.models.pet import PetCareNote, PetGender
 from app.repositories.interface.pet_repository import PetRepository
+from app.tracing.timing import timed_methods
 
 
 class GetPetServiceRequest(BaseModel):
@@ -11,6 +12,8 @@ class GetPetServiceRequest(BaseModel):
 
 
 class GetPetServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     pet_id: str
     name: str
     category: str
@@ -20,8 +23,10 @@ class GetPetServiceResponse(BaseModel):
     image_name: str
     created_at: datetime
     updated_at: datetime
+    version: int = 0
 
 
+@timed_methods("service")
 class GetPetService:
     def __init__(self, pet_repository: PetRepository):
         self.pet_repository = pet_repository
@@ -32,4 +37,4 @@ class GetPetService:
         if pet is None:
             return None
 
-        return GetPetServiceResponse(**pet.to_dict())
+        return GetPetServiceResponse.model_validate(pet)
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+from app.repositories.interface.pet_repository import PetRepository
+from app.services.pet_service.get_pet_service import GetPetServiceResponse
+from app.tracing.timing import timed_methods
+
+
+class GetPetsServiceRequest(BaseModel):
+    pet_ids: list[str]
+
+
+class GetPetsServiceResponse(BaseModel):
+    pets: list[GetPetServiceResponse | None]
+
+
+@timed_methods("service")
+class GetPetsService:
+    def __init__(self, pet_repository: PetRepository):
+        self.pet_repository = pet_repository
+
+    def execute(self, request: GetPetsServiceRequest) -> GetPetsServiceResponse:
+        pets = self.pet_repository.get_many(request.pet_ids)
+
+        return GetPetsServiceResponse(
+            pets=[
+                None if pet is None else GetPetServiceResponse.model_validate(pet) for pet in pets
+            ],
+        )
@@ -1,17 +1,37 @@
-from datetime import datetime, date
+from datetime import UTC, date, datetime
 
-from pydantic import BaseModel
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import to_jsonable_python
 
+from app.exceptions.version_conflict_exception import VersionConflictException
+from app.exceptions.version_required_exception import VersionRequiredException
 from app.models.pet import Pet, PetCareNote, PetGender
 from app.repositories.interface.pet_repository import PetRepository
+from app.tracing.timing import timed_methods
+
+logger = Logger()
+metrics = Metrics()
+
+MAX_RETRY_COUNT = 3
 
 
 class UpdatePetServiceRequest(BaseModel):
     pet_id: str
     care_notes: list[PetCareNote]
+    expected_version: int | None = None
+    # True の場合は競合しても再試行しない (If-Match で指定されたバージョンを書き込みの条件にする)
+    require_expected_version: bool = False
+    # If-Match のETagに含まれる更新日時 (作成し直してバージョンが0に戻った項目と区別する)
+    expected_updated_at: datetime | None = None
+    # True の場合はバージョンを指定せずに存在する項目を更新する (If-Match: *)
+    unconditional: bool = False
 
 
 class UpdatePetServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     pet_id: str
     name: str
     category: str
@@ -21,19 +41,88 @@ class UpdatePetServiceResponse(BaseModel):
     image_name: str
     created_at: datetime
     updated_at: datetime
+    version: int
 
 
+@timed_methods("service")
 class UpdatePetService:
-    def __init__(self, pet_repository: PetRepository):
+    def __init__(self, pet_repository: PetRepository, allow_unversioned_update: bool = False):
+        """
+        コンストラクタ
+
+        Args:
+            pet_repository (PetRepository): ペットリポジトリ
+            allow_unversioned_update (bool, optional): バージョンを指定しない更新を許可するか
+                (許可した場合は他の端末の更新を確認せずに上書きする)
+        """
         self.pet_repository = pet_repository
+        self.allow_unversioned_update = allow_unversioned_update
+
+    def execute(self, request: UpdatePetServiceRequest) -> UpdatePetServiceResponse | None:
+        """
+        ペットの飼育情報を更新する
+
+        Args:
+            request (UpdatePetServiceRequest): リクエスト
+
+        Returns:
+            UpdatePetServiceResponse | None: 更新後のペット (存在しない場合はNone)
+
+        Raises:
+            VersionRequiredException: バージョンを指定せず，更新も許可していない場合
+            VersionConflictException: 再試行しても競合が解消しなかった場合
+                (require_expected_version が True の場合は最初に競合した時点で送出する)
+
+        Notes:
+            expected_version が指定された場合は条件付きで書き込む．
+            更新するのは飼育情報だけなので，他のリクエストと競合した時は
+            最新のバージョンに対して最大 MAX_RETRY_COUNT 回まで再試行する．
+            expected_updated_at が指定された場合は更新日時も書き込みの条件にする
+        """
+        if request.expected_version is None and not (
+            request.unconditional or self.allow_unversioned_update
+        ):
+            raise VersionRequiredException("取得した時点のペットのバージョンを指定してください")
+
+        # 読み込まずに指定された属性だけを更新する
+        attributes = request.model_dump(mode="json", include={"care_notes"})
+        expected_version = request.expected_version
+
+        for retry_count in range(MAX_RETRY_COUNT + 1):
+            attributes["updated_at"] = to_jsonable_python(datetime.now(UTC))
+
+            try:
+                updated_pet = self.pet_repository.update_attributes(
+                    request.pet_id,
+                    attributes,
+                    expected_version,
+                    request.expected_updated_at,
+                )
+            except VersionConflictException as e:
+                metrics.add_metric(name="PetUpdateConflicts", unit=MetricUnit.Count, value=1)
+
+                if request.require_expected_version:
+                    raise
+
+                current_pet: Pet = e.current
+                expected_version = current_pet.version
+                continue
 
-    def execute(self, request: UpdatePetServiceRequest) -> UpdatePetServiceResponse:
-        current_pet = self.pet_repository.get_by_id(request.pet_id)
+            if retry_count > 0:
+                metrics.add_metric(
+                    name="PetUpdateRetries",
+                    unit=MetricUnit.Count,
+                    value=retry_count,
+                )
+                logger.info(
+                    "競合したペットの更新を再試行しました",
+                    extra={"pet_id": request.pet_id, "retry_count": retry_count},
+                )
 
-        if current_pet is None:
-            raise ValueError("ペットが見つかりませんでした")
+            if updated_pet is None:
+                return None
 
-        updated_pet: Pet = current_pet.model_copy(update=request.model_dump())
-        self.pet_repository.update(updated_pet)
+            return UpdatePetServiceResponse.model_validate(updated_pet)
 
-        return UpdatePetServiceResponse(**updated_pet.to_dict())
+        metrics.add_metric(name="PetUpdateConflictsExhausted", unit=MetricUnit.Count, value=1)
+        raise VersionConflictException("ペットの更新が他のリクエストと競合しました")
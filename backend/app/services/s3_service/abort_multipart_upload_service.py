@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+from app.repositories.interface.image_repository import ImageRepository
+from app.tracing.timing import timed_methods
+
+
+class AbortMultipartUploadServiceRequest(BaseModel):
+    pet_id: str
+    file_name: str
+    upload_id: str
+
+
+@timed_methods("service")
+class AbortMultipartUploadService:
+    def __init__(self, image_repository: ImageRepository):
+        self.image_repository = image_repository
+
+    def execute(self, request: AbortMultipartUploadServiceRequest) -> None:
+        """
+        マルチパートアップロードを中止し，アップロード済みのパートを破棄する
+
+        Args:
+            request (AbortMultipartUploadServiceRequest): リクエスト
+        """
+        self.image_repository.abort_multipart_upload(
+            f"{request.pet_id}/{request.file_name}",
+            request.upload_id,
+        )
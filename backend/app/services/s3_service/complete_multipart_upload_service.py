@@ -0,0 +1,94 @@
+from pydantic import BaseModel
+
+from app.exceptions.invalid_upload_part_exception import InvalidUploadPartException
+from app.exceptions.upload_too_large_exception import UploadTooLargeException
+from app.models.image import UploadedPart
+from app.repositories.interface.image_repository import ImageRepository
+from app.tracing.timing import timed_methods
+
+
+class CompleteMultipartUploadServiceRequest(BaseModel):
+    pet_id: str
+    file_name: str
+    upload_id: str
+    parts: list[UploadedPart]
+
+
+class CompleteMultipartUploadServiceResponse(BaseModel):
+    file_name: str
+    size: int
+
+
+@timed_methods("service")
+class CompleteMultipartUploadService:
+    def __init__(self, image_repository: ImageRepository, max_bytes: int):
+        """
+        コンストラクタ
+
+        Args:
+            image_repository (ImageRepository): 画像リポジトリ
+            max_bytes (int): アップロードを許可する最大サイズ (バイト単位)
+        """
+        self.image_repository = image_repository
+        self.max_bytes = max_bytes
+
+    def execute(
+        self, request: CompleteMultipartUploadServiceRequest
+    ) -> CompleteMultipartUploadServiceResponse:
+        """
+        アップロード済みのパートの合計サイズを確認して，マルチパートアップロードを完了する
+
+        Args:
+            request (CompleteMultipartUploadServiceRequest): リクエスト
+
+        Returns:
+            CompleteMultipartUploadServiceResponse: アップロードした画像のファイル名とサイズ
+
+        Raises:
+            UploadTooLargeException: 合計サイズが上限を超える場合 (アップロードは中止する)
+            UploadNotFoundException: アップロードが存在しない場合
+            InvalidUploadPartException: リクエストのパートがアップロード済みのパートと一致しない場合
+
+        Notes:
+            完了するパートは合計サイズを確認した ListParts の結果から作る．
+            リクエストのパートをそのまま使うと，確認した後にアップロードされたパートも含めて完了してしまう
+        """
+        image_key = f"{request.pet_id}/{request.file_name}"
+        uploaded_parts = self.image_repository.list_multipart_upload_parts(
+            image_key, request.upload_id
+        )
+        size = sum(part.size for part in uploaded_parts)
+
+        if size > self.max_bytes:
+            # 開始時に申告したサイズより大きいパートを送られた場合は，保存せずにパートを破棄する
+            self.image_repository.abort_multipart_upload(image_key, request.upload_id)
+            raise UploadTooLargeException(
+                f"ファイルのサイズが上限 ({self.max_bytes} バイト) を超えています"
+            )
+
+        if not uploaded_parts or get_part_keys(request.parts) != get_part_keys(uploaded_parts):
+            raise InvalidUploadPartException("アップロードしたパートが一致しません")
+
+        self.image_repository.complete_multipart_upload(
+            image_key,
+            request.upload_id,
+            [UploadedPart(part_number=part.part_number, etag=part.etag) for part in uploaded_parts],
+        )
+
+        return CompleteMultipartUploadServiceResponse(file_name=request.file_name, size=size)
+
+
+def get_part_keys(parts: list[UploadedPart]) -> list[tuple[int, str]]:
+    """
+    パートをパート番号とETagの組にして比べられるようにする
+
+    Args:
+        parts (list[UploadedPart]): パート
+
+    Returns:
+        list[tuple[int, str]]: パート番号の順に並べたパート番号とETagの組
+
+    Notes:
+        ETagはレスポンスヘッダーのままダブルクォートで囲まれている場合とそうでない場合があるため，取り除いて比べる
+    """
+    return sorted((part.part_number, part.etag.strip('"')) for part in parts)
@@ -0,0 +1,96 @@
+import math
+
+from pydantic import BaseModel
+
+from app.exceptions.upload_too_large_exception import UploadTooLargeException
+from app.models.image import ImageContentType
+from app.repositories.interface.image_repository import MIN_MULTIPART_PART_SIZE, ImageRepository
+from app.tracing.timing import timed_methods
+
+# S3のマルチパートアップロードのパート数の上限
+MAX_MULTIPART_PART_COUNT = 10000
+
+
+class CreateMultipartUploadServiceRequest(BaseModel):
+    pet_id: str
+    file_name: str
+    content_type: ImageContentType
+    file_size: int
+
+
+class MultipartUploadPartUrl(BaseModel):
+    part_number: int
+    presigned_url: str
+
+
+class CreateMultipartUploadServiceResponse(BaseModel):
+    upload_id: str
+    part_size: int
+    part_urls: list[MultipartUploadPartUrl]
+    expires_in: int
+
+
+@timed_methods("service")
+class CreateMultipartUploadService:
+    def __init__(self, image_repository: ImageRepository, max_bytes: int, expires_in: int):
+        """
+        コンストラクタ
+
+        Args:
+            image_repository (ImageRepository): 画像リポジトリ
+            max_bytes (int): アップロードを許可する最大サイズ (バイト単位)
+            expires_in (int): パートの署名付きURLの有効期限 (秒単位)
+        """
+        self.image_repository = image_repository
+        self.max_bytes = max_bytes
+        self.expires_in = expires_in
+
+    def execute(
+        self, request: CreateMultipartUploadServiceRequest
+    ) -> CreateMultipartUploadServiceResponse:
+        """
+        マルチパートアップロードを開始し，パートごとの署名付きURLを取得する
+
+        Args:
+            request (CreateMultipartUploadServiceRequest): リクエスト
+
+        Returns:
+            CreateMultipartUploadServiceResponse: アップロードID，パートのサイズと署名付きURL
+
+        Raises:
+            UploadTooLargeException: ファイルのサイズが上限を超える場合
+
+        Notes:
+            パートの署名付きURLではサイズを制限できないため，完了するときに合計サイズを確認する
+        """
+        if request.file_size > self.max_bytes:
+            raise UploadTooLargeException(
+                f"ファイルのサイズが上限 ({self.max_bytes} バイト) を超えています"
+            )
+
+        part_size = max(
+            MIN_MULTIPART_PART_SIZE,
+            math.ceil(request.file_size / MAX_MULTIPART_PART_COUNT),
+        )
+        part_count = max(1, math.ceil(request.file_size / part_size))
+
+        image_key = f"{request.pet_id}/{request.file_name}"
+        upload_id = self.image_repository.create_multipart_upload(image_key, request.content_type)
+
+        return CreateMultipartUploadServiceResponse(
+            upload_id=upload_id,
+            part_size=part_size,
+            part_urls=[
+                MultipartUploadPartUrl(
+                    part_number=part_number,
+                    presigned_url=self.image_repository.get_presigned_upload_part_url(
+                        image_key,
+                        upload_id,
+                        part_number,
+                        self.expires_in,
+                    ),
+                )
+                for part_number in range(1, part_count + 1)
+            ],
+            expires_in=self.expires_in,
+        )
@@ -0,0 +1,64 @@
+from pydantic import BaseModel
+
+from app.models.image import ImageContentType
+from app.repositories.interface.image_repository import ImageRepository
+from app.tracing.timing import timed_methods
+
+
+class CreateUploadPolicyServiceRequest(BaseModel):
+    pet_id: str
+    file_name: str
+    content_type: ImageContentType
+
+
+class CreateUploadPolicyServiceResponse(BaseModel):
+    url: str
+    fields: dict[str, str]
+    max_bytes: int
+    expires_in: int
+
+
+@timed_methods("service")
+class CreateUploadPolicyService:
+    def __init__(self, image_repository: ImageRepository, max_bytes: int, expires_in: int):
+        """
+        コンストラクタ
+
+        Args:
+            image_repository (ImageRepository): 画像リポジトリ
+            max_bytes (int): アップロードを許可する最大サイズ (バイト単位)
+            expires_in (int): 署名の有効期限 (秒単位)
+        """
+        self.image_repository = image_repository
+        self.max_bytes = max_bytes
+        self.expires_in = expires_in
+
+    def execute(
+        self, request: CreateUploadPolicyServiceRequest
+    ) -> CreateUploadPolicyServiceResponse:
+        """
+        サイズと形式を制限した，画像をアップロードする署名付きPOSTを取得する
+
+        Args:
+            request (CreateUploadPolicyServiceRequest): リクエスト
+
+        Returns:
+            CreateUploadPolicyServiceResponse: アップロード先のURLとフォームに含めるフィールド
+
+        Notes:
+            上限を超える画像や別の形式の画像はS3が拒否するため，
+            後で画像をダウンロードしてモデルに渡すときの通信量とトークンが増えない
+        """
+        presigned_post = self.image_repository.get_presigned_post(
+            f"{request.pet_id}/{request.file_name}",
+            request.content_type,
+            self.max_bytes,
+            self.expires_in,
+        )
+
+        return CreateUploadPolicyServiceResponse(
+            url=presigned_post.url,
+            fields=presigned_post.fields,
+            max_bytes=self.max_bytes,
+            expires_in=self.expires_in,
+        )
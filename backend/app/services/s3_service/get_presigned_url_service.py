@@ -2,7 +2,9 @@ from typing import Literal
 
 from pydantic import BaseModel
 
+from app.exceptions.presigned_put_url_disabled_exception import PresignedPutUrlDisabledException
 from app.repositories.interface.image_repository import ImageRepository
+from app.tracing.timing import timed_methods
 
 
 class GetPresignedUrlServiceRequest(BaseModel):
@@ -15,16 +17,45 @@ class GetPresignedUrlServiceResponse(BaseModel):
     presigned_url: str
 
 
+@timed_methods("service")
 class GetPresignedUrlService:
     http_method_to_client_method = {
         "get": "get_object",
         "post": "put_object",
     }
 
-    def __init__(self, image_repository: ImageRepository):
+    def __init__(self, image_repository: ImageRepository, allow_put_url: bool = False):
+        """
+        コンストラクタ
+
+        Args:
+            image_repository (ImageRepository): 画像リポジトリ
+            allow_put_url (bool, optional): サイズと形式を制限しないPUTのURLを発行するか
+        """
         self.image_repository = image_repository
+        self.allow_put_url = allow_put_url
 
     def execute(self, request: GetPresignedUrlServiceRequest) -> GetPresignedUrlServiceResponse:
+        """
+        ファイルの署名付きURLを取得する
+
+        Args:
+            request (GetPresignedUrlServiceRequest): リクエスト
+
+        Returns:
+            GetPresignedUrlServiceResponse: 署名付きURL
+
+        Raises:
+            PresignedPutUrlDisabledException: allow_put_url が無効でアップロード用のURLを求めた場合
+
+        Notes:
+            PUTの署名付きURLはサイズと形式を制限できないため，アップロードには upload-policy を使う
+        """
+        if request.http_method == "post" and not self.allow_put_url:
+            raise PresignedPutUrlDisabledException(
+                "アップロード用の署名付きURLは発行できません．upload-policy を使ってください"
+            )
+
         presigned_url = self.image_repository.get_presigned_url(
             self.http_method_to_client_method[request.http_method],
             f"{request.pet_id}/{request.file_name}",
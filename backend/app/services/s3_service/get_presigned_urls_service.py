@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+
+from app.repositories.interface.image_repository import ImageRepository
+from app.tracing.timing import timed_methods
+
+
+class GetPresignedUrlsServiceRequest(BaseModel):
+    pet_id: str
+    file_names: list[str]
+
+
+class PresignedUrl(BaseModel):
+    file_name: str
+    presigned_url: str
+
+
+class GetPresignedUrlsServiceResponse(BaseModel):
+    presigned_urls: list[PresignedUrl]
+
+
+@timed_methods("service")
+class GetPresignedUrlsService:
+    def __init__(self, image_repository: ImageRepository):
+        self.image_repository = image_repository
+
+    def execute(self, request: GetPresignedUrlsServiceRequest) -> GetPresignedUrlsServiceResponse:
+        """
+        複数のファイルの閲覧用の署名付きURLをまとめて取得する
+
+        Args:
+            request (GetPresignedUrlsServiceRequest): リクエスト
+
+        Returns:
+            GetPresignedUrlsServiceResponse: リクエストと同じ順序の署名付きURL
+
+        Notes:
+            署名はAWSを呼び出さずに行うため，1回のリクエストで日記の写真とアバターなどをまとめて署名する．
+            アップロード用のURLはまとめて発行せず，サイズと形式を制限した upload-policy を使う
+        """
+        return GetPresignedUrlsServiceResponse(
+            presigned_urls=[
+                PresignedUrl(
+                    file_name=file_name,
+                    presigned_url=self.image_repository.get_presigned_url(
+                        "get_object",
+                        f"{request.pet_id}/{file_name}",
+                    ),
+                )
+                for file_name in request.file_names
+            ],
+        )
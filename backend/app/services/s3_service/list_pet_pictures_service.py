@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.repositories.interface.image_repository import DEFAULT_IMAGE_PAGE_SIZE, ImageRepository
+from app.tracing.timing import timed_methods
+
+# ギャラリーに表示する画像の拡張子 (アップロードできる形式と同じ)
+PICTURE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+class ListPetPicturesServiceRequest(BaseModel):
+    pet_id: str
+    limit: int = DEFAULT_IMAGE_PAGE_SIZE
+    cursor: str | None = None
+
+
+class PetPicture(BaseModel):
+    file_name: str
+    presigned_url: str
+    size: int
+    last_modified: datetime
+
+
+class ListPetPicturesServiceResponse(BaseModel):
+    pictures: list[PetPicture]
+    next_cursor: str | None = None
+
+
+@timed_methods("service")
+class ListPetPicturesService:
+    def __init__(self, image_repository: ImageRepository):
+        self.image_repository = image_repository
+
+    def execute(self, request: ListPetPicturesServiceRequest) -> ListPetPicturesServiceResponse:
+        """
+        ペットの画像を1ページ分，閲覧用の署名付きURLとともに取得する
+
+        Args:
+            request (ListPetPicturesServiceRequest): リクエスト
+
+        Returns:
+            ListPetPicturesServiceResponse: ページ内の画像と次のページのカーソル
+
+        Raises:
+            InvalidCursorException: カーソルが不正な場合
+
+        Notes:
+            画像以外のファイルは除くため，ページ内の画像は limit 件より少ないことがある
+        """
+        prefix = f"{request.pet_id}/"
+        page = self.image_repository.list_by_prefix(prefix, request.limit, request.cursor)
+
+        return ListPetPicturesServiceResponse(
+            pictures=[
+                PetPicture(
+                    file_name=image.key.removeprefix(prefix),
+                    presigned_url=self.image_repository.get_presigned_url("get_object", image.key),
+                    size=image.size,
+                    last_modified=image.last_modified,
+                )
+                for image in page.images
+                if image.key.lower().endswith(PICTURE_EXTENSIONS)
+            ],
+            next_cursor=page.next_cursor,
+        )
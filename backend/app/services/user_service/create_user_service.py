@@ -1,10 +1,11 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.models.user import User, UserRole
 from app.repositories.interface.user_repository import UserRepository
+from app.tracing.timing import timed_methods
 
 
 class CreateUserServiceRequest(BaseModel):
@@ -15,6 +16,8 @@ class CreateUserServiceRequest(BaseModel):
 
 
 class CreateUserServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     user_id: str
     pet_id: str
     user_name: str
@@ -24,6 +27,7 @@ class CreateUserServiceResponse(BaseModel):
     updated_at: datetime
 
 
+@timed_methods("service")
 class CreateUserService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
@@ -39,4 +43,4 @@ class CreateUserService:
 
         created_user = self.user_repository.create(new_user)
 
-        return CreateUserServiceResponse(**created_user.to_dict())
+        return CreateUserServiceResponse.model_validate(created_user)
@@ -1,8 +1,9 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.repositories.interface.user_repository import UserRepository
+from app.tracing.timing import timed_methods
 
 
 class GetUserServiceRequest(BaseModel):
@@ -10,6 +11,8 @@ class GetUserServiceRequest(BaseModel):
 
 
 class GetUserServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     user_id: str
     pet_id: str
     user_name: str
@@ -19,6 +22,7 @@ class GetUserServiceResponse(BaseModel):
     updated_at: datetime
 
 
+@timed_methods("service")
 class GetUserService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
@@ -29,4 +33,4 @@ class GetUserService:
         if user is None:
             return None
 
-        return GetUserServiceResponse(**user.to_dict())
+        return GetUserServiceResponse.model_validate(user)
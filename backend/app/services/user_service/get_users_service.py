@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.repositories.interface.user_repository import UserRepository
+from app.tracing.timing import timed_methods
+
+
+class GetUsersServiceRequest(BaseModel):
+    user_ids: list[str]
+
+
+# 認証なしで呼べるため，パスワードは返さない
+class BatchUser(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: str
+    pet_id: str
+    user_name: str
+    user_role: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class GetUsersServiceResponse(BaseModel):
+    users: list[BatchUser | None]
+
+
+@timed_methods("service")
+class GetUsersService:
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+
+    def execute(self, request: GetUsersServiceRequest) -> GetUsersServiceResponse:
+        users = self.user_repository.get_many(request.user_ids)
+
+        return GetUsersServiceResponse(
+            users=[None if user is None else BatchUser.model_validate(user) for user in users],
+        )
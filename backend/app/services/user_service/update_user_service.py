@@ -1,10 +1,12 @@
-from datetime import datetime
+from datetime import UTC, datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import to_jsonable_python
 
 from app.exceptions.user_not_found_exception import UserNotFoundException
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.repositories.interface.user_repository import UserRepository
+from app.tracing.timing import timed_methods
 
 
 class UpdateUserServiceRequest(BaseModel):
@@ -14,6 +16,8 @@ class UpdateUserServiceRequest(BaseModel):
 
 
 class UpdateUserServiceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     user_id: str
     pet_id: str
     user_name: str
@@ -23,17 +27,23 @@ class UpdateUserServiceResponse(BaseModel):
     updated_at: datetime
 
 
+@timed_methods("service")
 class UpdateUserService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
     def execute(self, request: UpdateUserServiceRequest) -> UpdateUserServiceResponse:
-        current_user = self.user_repository.get_by_id(request.user_id)
+        # 読み込まずに指定された属性だけを更新する
+        attributes = request.model_dump(
+            mode="json",
+            include={"user_role", "password"},
+            exclude_none=True,
+        )
+        attributes["updated_at"] = to_jsonable_python(datetime.now(UTC))
 
-        if current_user is None:
-            raise UserNotFoundException("ユーザーが見つかりませんでした")
+        updated_user = self.user_repository.update_attributes(request.user_id, attributes)
 
-        updated_user: User = current_user.update(**request.model_dump())
-        self.user_repository.update(updated_user)
+        if updated_user is None:
+            raise UserNotFoundException("ユーザーが見つかりませんでした")
 
-        return UpdateUserServiceResponse(**updated_user.to_dict())
+        return UpdateUserServiceResponse.model_validate(updated_user)
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from aws_lambda_powertools import Logger
+
+# 無効な場合はクラスを書き換えないため，計測のための処理は一切実行されない
+TIMING_ENABLED = os.getenv("TIMING_ENABLED", "false").lower() == "true"
+
+logger = Logger()
+
+T = TypeVar("T", bound=type)
+
+
+@dataclass(frozen=True)
+class Span:
+    """計測した1回の呼び出し"""
+
+    name: str
+    layer: str
+    duration_ms: float
+    # 同じ層の別の呼び出しの内側で呼び出されたかどうか (層ごとの合計から除く)
+    nested: bool
+
+
+@dataclass
+class RequestTiming:
+    """1リクエストの中で計測した呼び出し"""
+
+    spans: list[Span] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, span: Span) -> None:
+        # 並行して実行されるスレッドからも追加される
+        with self.lock:
+            self.spans.append(span)
+
+    def summarize(self) -> dict[str, Any]:
+        """
+        呼び出しを層と名前ごとに集計する
+
+        Returns:
+            dict[str, Any]: 層ごとの合計時間と，名前ごとの回数，合計時間，最大時間
+
+        Notes:
+            並行して実行された呼び出しはそれぞれの時間を足し合わせるため，
+            層ごとの合計時間がリクエスト全体の時間を超えることがある
+        """
+        with self.lock:
+            spans = list(self.spans)
+
+        layers: dict[str, float] = {}
+        names: dict[str, dict[str, float]] = {}
+
+        for span in spans:
+            if not span.nested:
+                layers[span.layer] = layers.get(span.layer, 0.0) + span.duration_ms
+
+            summary = names.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            summary["count"] += 1
+            summary["total_ms"] += span.duration_ms
+            summary["max_ms"] = max(summary["max_ms"], span.duration_ms)
+
+        return {
+            "layers_ms": {layer: round(total_ms, 1) for layer, total_ms in layers.items()},
+            "spans": {
+                name: {
+                    "count": summary["count"],
+                    "total_ms": round(summary["total_ms"], 1),
+                    "max_ms": round(summary["max_ms"], 1),
+                }
+                for name, summary in sorted(
+                    names.items(), key=lambda item: item[1]["total_ms"], reverse=True
+                )
+            },
+        }
+
+
+current_request_timing: ContextVar[RequestTiming | None] = ContextVar(
+    "current_request_timing", default=None
+)
+active_layers: ContextVar[frozenset[str]] = ContextVar("active_layers", default=frozenset())
+
+# リクエストの集計結果を受け取る関数 (ベンチマークなどで登録する)
+summary_handlers: list[Callable[[dict[str, Any]], None]] = []
+
+
+@contextmanager
+def measure(name: str, layer: str) -> Iterator[None]:
+    """
+    処理時間を計測して現在のリクエストに記録する
+
+    Args:
+        name (str): 計測する処理の名前
+        layer (str): 処理の層 (service，repository，ai など)
+    """
+    layers = active_layers.get()
+    token = active_layers.set(layers | {layer})
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        active_layers.reset(token)
+        record(Span(name, layer, (time.perf_counter() - started_at) * 1000, layer in layers))
+
+
+def record(span: Span) -> None:
+    """
+    計測した呼び出しを現在のリクエストに記録する
+
+    Args:
+        span (Span): 計測した呼び出し
+    """
+    request_timing = current_request_timing.get()
+
+    if request_timing is not None:
+        request_timing.add(span)
+
+    logger.debug(
+        "処理時間を計測しました",
+        extra={"span": span.name, "layer": span.layer, "duration_ms": round(span.duration_ms, 1)},
+    )
+
+
+def timed_methods(layer: str) -> Callable[[T], T]:
+    """
+    クラスの公開メソッドの処理時間を計測するクラスデコレーター
+
+    Args:
+        layer (str): メソッドの層 (service，repository，ai など)
+
+    Returns:
+        Callable[[T], T]: クラスデコレーター
+
+    Notes:
+        TIMING_ENABLED が無効な場合はクラスをそのまま返す．
+        ジェネレーターのメソッドは最後の要素を返すまでの時間を，
+        コルーチンのメソッドは await が終わるまでの時間を計測する
+    """
+
+    def decorate(cls: T) -> T:
+        if not TIMING_ENABLED:
+            return cls
+
+        for attribute_name, attribute in list(vars(cls).items()):
+            if attribute_name.startswith("_") or not inspect.isfunction(attribute):
+                continue
+
+            setattr(cls, attribute_name, wrap(attribute, f"{cls.__name__}.{attribute_name}", layer))
+
+        return cls
+
+    return decorate
+
+
+def wrap(function: Callable, name: str, layer: str) -> Callable:
+    if inspect.isgeneratorfunction(function):
+
+        @functools.wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            # ストリーミングのレスポンスでは要素ごとに別のコンテキストで実行されるため，
+            # コンテキスト変数を書き換えずに最初から最後までの時間だけを記録する
+            nested = layer in active_layers.get()
+            started_at = time.perf_counter()
+
+            try:
+                return (yield from function(*args, **kwargs))
+            finally:
+                record(Span(name, layer, (time.perf_counter() - started_at) * 1000, nested))
+
+        return generator_wrapper
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def coroutine_wrapper(*args, **kwargs):
+            # タスクごとにコンテキストがコピーされるため，並行して実行しても層は混ざらない
+            with measure(name, layer):
+                return await function(*args, **kwargs)
+
+        return coroutine_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with measure(name, layer):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+class RequestTimingMiddleware:
+    """
+    リクエストごとに処理時間の内訳をまとめてログに出力するASGIミドルウェア
+
+    ストリーミングのレスポンスも送り終わるまでを1リクエストとして集計する．
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_timing = RequestTiming()
+        token = current_request_timing.set(request_timing)
+        status_code = None
+        started_at = time.perf_counter()
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_request_timing.reset(token)
+
+            summary = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "total_ms": round((time.perf_counter() - started_at) * 1000, 1),
+                **request_timing.summarize(),
+            }
+            logger.info("リクエストの処理時間の内訳", extra={"timing": summary})
+
+            for handler in summary_handlers:
+                handler(summary)
+
+
+def instrument_session(session) -> None:
+    """
+    boto3 のセッションから作成したクライアントのAPI呼び出しの処理時間を計測する
+
+    Args:
+        session (boto3.session.Session): クライアントを作成する前のセッション
+
+    Notes:
+        TIMING_ENABLED が無効な場合はイベントを登録しない
+    """
+    if not TIMING_ENABLED:
+        return
+
+    def before_call(model, context, **kwargs) -> None:
+        context["timing_name"] = f"{model.service_model.service_name}.{model.name}"
+        context["timing_started_at"] = time.perf_counter()
+
+    # after-call-error は model を渡さないため，操作の名前は before-call で context に残しておく
+    def after_call(context, **kwargs) -> None:
+        started_at = context.pop("timing_started_at", None)
+        name = context.pop("timing_name", None)
+        if started_at is None or name is None:
+            return
+
+        nested = "aws" in active_layers.get()
+        record(Span(name, "aws", (time.perf_counter() - started_at) * 1000, nested))
+
+    session.events.register("before-call", before_call)
+    session.events.register("after-call", after_call)
+    session.events.register("after-call-error", after_call)
@@ -0,0 +1,206 @@
+"""
+DynamoDBの項目からレスポンスを作るまでのデコード処理のベンチマーク
+
+AWSやFastAPIを使わずに，リポジトリが受け取る項目 (TypeDeserializer で変換済みの辞書) から
+サービスのレスポンスを作るまでのCPU時間とメモリの最大使用量を，変更前の方法と比較する．
+
+- diary: タスクが多い日記を Diary.from_dict で読み込み，GetDiaryServiceResponse を作る
+  (変更前は to_dict で辞書に戻してから検証し直していた)
+- chat: 長いチャット履歴を読み込む (変更前は ChatMessage.from_dict で1件ずつ検証していた)
+
+    uv run python -m benchmarks.decode
+    uv run python -m benchmarks.decode --tasks 1000 --messages 10000 --repeat 20
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from app.models.chat import ChatHistoryEntry, ChatMessage
+from app.models.diary import Diary, DiarySubtask, DiaryTask, Weather
+from app.repositories.dynamodb.chat_repository import to_item
+from app.services.diary_service.get_diary_service import GetDiaryServiceResponse
+from benchmarks.import_time import RESULTS_DIR, get_git_commit
+
+
+def build_diary_item(total_task: int) -> dict:
+    """
+    タスクが多い日記を，DynamoDBから読み込んだ項目と同じ形で作成する
+
+    Args:
+        total_task (int): タスク数 (3件に1件はサブタスクを2件持つ)
+
+    Returns:
+        dict: 日記の項目
+    """
+    tasks = []
+    for index in range(total_task):
+        if index % 3 == 0:
+            sub_tasks = [
+                DiarySubtask(
+                    title=f"サブタスク{index}-{sub_index}",
+                    description="散歩の前に水を飲ませる",
+                    scheduled_time=f"{sub_index + 8:02d}:30",
+                    completed=False,
+                )
+                for sub_index in range(2)
+            ]
+            scheduled_time = None
+        else:
+            sub_tasks = []
+            scheduled_time = f"{index % 24:02d}:00"
+
+        tasks.append(
+            DiaryTask(
+                title=f"タスク{index}",
+                description="ごはんをあげる",
+                scheduled_time=scheduled_time,
+                completed=index % 2 == 0,
+                repeat=True,
+                sub_tasks=sub_tasks,
+            )
+        )
+
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+    diary = Diary(
+        pet_id="benchmark-pet",
+        date=date(2024, 1, 1),
+        picture_name="picture.jpg",
+        reacted=False,
+        advice="水分をしっかりとらせましょう",
+        comment="",
+        weather=Weather.SUNNY,
+        temperature="20.0",
+        tasks=tasks,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+    # 数値が Decimal になるように，テーブルに書き込んで読み込んだときと同じ変換を通す
+    serializer = TypeSerializer()
+    deserializer = TypeDeserializer()
+    return {
+        key: deserializer.deserialize(serializer.serialize(value))
+        for key, value in diary.to_dict().items()
+    }
+
+
+def build_chat_items(total_message: int) -> list[dict]:
+    """
+    チャット履歴の項目を作成する
+
+    Args:
+        total_message (int): メッセージ数
+
+    Returns:
+        list[dict]: チャットメッセージの項目
+    """
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        to_item(
+            "benchmark-pet",
+            ChatMessage(
+                content=f"メッセージ{index}",
+                created_at=created_at + timedelta(seconds=index),
+            ),
+        )
+        for index in range(total_message)
+    ]
+
+
+def measure(decode: Callable[[], object], repeat: int) -> dict:
+    """
+    デコード処理のCPU時間とメモリの最大使用量を計測する
+
+    Args:
+        decode (Callable[[], object]): デコード処理
+        repeat (int): CPU時間の計測回数
+
+    Returns:
+        dict: CPU時間の中央値と最小値 (ミリ秒)，メモリの最大使用量 (KiB)
+    """
+    decode()
+
+    cpu_ms = []
+    for _ in range(repeat):
+        started_at = time.process_time()
+        decode()
+        cpu_ms.append((time.process_time() - started_at) * 1000)
+
+    # tracemalloc は処理を遅くするため，CPU時間とは別に1回だけ計測する
+    tracemalloc.start()
+    result = decode()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {
+        "cpu_ms_median": round(statistics.median(cpu_ms), 2),
+        "cpu_ms_min": round(min(cpu_ms), 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(name: str, legacy: Callable[[], object], current: Callable[[], object], repeat: int):
+    before = measure(legacy, repeat)
+    after = measure(current, repeat)
+
+    print(
+        f"{name:<8} "
+        f"cpu {before['cpu_ms_median']:>8.2f} ms -> {after['cpu_ms_median']:>8.2f} ms  "
+        f"peak {before['peak_kib']:>9.1f} KiB -> {after['peak_kib']:>9.1f} KiB"
+    )
+
+    return {"legacy": before, "current": after}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="項目からレスポンスを作るまでの処理を計測する")
+    parser.add_argument("--tasks", type=int, default=1000, help="日記のタスク数")
+    parser.add_argument("--messages", type=int, default=10000, help="チャット履歴のメッセージ数")
+    parser.add_argument("--repeat", type=int, default=20, help="CPU時間の計測回数")
+    parser.add_argument("--output", type=Path, default=None, help="結果を書き出すJSONファイル")
+    args = parser.parse_args()
+
+    diary_item = build_diary_item(args.tasks)
+    chat_items = build_chat_items(args.messages)
+
+    results = {
+        "diary": compare(
+            "diary",
+            lambda: GetDiaryServiceResponse(**Diary.from_dict(diary_item).to_dict()),
+            lambda: GetDiaryServiceResponse.model_validate(Diary.from_dict(diary_item)),
+            args.repeat,
+        ),
+        "chat": compare(
+            "chat",
+            lambda: [ChatMessage.from_dict(item) for item in chat_items],
+            lambda: [ChatHistoryEntry.from_item(item) for item in chat_items],
+            args.repeat,
+        ),
+    }
+
+    git_commit = get_git_commit()
+    output = {
+        "git_commit": git_commit,
+        "python_version": platform.python_version(),
+        "parameters": {"tasks": args.tasks, "messages": args.messages, "repeat": args.repeat},
+        "results": results,
+    }
+
+    output_path = args.output or RESULTS_DIR / f"decode-{git_commit or 'unknown'}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(output, ensure_ascii=False, indent=2) + "\n")
+    print(f"\n結果を {output_path} に書き出しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+ベンチマーク用の Bedrock クライアントの代わり
+
+Bedrock を呼び出さずに決まった内容を返し，指定した時間だけ待つことで
+モデルの応答時間を再現する．
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+from app.ai.interface.async_pet_care_advice_client import AsyncPetCareAdviceClient
+from app.ai.interface.async_pet_care_tasks_client import AsyncPetCareTasksClient
+from app.ai.interface.pet_avatar_image_client import PetAvatarImageClient
+from app.ai.interface.pet_care_advice_client import CareAdvicePromptVariables, PetCareAdviceClient
+from app.ai.interface.pet_care_notes_client import CareNotesPromptVariables, PetCareNotesClient
+from app.ai.interface.pet_care_tasks_client import CareTasksPromptVariables, PetCareTasksClient
+from app.ai.interface.pet_chat_assistant import PetChatAssistant
+from app.ai.interface.pet_picture_description_client import (
+    PetPictureDescription,
+    PetPictureDescriptionClient,
+)
+from app.models.chat import ChatMessage
+from app.models.diary import DiarySubtask, DiaryTask
+from app.models.pet import PetCareNote, PetCareNoteIcon
+from app.tracing.timing import timed_methods
+
+# 1x1ピクセルの透明なPNG画像
+AVATAR_IMAGE_BASE64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA"
+    "60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+class FakeLatency:
+    """
+    モデルの応答時間を再現する
+
+    シードを固定した乱数で揺らぎを決めるため，同じ順序で呼び出せば毎回同じ時間だけ待つ．
+    """
+
+    def __init__(self, mean_ms: float, jitter_ms: float = 0.0, seed: int = 0) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            mean_ms (float): 平均の待ち時間 (ミリ秒)
+            jitter_ms (float, optional): 待ち時間の揺らぎの幅 (ミリ秒)
+            seed (int, optional): 揺らぎを決める乱数のシード
+        """
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sleep(self, scale: float = 1.0) -> None:
+        """
+        待ち時間だけ待つ
+
+        Args:
+            scale (float, optional): 平均の待ち時間に掛ける倍率
+        """
+        time.sleep(self.get_delay_seconds(scale))
+
+    async def sleep_async(self, scale: float = 1.0) -> None:
+        """
+        イベントループを止めずに待ち時間だけ待つ
+
+        Args:
+            scale (float, optional): 平均の待ち時間に掛ける倍率
+        """
+        await asyncio.sleep(self.get_delay_seconds(scale))
+
+    def get_delay_seconds(self, scale: float) -> float:
+        with self.lock:
+            jitter_ms = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+
+        return max(0.0, self.mean_ms * scale + jitter_ms) / 1000
+
+
+@timed_methods("ai")
+class FakePetPictureDescriptionClient(PetPictureDescriptionClient):
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+
+    def describe(self, pet_picture_key: str) -> PetPictureDescription:
+        self.latency.sleep()
+
+        return PetPictureDescription(
+            positive_prompt=f"a cute pet ({pet_picture_key})",
+            negative_prompt="blurry",
+        )
+
+
+@timed_methods("ai")
+class FakePetAvatarImageClient(PetAvatarImageClient):
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+
+    def generate(self, description: PetPictureDescription) -> str:
+        # 画像生成はテキスト生成よりも時間がかかる
+        self.latency.sleep(scale=4.0)
+
+        return AVATAR_IMAGE_BASE64
+
+
+@timed_methods("ai")
+class FakePetCareNotesClient(PetCareNotesClient):
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+
+    def generate(self, prompt_variables: CareNotesPromptVariables) -> list[PetCareNote]:
+        self.latency.sleep()
+
+        return [
+            PetCareNote(title="ごはん", description="1日2回", icon=PetCareNoteIcon.UTENSILS),
+            PetCareNote(title="散歩", description="朝と夕方", icon=PetCareNoteIcon.DOG),
+            PetCareNote(title="おやつ", description="少しだけ", icon=PetCareNoteIcon.COOKIE),
+        ]
+
+
+@timed_methods("ai")
+class FakePetCareTasksClient(PetCareTasksClient):
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+
+    def generate(
+        self,
+        prompt_variables: CareTasksPromptVariables,
+        pet_picture_key: str,
+    ) -> list[DiaryTask]:
+        self.latency.sleep()
+
+        return [
+            DiaryTask(
+                title="ごはん",
+                description="ドライフードをあげる",
+                scheduled_time=None,
+                completed=False,
+                repeat=True,
+                sub_tasks=[
+                    DiarySubtask(
+                        title="朝ごはん",
+                        description="",
+                        scheduled_time="08:00",
+                        completed=False,
+                    ),
+                    DiarySubtask(
+                        title="夜ごはん",
+                        description="",
+                        scheduled_time="19:00",
+                        completed=False,
+                    ),
+                ],
+            ),
+            DiaryTask(
+                title="散歩",
+                description="30分",
+                scheduled_time="17:00",
+                completed=False,
+                repeat=True,
+                sub_tasks=[],
+            ),
+        ]
+
+
+@timed_methods("ai")
+class AsyncFakePetCareTasksClient(AsyncPetCareTasksClient):
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+        self.tasks = FakePetCareTasksClient(FakeLatency(0))
+
+    async def generate(
+        self,
+        prompt_variables: CareTasksPromptVariables,
+        pet_picture_key: str,
+    ) -> list[DiaryTask]:
+        await self.latency.sleep_async()
+
+        return self.tasks.generate(prompt_variables, pet_picture_key)
+
+
+@timed_methods("ai")
+class FakePetCareAdviceClient(PetCareAdviceClient):
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+
+    def generate(
+        self,
+        prompt_variables: CareAdvicePromptVariables,
+        pet_picture_key: str,
+    ) -> str:
+        self.latency.sleep()
+
+        return f"{prompt_variables.weather.value}の日は水分をしっかりとらせましょう"
+
+
+@timed_methods("ai")
+class AsyncFakePetCareAdviceClient(AsyncPetCareAdviceClient):
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+
+    async def generate(
+        self,
+        prompt_variables: CareAdvicePromptVariables,
+        pet_picture_key: str,
+    ) -> str:
+        await self.latency.sleep_async()
+
+        return f"{prompt_variables.weather.value}の日は水分をしっかりとらせましょう"
+
+
+@timed_methods("ai")
+class FakePetChatAssistant(PetChatAssistant):
+    # ストリーミングで返すチャンク数
+    CHUNK_COUNT = 8
+
+    def __init__(self, latency: FakeLatency) -> None:
+        self.latency = latency
+
+    def converse(self, pet_id: str, user_message: ChatMessage) -> ChatMessage:
+        self.latency.sleep()
+
+        return ChatMessage(
+            content=self.get_response_text(user_message),
+            created_at=datetime.now(UTC),
+        )
+
+    def converse_stream(self, pet_id: str, user_message: ChatMessage) -> Iterator[str]:
+        text = self.get_response_text(user_message)
+        chunk_size = -(-len(text) // self.CHUNK_COUNT)
+
+        # 最初のチャンクまでに応答時間の半分，残りを各チャンクに分けて待つ
+        self.latency.sleep(scale=0.5)
+        for start in range(0, len(text), chunk_size):
+            if start > 0:
+                self.latency.sleep(scale=0.5 / (self.CHUNK_COUNT - 1))
+            yield text[start : start + chunk_size]
+
+    def get_response_text(self, user_message: ChatMessage) -> str:
+        return f"「{user_message.content}」についてお話ししましょう．今日はとても元気です！"
@@ -0,0 +1,200 @@
+"""
+コールドスタートの初期化時間のベンチマーク
+
+新しいインタープリターで `python -X importtime` を使って main をインポートし，
+インポートにかかった時間と読み込まれたモジュールを記録する．
+続けて指定したパスに1回だけリクエストを送り，そのリクエストで追加で読み込まれた
+モジュールの時間も記録するため，パスごとに初期化にかかる時間を比較できる．
+
+    uv run python -m benchmarks.import_time
+    uv run python -m benchmarks.import_time --path /health --path /pets/xxx --repeat 10
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# インポートしてから1回リクエストを送る子プロセスのスクリプト
+CHILD_SCRIPT = """
+import json, os, sys, time
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+
+started_at = time.perf_counter()
+import main
+import_ms = (time.perf_counter() - started_at) * 1000
+imported_modules = set(sys.modules)
+
+print("--- request ---", file=sys.stderr, flush=True)
+
+path = sys.argv[1]
+request_ms = None
+if path:
+    from fastapi.testclient import TestClient
+
+    client = TestClient(main.app, raise_server_exceptions=False)
+    started_at = time.perf_counter()
+    client.get(path)
+    request_ms = (time.perf_counter() - started_at) * 1000
+
+print(json.dumps({
+    "import_ms": import_ms,
+    "request_ms": request_ms,
+    "module_count": len(imported_modules),
+    "boto3_loaded": "boto3" in imported_modules,
+    "pil_loaded": "PIL" in imported_modules,
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """
+    -X importtime の出力からトップレベルのパッケージごとの自己時間を集計する
+
+    Args:
+        stderr (str): 子プロセスの標準エラー出力
+
+    Returns:
+        dict[str, int]: パッケージ名と自己時間 (マイクロ秒) の組
+    """
+    packages: dict[str, int] = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, _, module_name = line.removeprefix("import time:").split("|")
+        package = module_name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+
+    return packages
+
+
+def run_once(path: str) -> dict:
+    """
+    新しいインタープリターで main をインポートし，1回だけリクエストを送る
+
+    Args:
+        path (str): リクエストを送るパス (空文字の場合は送らない)
+
+    Returns:
+        dict: インポートの時間，リクエストの時間，パッケージごとのインポートの時間
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT, path],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    import_stderr, _, request_stderr = completed.stderr.partition("--- request ---")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    result["import_packages_us"] = parse_importtime(import_stderr)
+    result["request_packages_us"] = parse_importtime(request_stderr)
+
+    return result
+
+
+def summarize(runs: list[dict]) -> dict:
+    """
+    複数回の計測結果の中央値を求める
+
+    Args:
+        runs (list[dict]): 1回ごとの計測結果
+
+    Returns:
+        dict: 中央値と，インポートの時間が長いパッケージ
+    """
+    import_packages: dict[str, list[int]] = {}
+    for run in runs:
+        for package, self_us in run["import_packages_us"].items():
+            import_packages.setdefault(package, []).append(self_us)
+
+    request_ms = [run["request_ms"] for run in runs if run["request_ms"] is not None]
+    request_packages_us = runs[-1]["request_packages_us"]
+
+    return {
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "first_request_ms": round(statistics.median(request_ms), 1) if request_ms else None,
+        "module_count": runs[-1]["module_count"],
+        "boto3_loaded_on_import": runs[-1]["boto3_loaded"],
+        "pil_loaded_on_import": runs[-1]["pil_loaded"],
+        "top_import_packages_ms": {
+            package: round(statistics.median(values) / 1000, 1)
+            for package, values in sorted(
+                import_packages.items(), key=lambda item: statistics.median(item[1]), reverse=True
+            )[:15]
+        },
+        "top_request_packages_ms": {
+            package: round(self_us / 1000, 1)
+            for package, self_us in sorted(
+                request_packages_us.items(), key=lambda item: item[1], reverse=True
+            )[:10]
+        },
+    }
+
+
+def get_git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mainのインポート時間を計測する")
+    parser.add_argument(
+        "--path",
+        action="append",
+        help="インポート後に最初のリクエストを送るパス (複数指定可)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="パスごとの計測回数")
+    parser.add_argument("--output", type=Path, default=None, help="結果を書き出すJSONファイル")
+    args = parser.parse_args()
+
+    paths = args.path or ["", "/health", "/users/benchmark-user", "/pets/benchmark-pet"]
+
+    results = {}
+    for path in paths:
+        # 1回目はディスクのキャッシュの影響が大きいため捨てる
+        run_once(path)
+        summary = summarize([run_once(path) for _ in range(args.repeat)])
+        results[path or "(import only)"] = summary
+
+        print(
+            f"{path or '(import only)':<28} "
+            f"import {summary['import_ms']:>7.1f} ms  "
+            f"first request {summary['first_request_ms'] or 0:>7.1f} ms  "
+            f"modules {summary['module_count']:>5}  "
+            f"boto3 {'yes' if summary['boto3_loaded_on_import'] else 'no'}"
+        )
+
+    git_commit = get_git_commit()
+    output = {
+        "git_commit": git_commit,
+        "python_version": platform.python_version(),
+        "repeat": args.repeat,
+        "paths": results,
+    }
+
+    output_path = args.output or RESULTS_DIR / f"import-time-{git_commit or 'unknown'}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(output, ensure_ascii=False, indent=2) + "\n")
+    print(f"\n結果を {output_path} に書き出しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,916 @@
+"""
+FastAPI アプリのエンドツーエンドのベンチマーク
+
+main.app をプロセス内で起動し，Bedrock のクライアントを応答時間を再現する偽物に差し替えて，
+すべてのルーターに並行してリクエストを送る．
+DynamoDB と S3 はプロセス内の moto (既定)，別スレッドで起動する moto のサーバー，
+または LocalStack を使う．
+moto は TransactWriteItems を並行して呼び出すと失敗することがあるため，
+チャットの書き込みのエラー率や書き込みの競合を評価する場合は LocalStack を使う．
+シナリオごとの p50/p95/p99 のレイテンシとスループットを JSON に書き出すため，
+コミット間で結果を比較できる．
+
+    uv run python -m benchmarks.run_benchmark --requests 200 --concurrency 16
+    uv run python -m benchmarks.run_benchmark --baseline benchmarks/results/<commit>.json
+
+--mode async では日記の作成と取得を非同期のルートで処理する (API_CONCURRENCY_MODE)．
+aioboto3 はプロセス内の moto では置き換えられないため，moto のサーバーか LocalStack を使う．
+同期と非同期の同時実行数あたりのスループットは次のように比較する．
+
+    uv run python -m benchmarks.run_benchmark --target moto-server --mode sync \\
+        --scenario create_diary --concurrency 200 --requests 1000 --model-latency-ms 2000 \\
+        --output benchmarks/results/sync.json
+    uv run python -m benchmarks.run_benchmark --target moto-server --mode async \\
+        --scenario create_diary --concurrency 200 --requests 1000 --model-latency-ms 2000 \\
+        --baseline benchmarks/results/sync.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+REGION_NAME = "ap-northeast-1"
+
+TABLE_NAMES = {
+    "USER_TABLE_NAME": "petrock-nova-user-table",
+    "PET_TABLE_NAME": "petrock-nova-pet-table",
+    "DIARY_TABLE_NAME": "petrock-nova-diary-table",
+    "CHAT_MESSAGE_TABLE_NAME": "petrock-nova-chat-message-table",
+}
+IMAGE_BUCKET_NAME = "petrock-nova-image-bucket"
+
+# テーブル名の環境変数とキー
+KEY_SCHEMAS = {
+    "USER_TABLE_NAME": ["user_id"],
+    "PET_TABLE_NAME": ["pet_id"],
+    "DIARY_TABLE_NAME": ["pet_id", "date"],
+    "CHAT_MESSAGE_TABLE_NAME": ["pet_id", "message_id"],
+}
+
+# 事前に投入する日記の最終日 (日付に依存せず同じデータにする)
+FIXTURE_END_DATE = date(2025, 1, 31)
+FIXTURE_DIARY_DAYS = 60
+FIXTURE_CHAT_MESSAGES = 40
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# --target moto-server で起動する moto のサーバーのアドレス
+MOTO_SERVER_HOST = "127.0.0.1"
+MOTO_SERVER_PORT = 5055
+
+
+@dataclass(frozen=True)
+class BenchmarkRequest:
+    method: str
+    url: str
+    params: dict | None = None
+    json: dict | None = None
+    headers: dict | None = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build_request: Callable[[int, random.Random], BenchmarkRequest]
+    expected_statuses: tuple[int, ...] = (200,)
+
+
+@dataclass
+class ScenarioResult:
+    latencies_ms: list[float] = field(default_factory=list)
+    status_codes: Counter = field(default_factory=Counter)
+    errors: int = 0
+    duration_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        completed = len(self.latencies_ms)
+        latencies_ms = sorted(self.latencies_ms)
+
+        return {
+            "requests": completed,
+            "errors": self.errors,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+            "duration_seconds": round(self.duration_seconds, 3),
+            "throughput_rps": round(completed / self.duration_seconds, 2)
+            if self.duration_seconds > 0
+            else 0.0,
+            "latency_ms": {
+                "mean": round(sum(latencies_ms) / completed, 3) if completed else None,
+                "p50": percentile(latencies_ms, 50),
+                "p95": percentile(latencies_ms, 95),
+                "p99": percentile(latencies_ms, 99),
+                "max": round(latencies_ms[-1], 3) if completed else None,
+            },
+        }
+
+
+class TimingCollector:
+    """
+    リクエストごとの処理時間の内訳を集める
+
+    app.tracing.timing.summary_handlers に登録して使う．
+    """
+
+    def __init__(self) -> None:
+        self.summaries: list[dict] = []
+
+    def __call__(self, summary: dict) -> None:
+        self.summaries.append(summary)
+
+    def reset(self) -> None:
+        self.summaries = []
+
+    def aggregate(self) -> dict:
+        """
+        1リクエストあたりの層ごと，処理ごとの平均時間を求める
+
+        Returns:
+            dict: 層ごとの平均時間と，処理ごとの平均回数と平均時間
+        """
+        total_request = len(self.summaries)
+        if total_request == 0:
+            return {}
+
+        layers_ms: Counter = Counter()
+        span_counts: Counter = Counter()
+        spans_ms: Counter = Counter()
+
+        for summary in self.summaries:
+            layers_ms.update(summary["layers_ms"])
+            for name, span in summary["spans"].items():
+                span_counts[name] += span["count"]
+                spans_ms[name] += span["total_ms"]
+
+        return {
+            "layers_ms": {
+                layer: round(total_ms / total_request, 3) for layer, total_ms in layers_ms.items()
+            },
+            "spans": {
+                name: {
+                    "count": round(span_counts[name] / total_request, 3),
+                    "mean_ms": round(total_ms / total_request, 3),
+                }
+                for name, total_ms in spans_ms.most_common()
+            },
+        }
+
+
+def percentile(sorted_values: list[float], p: float) -> float | None:
+    """
+    最近傍順位法でパーセンタイルを求める
+
+    Args:
+        sorted_values (list[float]): 昇順に並べた値
+        p (float): パーセンタイル (0〜100)
+
+    Returns:
+        float | None: パーセンタイルの値 (値がない場合はNone)
+    """
+    if not sorted_values:
+        return None
+
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1], 3)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """
+    app.api.dependencies が読み込む環境変数を設定する
+
+    Notes:
+        dependencies はインポート時に環境変数を読むため，main をインポートする前に呼び出す
+    """
+    for name, table_name in TABLE_NAMES.items():
+        os.environ.setdefault(name, table_name)
+    os.environ.setdefault("IMAGE_BUCKET_NAME", IMAGE_BUCKET_NAME)
+    os.environ.setdefault("AWS_DEFAULT_REGION", REGION_NAME)
+
+    # リクエストごとのログやメトリクスの出力はベンチマークの結果に影響するため抑える
+    os.environ.setdefault("POWERTOOLS_LOG_LEVEL", args.log_level)
+    os.environ.setdefault("POWERTOOLS_METRICS_NAMESPACE", "PetrockNovaBenchmark")
+    os.environ.setdefault("POWERTOOLS_METRICS_DISABLED", "true")
+
+    if args.timing:
+        os.environ["TIMING_ENABLED"] = "true"
+
+    os.environ["API_CONCURRENCY_MODE"] = args.mode
+
+    if args.target == "localstack":
+        os.environ["DYNAMODB_ENDPOINT_URL"] = args.endpoint_url
+        os.environ["S3_ENDPOINT_URL"] = args.endpoint_url
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+    elif args.target == "moto-server":
+        os.environ["DYNAMODB_ENDPOINT_URL"] = get_endpoint_url(args)
+        os.environ["S3_ENDPOINT_URL"] = get_endpoint_url(args)
+        os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+        os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+        os.environ.pop("AWS_PROFILE", None)
+    else:
+        os.environ.pop("DYNAMODB_ENDPOINT_URL", None)
+        os.environ.pop("S3_ENDPOINT_URL", None)
+        os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+        os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+        os.environ.pop("AWS_PROFILE", None)
+
+
+def get_endpoint_url(args: argparse.Namespace) -> str | None:
+    """
+    DynamoDBとS3のエンドポイントURLを取得する
+
+    Returns:
+        str | None: エンドポイントURL (プロセス内の moto の場合はNone)
+    """
+    if args.target == "localstack":
+        return args.endpoint_url
+
+    if args.target == "moto-server":
+        return f"http://{MOTO_SERVER_HOST}:{MOTO_SERVER_PORT}"
+
+    return None
+
+
+def create_resources(endpoint_url: str | None) -> None:
+    """
+    テーブルとバケットを作成する (既に存在する場合は何もしない)
+
+    Args:
+        endpoint_url (str | None): DynamoDBとS3のエンドポイントURL
+    """
+    import boto3
+
+    dynamodb = boto3.client("dynamodb", region_name=REGION_NAME, endpoint_url=endpoint_url)
+    existing_table_names = set(dynamodb.list_tables()["TableNames"])
+
+    for name, key_names in KEY_SCHEMAS.items():
+        table_name = os.environ[name]
+        if table_name in existing_table_names:
+            continue
+
+        dynamodb.create_table(
+            TableName=table_name,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": key_name, "AttributeType": "S"} for key_name in key_names
+            ],
+            KeySchema=[
+                {"AttributeName": key_name, "KeyType": key_type}
+                for key_name, key_type in zip(key_names, ["HASH", "RANGE"], strict=False)
+            ],
+        )
+        dynamodb.get_waiter("table_exists").wait(TableName=table_name)
+
+    s3 = boto3.client("s3", region_name=REGION_NAME, endpoint_url=endpoint_url)
+    bucket_name = os.environ["IMAGE_BUCKET_NAME"]
+    existing_bucket_names = {bucket["Name"] for bucket in s3.list_buckets()["Buckets"]}
+
+    if bucket_name not in existing_bucket_names:
+        s3.create_bucket(
+            Bucket=bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": REGION_NAME},
+        )
+
+
+def get_fixture_pet_id(index: int) -> str:
+    return f"benchmark-pet-{index:05d}"
+
+
+def get_fixture_user_id(index: int) -> str:
+    return f"benchmark-user-{index:05d}"
+
+
+def seed_fixtures(endpoint_url: str | None, total_pet: int) -> None:
+    """
+    読み込み系のシナリオで使うペット，ユーザー，日記，チャットメッセージを投入する
+
+    Args:
+        endpoint_url (str | None): DynamoDBのエンドポイントURL
+        total_pet (int): ペットの数
+    """
+    import boto3
+
+    from app.models.chat import ChatMessage
+    from app.models.diary import Diary, Weather
+    from app.models.pet import Pet, PetCareNote, PetCareNoteIcon, PetGender
+    from app.models.user import User, UserRole
+    from app.repositories.dynamodb.chat_repository import to_item
+    from benchmarks.fake_clients import FakeLatency, FakePetCareTasksClient
+
+    dynamodb = boto3.resource("dynamodb", region_name=REGION_NAME, endpoint_url=endpoint_url)
+    tables = {name: dynamodb.Table(os.environ[name]) for name in KEY_SCHEMAS}
+
+    tasks = FakePetCareTasksClient(FakeLatency(0)).generate(None, "")
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+
+    with (
+        tables["USER_TABLE_NAME"].batch_writer() as user_writer,
+        tables["PET_TABLE_NAME"].batch_writer() as pet_writer,
+        tables["DIARY_TABLE_NAME"].batch_writer() as diary_writer,
+        tables["CHAT_MESSAGE_TABLE_NAME"].batch_writer() as chat_message_writer,
+    ):
+        for index in range(total_pet):
+            pet_id = get_fixture_pet_id(index)
+
+            pet = Pet(
+                pet_id=pet_id,
+                name=f"ペット{index}",
+                category="マルチーズ",
+                birth_date=date(2020, 1, 1),
+                gender=PetGender.FEMALE,
+                care_notes=[
+                    PetCareNote(title="ごはん", description="1日2回", icon=PetCareNoteIcon.BONE)
+                ],
+                image_name="avatar.png",
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            pet_writer.put_item(Item=pet.to_dict())
+
+            user = User(
+                user_id=get_fixture_user_id(index),
+                pet_id=pet_id,
+                user_name=f"ユーザー{index}",
+                user_role=UserRole.PARENT,
+                password="password",
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            user_writer.put_item(Item=user.to_dict())
+
+            for day in range(FIXTURE_DIARY_DAYS):
+                diary = Diary(
+                    pet_id=pet_id,
+                    date=FIXTURE_END_DATE - timedelta(days=day),
+                    picture_name="picture.jpg",
+                    reacted=False,
+                    advice="水分をしっかりとらせましょう",
+                    comment="",
+                    weather=Weather.SUNNY,
+                    temperature="20.0",
+                    tasks=tasks,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+                diary_writer.put_item(Item=diary.to_dict())
+
+            for message_index in range(FIXTURE_CHAT_MESSAGES):
+                message = ChatMessage(
+                    content=f"メッセージ{message_index}",
+                    created_at=created_at + timedelta(minutes=message_index),
+                )
+                chat_message_writer.put_item(Item=to_item(pet_id, message))
+
+
+def install_fake_clients(app, args: argparse.Namespace) -> None:
+    """
+    Bedrock のクライアントを依存関係の上書きで偽物に差し替える
+    """
+    from app.api import dependencies
+    from benchmarks import fake_clients
+
+    latency = fake_clients.FakeLatency(args.model_latency_ms, args.model_jitter_ms, args.seed)
+
+    overrides = {
+        dependencies.get_pet_picture_description_client: (
+            fake_clients.FakePetPictureDescriptionClient(latency)
+        ),
+        dependencies.get_pet_avatar_image_client: fake_clients.FakePetAvatarImageClient(latency),
+        dependencies.get_pet_care_notes_client: fake_clients.FakePetCareNotesClient(latency),
+        dependencies.get_pet_care_tasks_client: fake_clients.FakePetCareTasksClient(latency),
+        dependencies.get_pet_care_advice_client: fake_clients.FakePetCareAdviceClient(latency),
+        dependencies.get_async_pet_care_tasks_client: (
+            fake_clients.AsyncFakePetCareTasksClient(latency)
+        ),
+        dependencies.get_async_pet_care_advice_client: (
+            fake_clients.AsyncFakePetCareAdviceClient(latency)
+        ),
+        dependencies.get_pet_chat_assistant: fake_clients.FakePetChatAssistant(latency),
+    }
+
+    for dependency, fake_client in overrides.items():
+        app.dependency_overrides[dependency] = provide(fake_client)
+
+
+def provide(value):
+    """
+    値をそのまま返す依存関係を作る
+
+    Notes:
+        引数を持つ関数を渡すと FastAPI がクエリパラメーターとして扱うため，クロージャで包む
+    """
+    return lambda: value
+
+
+def build_scenarios(total_pet: int) -> list[Scenario]:
+    """
+    すべてのルーターのシナリオを作る
+
+    Args:
+        total_pet (int): 事前に投入したペットの数
+
+    Returns:
+        list[Scenario]: シナリオ
+    """
+
+    def pet_id(rng: random.Random) -> str:
+        return get_fixture_pet_id(rng.randrange(total_pet))
+
+    def user_id(rng: random.Random) -> str:
+        return get_fixture_user_id(rng.randrange(total_pet))
+
+    def diary_date(rng: random.Random) -> str:
+        return (FIXTURE_END_DATE - timedelta(days=rng.randrange(FIXTURE_DIARY_DAYS))).isoformat()
+
+    return [
+        Scenario("health", lambda i, rng: BenchmarkRequest("GET", "/health")),
+        Scenario("get_user", lambda i, rng: BenchmarkRequest("GET", f"/users/{user_id(rng)}")),
+        Scenario(
+            "create_user",
+            lambda i, rng: BenchmarkRequest(
+                "POST",
+                f"/users/benchmark-new-user-{i:06d}",
+                json={
+                    "user_name": "ユーザー",
+                    "user_role": "child",
+                    "password": "password",
+                },
+            ),
+        ),
+        Scenario(
+            "update_user",
+            lambda i, rng: BenchmarkRequest(
+                "PUT", f"/users/{user_id(rng)}", json={"user_role": "general"}
+            ),
+        ),
+        Scenario("get_pet", lambda i, rng: BenchmarkRequest("GET", f"/pets/{pet_id(rng)}")),
+        Scenario(
+            "create_pet",
+            lambda i, rng: BenchmarkRequest(
+                "POST",
+                f"/pets/benchmark-new-pet-{i:06d}",
+                json={
+                    "name": "ペット",
+                    "category": "マルチーズ",
+                    "birth_date": "2020-01-01",
+                    "gender": "male",
+                    "picture_name": "picture.jpg",
+                },
+            ),
+        ),
+        Scenario(
+            "update_pet",
+            lambda i, rng: BenchmarkRequest(
+                "PUT",
+                f"/pets/{pet_id(rng)}",
+                # 更新済みのペットではバージョンが競合し，最新のバージョンで再試行する
+                json={
+                    "care_notes": [
+                        {"title": "散歩", "description": "朝と夕方", "icon": "Dog"},
+                    ],
+                    "version": 0,
+                },
+            ),
+        ),
+        Scenario(
+            "get_diary",
+            lambda i, rng: BenchmarkRequest(
+                "GET", f"/pets/{pet_id(rng)}/diaries/{diary_date(rng)}"
+            ),
+        ),
+        Scenario(
+            "list_diaries",
+            lambda i, rng: BenchmarkRequest(
+                "GET",
+                f"/pets/{pet_id(rng)}/diaries",
+                params={
+                    "from": (FIXTURE_END_DATE - timedelta(days=30)).isoformat(),
+                    "to": FIXTURE_END_DATE.isoformat(),
+                },
+            ),
+        ),
+        Scenario(
+            "create_diary",
+            lambda i, rng: BenchmarkRequest(
+                "POST",
+                f"/pets/{pet_id(rng)}/diaries/"
+                f"{(FIXTURE_END_DATE + timedelta(days=1 + i)).isoformat()}",
+                json={
+                    "category": "マルチーズ",
+                    "birth_date": "2020-01-01",
+                    "picture_name": "picture.jpg",
+                    "weather": "晴れ",
+                    "temperature": "20.0",
+                },
+            ),
+        ),
+        Scenario(
+            "update_diary",
+            lambda i, rng: BenchmarkRequest(
+                "PUT",
+                f"/pets/{pet_id(rng)}/diaries/{diary_date(rng)}",
+                json={"reacted": True, "comment": "元気", "tasks": None, "version": 0},
+            ),
+        ),
+        Scenario(
+            "update_diary_task",
+            lambda i, rng: BenchmarkRequest(
+                "PATCH",
+                f"/pets/{pet_id(rng)}/diaries/{diary_date(rng)}/tasks/1",
+                json={"completed": True},
+            ),
+        ),
+        Scenario(
+            "get_chat",
+            lambda i, rng: BenchmarkRequest(
+                "GET", f"/pets/{pet_id(rng)}/chats", params={"limit": 20}
+            ),
+        ),
+        Scenario(
+            "converse",
+            lambda i, rng: BenchmarkRequest(
+                "POST", f"/pets/{pet_id(rng)}/chats", json={"content": f"こんにちは{i}"}
+            ),
+        ),
+        Scenario(
+            "converse_stream",
+            lambda i, rng: BenchmarkRequest(
+                "POST",
+                f"/pets/{pet_id(rng)}/chats",
+                json={"content": f"こんにちは{i}"},
+                headers={"Accept": "text/event-stream"},
+            ),
+        ),
+        Scenario(
+            "get_presigned_url",
+            lambda i, rng: BenchmarkRequest(
+                "POST",
+                "/s3/presigned-url",
+                params={"pet_id": pet_id(rng), "file_name": "picture.jpg"},
+            ),
+        ),
+        Scenario(
+            "get_presigned_urls",
+            lambda i, rng: BenchmarkRequest(
+                "POST",
+                "/s3/presigned-urls",
+                params={"pet_id": pet_id(rng)},
+                json={"file_names": [f"picture{index}.jpg" for index in range(20)]},
+            ),
+        ),
+        Scenario(
+            "list_pet_pictures",
+            lambda i, rng: BenchmarkRequest(
+                "GET", "/s3/pictures", params={"pet_id": pet_id(rng), "limit": 30}
+            ),
+        ),
+        Scenario(
+            "batch_get_pets",
+            lambda i, rng: BenchmarkRequest(
+                "POST", "/batch/pets", json={"pet_ids": [pet_id(rng) for _ in range(20)]}
+            ),
+        ),
+        Scenario(
+            "batch_get_users",
+            lambda i, rng: BenchmarkRequest(
+                "POST", "/batch/users", json={"user_ids": [user_id(rng) for _ in range(20)]}
+            ),
+        ),
+        Scenario(
+            "batch_get_diaries",
+            lambda i, rng: BenchmarkRequest(
+                "POST",
+                "/batch/diaries",
+                json={
+                    "keys": [{"pet_id": pet_id(rng), "date": diary_date(rng)} for _ in range(20)]
+                },
+            ),
+        ),
+    ]
+
+
+async def run_scenario(
+    client,
+    scenario: Scenario,
+    total_request: int,
+    concurrency: int,
+    seed: int,
+    offset: int = 0,
+) -> ScenarioResult:
+    """
+    1つのシナリオのリクエストを並行して送る
+
+    Args:
+        client (httpx.AsyncClient): アプリに接続したクライアント
+        scenario (Scenario): シナリオ
+        total_request (int): リクエスト数
+        concurrency (int): 同時に送るリクエスト数
+        seed (int): リクエストの内容を決める乱数のシード
+        offset (int, optional): 作成系のシナリオで重複しないように通し番号に足す数
+
+    Returns:
+        ScenarioResult: シナリオの結果
+    """
+    rng = random.Random(f"{seed}:{scenario.name}:{offset}")
+    requests = [scenario.build_request(offset + i, rng) for i in range(total_request)]
+    result = ScenarioResult()
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+
+        while next_index < len(requests):
+            request = requests[next_index]
+            next_index += 1
+
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(
+                    request.method,
+                    request.url,
+                    params=request.params,
+                    json=request.json,
+                    headers=request.headers,
+                )
+            except Exception:
+                result.errors += 1
+                continue
+
+            result.latencies_ms.append((time.perf_counter() - started_at) * 1000)
+            result.status_codes[response.status_code] += 1
+
+            if response.status_code not in scenario.expected_statuses:
+                result.errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration_seconds = time.perf_counter() - started_at
+
+    return result
+
+
+async def run_benchmark(
+    app, args: argparse.Namespace, timing_collector: TimingCollector | None = None
+) -> dict[str, dict]:
+    import httpx
+
+    scenarios = build_scenarios(args.fixture_pets)
+    if args.scenario:
+        unknown_names = set(args.scenario) - {scenario.name for scenario in scenarios}
+        if unknown_names:
+            raise SystemExit(f"不明なシナリオ: {', '.join(sorted(unknown_names))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenario]
+
+    results = {}
+    # アプリの例外はクライアントに伝えず，500 のレスポンスとして数える
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for scenario in scenarios:
+            # 初回のクライアント作成などを計測から除くために先に数回送る
+            await run_scenario(
+                client, scenario, args.warmup, args.concurrency, args.seed, offset=args.requests
+            )
+            if timing_collector is not None:
+                timing_collector.reset()
+            cache_metrics_before = get_cache_metrics()
+
+            result = await run_scenario(
+                client, scenario, args.requests, args.concurrency, args.seed
+            )
+            results[scenario.name] = result.to_dict()
+            results[scenario.name]["cache"] = diff_cache_metrics(
+                cache_metrics_before, get_cache_metrics()
+            )
+            if timing_collector is not None:
+                results[scenario.name]["timing"] = timing_collector.aggregate()
+
+            latency_ms = results[scenario.name]["latency_ms"]
+            print(
+                f"{scenario.name:<20} "
+                f"{results[scenario.name]['throughput_rps']:>9.1f} req/s  "
+                f"p50 {latency_ms['p50'] or 0:>8.2f} ms  "
+                f"p95 {latency_ms['p95'] or 0:>8.2f} ms  "
+                f"p99 {latency_ms['p99'] or 0:>8.2f} ms  "
+                f"errors {result.errors}"
+            )
+
+    if args.mode == "async":
+        from app.aws.async_client_registry import async_aws_client_registry
+
+        # イベントループを閉じる前に aioboto3 の接続を閉じる
+        await async_aws_client_registry.close()
+
+    return results
+
+
+def get_cache_metrics() -> dict[str, dict]:
+    """
+    ペット，ユーザー，署名付きURLのキャッシュの統計情報を取得する
+
+    Returns:
+        dict[str, dict]: エンティティ名と統計情報の組
+    """
+    from app.api import dependencies
+
+    return {
+        "pet": dependencies.pet_cache.get_metrics(),
+        "user": dependencies.user_cache.get_metrics(),
+        "presigned_url": dependencies.presigned_url_cache.get_metrics(),
+    }
+
+
+def diff_cache_metrics(before: dict[str, dict], after: dict[str, dict]) -> dict[str, dict]:
+    """
+    シナリオの実行中に増えたキャッシュの統計情報を求める
+
+    Args:
+        before (dict[str, dict]): 実行前の統計情報
+        after (dict[str, dict]): 実行後の統計情報
+
+    Returns:
+        dict[str, dict]: シナリオ中に参照があったエンティティの統計情報とヒット率
+    """
+    results = {}
+
+    for name, metrics in after.items():
+        diff = {
+            key: value - before[name][key]
+            for key, value in metrics.items()
+            if key not in {"hit_ratio", "entries"}
+        }
+        hit_count = diff["hits"] + diff["revalidated_hits"]
+        lookups = hit_count + diff["misses"]
+
+        if lookups == 0:
+            continue
+
+        results[name] = {**diff, "hit_ratio": round(hit_count / lookups, 3)}
+
+    return results
+
+
+def get_git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_with_baseline(results: dict[str, dict], baseline_path: Path) -> None:
+    """
+    以前の結果と比べた p95 とスループットの変化を表示する
+
+    Args:
+        results (dict[str, dict]): 今回のシナリオごとの結果
+        baseline_path (Path): 以前の結果のJSONファイル
+    """
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\n{baseline_path} ({baseline.get('git_commit')}) との比較")
+
+    for name, result in results.items():
+        baseline_result = baseline["scenarios"].get(name)
+        if baseline_result is None:
+            continue
+
+        p95 = result["latency_ms"]["p95"]
+        baseline_p95 = baseline_result["latency_ms"]["p95"]
+        throughput = result["throughput_rps"]
+        baseline_throughput = baseline_result["throughput_rps"]
+
+        print(
+            f"{name:<20} "
+            f"p95 {baseline_p95:>8.2f} -> {p95:>8.2f} ms ({(p95 / baseline_p95 - 1):+7.1%})  "
+            f"{baseline_throughput:>9.1f} -> {throughput:>9.1f} req/s "
+            f"({(throughput / baseline_throughput - 1):+7.1%})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FastAPIアプリのベンチマークを実行する")
+    parser.add_argument(
+        "--target",
+        choices=["moto", "moto-server", "localstack"],
+        default="moto",
+        help="DynamoDBとS3の接続先",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["sync", "async"],
+        default="sync",
+        help="日記の作成と取得を同期と非同期のどちらのルートで処理するか",
+    )
+    parser.add_argument("--endpoint-url", default="http://localhost:4566")
+    parser.add_argument("--requests", type=int, default=200, help="シナリオごとのリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=16, help="同時に送るリクエスト数")
+    parser.add_argument("--warmup", type=int, default=10, help="計測前に送るリクエスト数")
+    parser.add_argument("--fixture-pets", type=int, default=50, help="事前に投入するペットの数")
+    parser.add_argument(
+        "--model-latency-ms", type=float, default=50, help="偽のBedrockの平均応答時間"
+    )
+    parser.add_argument(
+        "--model-jitter-ms", type=float, default=0, help="偽のBedrockの応答時間の揺らぎ"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument(
+        "--scenario", action="append", help="実行するシナリオ (複数指定可，省略時はすべて)"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="結果を書き出すJSONファイル")
+    parser.add_argument("--baseline", type=Path, default=None, help="比較する以前の結果")
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="サービス，リポジトリ，AIクライアントごとの処理時間の内訳を記録する",
+    )
+    parser.add_argument("--log-level", default="WARNING", help="アプリのログレベル")
+    args = parser.parse_args()
+
+    if args.mode == "async" and args.target == "moto":
+        parser.error("--mode async では --target moto-server か localstack を指定してください")
+
+    configure_environment(args)
+
+    mock = None
+    moto_server = None
+    endpoint_url = get_endpoint_url(args)
+
+    if args.target == "moto":
+        from moto import mock_aws
+
+        mock = mock_aws()
+        mock.start()
+    elif args.target == "moto-server":
+        from moto.server import ThreadedMotoServer
+
+        moto_server = ThreadedMotoServer(ip_address=MOTO_SERVER_HOST, port=MOTO_SERVER_PORT)
+        moto_server.start()
+
+    try:
+        create_resources(endpoint_url)
+        seed_fixtures(endpoint_url, args.fixture_pets)
+
+        from main import app
+
+        install_fake_clients(app, args)
+
+        timing_collector = None
+        if args.timing:
+            from app.tracing.timing import summary_handlers
+
+            timing_collector = TimingCollector()
+            summary_handlers.append(timing_collector)
+
+        started_at = datetime.now(UTC)
+        scenario_results = asyncio.run(run_benchmark(app, args, timing_collector))
+    finally:
+        if mock is not None:
+            mock.stop()
+        if moto_server is not None:
+            moto_server.stop()
+
+    git_commit = get_git_commit()
+    output = {
+        "git_commit": git_commit,
+        "started_at": started_at.isoformat(),
+        "python_version": platform.python_version(),
+        "parameters": {
+            "target": args.target,
+            "mode": args.mode,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "fixture_pets": args.fixture_pets,
+            "model_latency_ms": args.model_latency_ms,
+            "model_jitter_ms": args.model_jitter_ms,
+            "seed": args.seed,
+            "timing": args.timing,
+        },
+        "scenarios": scenario_results,
+    }
+
+    output_path = args.output or RESULTS_DIR / f"{git_commit or 'unknown'}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(output, ensure_ascii=False, indent=2) + "\n")
+    print(f"\n結果を {output_path} に書き出しました")
+
+    if args.baseline is not None:
+        compare_with_baseline(scenario_results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,62 @@
+import os
+
+from aws_lambda_powertools import Metrics
 from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
 from mangum import Mangum
 
-from app.api.routers.chat_router import router as chat_router
-from app.api.routers.diary_router import router as diary_router
+from app.api.lazy_router import LazyRouter, LazyRouterLoader, LazyRouterMiddleware
 from app.api.routers.health_router import router as health_router
-from app.api.routers.pet_router import router as pet_router
-from app.api.routers.s3_router import router as s3_router
-from app.api.routers.user_router import router as user_router
+from app.cache.cache_metrics import CacheMetricsMiddleware
+from app.tracing.timing import TIMING_ENABLED, RequestTimingMiddleware
+
+# async の場合は日記の作成と取得を aioboto3 を使う非同期のルートで処理する
+API_CONCURRENCY_MODE = os.getenv("API_CONCURRENCY_MODE", "sync")
+
+DIARY_ROUTER_MODULES = {
+    "sync": "app.api.routers.diary_router",
+    "async": "app.api.routers.async_diary_router",
+}
 
 app = FastAPI()
 
 app.include_router(health_router, prefix="/health")
-app.include_router(user_router, prefix="/users", tags=["User"])
-app.include_router(pet_router, prefix="/pets", tags=["Pet"])
-app.include_router(diary_router, prefix="/pets/{pet_id}/diaries", tags=["Diary"])
-app.include_router(chat_router, prefix="/pets/{pet_id}/chats", tags=["Chat"])
-app.include_router(s3_router, prefix="/s3", tags=["S3"])
 
-handler = Mangum(app)
+# ヘルスチェック以外のルーターは，コールドスタートを短くするために最初のリクエストで読み込む
+lazy_router_loader = LazyRouterLoader(
+    app,
+    [
+        LazyRouter("app.api.routers.user_router", prefix="/users", tags=["User"]),
+        LazyRouter("app.api.routers.pet_router", prefix="/pets", tags=["Pet"]),
+        LazyRouter(
+            DIARY_ROUTER_MODULES[API_CONCURRENCY_MODE],
+            prefix="/pets/{pet_id}/diaries",
+            tags=["Diary"],
+        ),
+        LazyRouter("app.api.routers.chat_router", prefix="/pets/{pet_id}/chats", tags=["Chat"]),
+        LazyRouter("app.api.routers.s3_router", prefix="/s3", tags=["S3"]),
+        LazyRouter("app.api.routers.batch_router", prefix="/batch", tags=["Batch"]),
+    ],
+)
+app.add_middleware(LazyRouterMiddleware, loader=lazy_router_loader)
+
+# キャッシュのヒット数などはリクエストごとにまとめてメトリクスに記録する
+app.add_middleware(CacheMetricsMiddleware)
+
+# 有効な場合はリクエストごとにサービス，リポジトリ，AIクライアントの処理時間の内訳をログに出力する
+if TIMING_ENABLED:
+    app.add_middleware(RequestTimingMiddleware)
+
+# API Gateway の CORS 設定はプリフライトにだけ適用されるため，レスポンスにもヘッダーを付ける
+# (条件付きリクエストの ETag とページングの X-Next-Cursor をブラウザから読めるようにする)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization", "If-Match", "If-None-Match"],
+    expose_headers=["ETag", "X-Next-Cursor"],
+)
+
+# サービスで記録したメトリクスをリクエストごとにEMF形式で出力する
+metrics = Metrics()
+handler = metrics.log_metrics(Mangum(app))
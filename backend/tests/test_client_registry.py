@@ -0,0 +1,50 @@
+import argparse
+import importlib
+import unittest
+
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from benchmarks import run_benchmark
+
+
+class AWSClientRegistryReuseTest(unittest.TestCase):
+    def setUp(self):
+        run_benchmark.configure_environment(
+            argparse.Namespace(
+                target="moto",
+                mode="sync",
+                timing=False,
+                log_level="ERROR",
+                endpoint_url=None,
+            )
+        )
+
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+
+        run_benchmark.create_resources(None)
+        run_benchmark.seed_fixtures(None, 2)
+
+        # dependencies はインポート時に環境変数を読むため，環境変数を設定してからインポートする
+        main = importlib.import_module("main")
+        self.client = TestClient(main.app)
+
+        from app.aws.client_registry import aws_client_registry
+
+        aws_client_registry.clear()
+        self.registry = aws_client_registry
+
+    def test_second_request_reuses_clients(self):
+        # キャッシュに当たらないように，別のペットを取得してどちらもDynamoDBを読む
+        response = self.client.get(f"/pets/{run_benchmark.get_fixture_pet_id(0)}")
+        self.assertEqual(response.status_code, 200)
+
+        created_count = self.registry.created_count
+        self.assertGreater(created_count, 0)
+
+        response = self.client.get(f"/pets/{run_benchmark.get_fixture_pet_id(1)}")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.registry.created_count, created_count)
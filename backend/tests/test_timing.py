@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+import boto3
+from botocore.config import Config
+
+from app.tracing import timing
+from app.tracing.timing import RequestTiming, current_request_timing, instrument_session
+
+
+class SendError(Exception):
+    pass
+
+
+class InstrumentSessionTest(unittest.TestCase):
+    def setUp(self):
+        request_timing = RequestTiming()
+        token = current_request_timing.set(request_timing)
+        self.addCleanup(current_request_timing.reset, token)
+        self.request_timing = request_timing
+
+    def create_client(self):
+        session = boto3.session.Session(
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+            region_name="us-east-1",
+        )
+
+        with mock.patch.object(timing, "TIMING_ENABLED", True):
+            instrument_session(session)
+
+        return session.client("s3", config=Config(retries={"total_max_attempts": 1}))
+
+    def test_failed_call_raises_original_exception(self):
+        client = self.create_client()
+
+        def fail(**kwargs):
+            raise SendError
+
+        client.meta.events.register("before-send.s3", fail)
+
+        # after-call-error のハンドラーで別の例外に置き換わらないこと
+        with self.assertRaises(SendError):
+            client.list_buckets()
+
+        self.assertEqual([span.name for span in self.request_timing.spans], ["s3.ListBuckets"])
+
+    def test_successful_call_records_span(self):
+        client = self.create_client()
+        client.meta.events.register(
+            "before-send.s3",
+            lambda **kwargs: mock.Mock(
+                status_code=200,
+                headers={},
+                content=b"<ListAllMyBucketsResult></ListAllMyBucketsResult>",
+            ),
+        )
+
+        client.list_buckets()
+
+        self.assertEqual([span.name for span in self.request_timing.spans], ["s3.ListBuckets"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from datetime import UTC, datetime
+
+from app.repositories.dynamodb.update_expression import build_versioned_update
+
+
+class BuildVersionedUpdateTest(unittest.TestCase):
+    def test_expected_updated_at_matches_stored_formats(self):
+        update_kwargs = build_versioned_update(
+            "pet_id",
+            {"care_notes": []},
+            expected_version=3,
+            expected_updated_at=datetime(2025, 3, 4, 5, 6, 7, 123400, tzinfo=UTC),
+        )
+
+        self.assertIn(
+            "#version = :expected_version AND #expected_updated_at IN (",
+            update_kwargs["ConditionExpression"],
+        )
+        self.assertEqual(
+            {
+                value
+                for name, value in update_kwargs["ExpressionAttributeValues"].items()
+                if name.startswith(":expected_updated_at")
+            },
+            {
+                "2025-03-04T05:06:07.123400Z",
+                "2025-03-04T05:06:07.123400+00:00",
+                "2025-03-04T05:06:07.123400",
+            },
+        )
+
+    def test_without_expectations_only_requires_existence(self):
+        update_kwargs = build_versioned_update("pet_id", {"care_notes": []})
+
+        self.assertEqual(update_kwargs["ConditionExpression"], "attribute_exists(pet_id)")
+
+
+if __name__ == "__main__":
+    unittest.main()
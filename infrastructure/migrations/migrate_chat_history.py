@@ -0,0 +1,205 @@
+"""
+ペットの項目に保存されているチャット履歴 (chat_history) をチャットメッセージのテーブルへ移行する
+
+移行したメッセージのソートキーはペットIDと履歴内の位置から決めるため，
+途中で失敗しても同じコマンドを再実行すれば重複せずに移行できる．
+"""
+
+import argparse
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import boto3
+from botocore.exceptions import ClientError
+
+# 作成日時がないペットのメッセージに使う基準日時
+FALLBACK_CREATED_AT = datetime(1970, 1, 1, tzinfo=UTC)
+
+# 移行中に追加されたメッセージを取りこぼした場合の再試行回数
+MAX_RETRY_COUNT = 3
+
+
+def parse_created_at(value: str | None) -> datetime:
+    """
+    ペットの作成日時を読み込む
+
+    Args:
+        value (str | None): ISO 8601形式の日時
+
+    Returns:
+        datetime: UTCの日時 (読み込めない場合は FALLBACK_CREATED_AT)
+    """
+    if not value:
+        return FALLBACK_CREATED_AT
+
+    try:
+        created_at = datetime.fromisoformat(value)
+    except ValueError:
+        return FALLBACK_CREATED_AT
+
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+
+    return created_at.astimezone(UTC)
+
+
+def to_message_items(
+    pet_id: str, base_created_at: datetime, chat_history: list
+) -> list[dict]:
+    """
+    チャット履歴をチャットメッセージのテーブルの項目に変換する
+
+    Args:
+        pet_id (str): ペットID
+        base_created_at (datetime): 最初のメッセージの日時
+        chat_history (list): ペットの項目に保存されているチャット履歴
+
+    Returns:
+        list[dict]: チャットメッセージのテーブルの項目
+
+    Notes:
+        ソートキーの形式は backend の DynamoDBChatRepository と揃える
+    """
+    items = []
+
+    for index, message in enumerate(chat_history):
+        # 履歴の順序を保つために1ミリ秒ずつずらす
+        created_at = (base_created_at + timedelta(milliseconds=index)).strftime(
+            "%Y-%m-%dT%H:%M:%S.%fZ"
+        )
+        suffix = uuid.uuid5(uuid.NAMESPACE_URL, f"{pet_id}/{index}").hex[:8]
+
+        items.append(
+            {
+                "pet_id": pet_id,
+                "message_id": f"{created_at}#{suffix}",
+                "content": message["content"],
+                "created_at": created_at,
+            }
+        )
+
+    return items
+
+
+def migrate_pet(pet_table, chat_message_table, pet_id: str, dry_run: bool) -> int:
+    """
+    1匹分のチャット履歴を移行し，ペットの項目から削除する
+
+    Args:
+        pet_table: ペットのテーブル
+        chat_message_table: チャットメッセージのテーブル
+        pet_id (str): ペットID
+        dry_run (bool): 書き込まずに件数だけを数えるかどうか
+
+    Returns:
+        int: 移行したメッセージ数
+    """
+    for _ in range(MAX_RETRY_COUNT):
+        response = pet_table.get_item(
+            Key={"pet_id": pet_id},
+            ProjectionExpression="chat_history, created_at",
+            ConsistentRead=True,
+        )
+        item = response.get("Item", {})
+        chat_history = item.get("chat_history")
+
+        if not chat_history:
+            return 0
+
+        items = to_message_items(
+            pet_id, parse_created_at(item.get("created_at")), chat_history
+        )
+
+        if dry_run:
+            return len(items)
+
+        with chat_message_table.batch_writer(
+            overwrite_by_pkeys=["pet_id", "message_id"]
+        ) as batch:
+            for message_item in items:
+                batch.put_item(Item=message_item)
+
+        try:
+            # 移行中にメッセージが追加されていた場合は削除せずにやり直す
+            pet_table.update_item(
+                Key={"pet_id": pet_id},
+                UpdateExpression="REMOVE chat_history",
+                ConditionExpression="size(chat_history) = :size",
+                ExpressionAttributeValues={":size": len(chat_history)},
+            )
+        except ClientError as error:
+            if error.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            continue
+
+        return len(items)
+
+    raise RuntimeError(f"チャット履歴の移行に失敗しました: {pet_id}")
+
+
+def migrate_chat_history(
+    endpoint_url: str | None,
+    pet_table_name: str,
+    chat_message_table_name: str,
+    dry_run: bool,
+) -> None:
+    dynamodb = boto3.resource(
+        "dynamodb",
+        endpoint_url=endpoint_url,
+        region_name="ap-northeast-1",
+    )
+    pet_table = dynamodb.Table(pet_table_name)
+    chat_message_table = dynamodb.Table(chat_message_table_name)
+
+    scan_kwargs = {
+        "ProjectionExpression": "pet_id",
+        "FilterExpression": "attribute_exists(chat_history)",
+    }
+
+    total_pet = 0
+    total_message = 0
+
+    while True:
+        response = pet_table.scan(**scan_kwargs)
+
+        for item in response.get("Items", []):
+            migrated_count = migrate_pet(
+                pet_table, chat_message_table, item["pet_id"], dry_run
+            )
+            print(f"{item['pet_id']}: {migrated_count}件")
+
+            total_pet += 1
+            total_message += migrated_count
+
+        if "LastEvaluatedKey" not in response:
+            break
+
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    action = "移行対象" if dry_run else "移行済み"
+    print(f"{action}: ペット {total_pet}匹, メッセージ {total_message}件")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="チャット履歴をチャットメッセージのテーブルへ移行する"
+    )
+    parser.add_argument(
+        "--endpoint-url", default=None, help="DynamoDBのエンドポイントURL"
+    )
+    parser.add_argument("--pet-table", default="petrock-nova-pet-table")
+    parser.add_argument(
+        "--chat-message-table", default="petrock-nova-chat-message-table"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="書き込まずに件数だけを表示する"
+    )
+    args = parser.parse_args()
+
+    migrate_chat_history(
+        args.endpoint_url, args.pet_table, args.chat_message_table, args.dry_run
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,17 @@ from aws_lambda_powertools.event_handler.exceptions import (
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT_URL")
-PET_TABLE_NAME = os.getenv("PET_TABLE_NAME")
+CHAT_MESSAGE_TABLE_NAME = os.getenv("CHAT_MESSAGE_TABLE_NAME")
+
+# エージェントに渡す直近のメッセージ数
+CHAT_HISTORY_LIMIT = 20
 
 dynamodb = boto3.resource(
     "dynamodb",
     endpoint_url=DYNAMODB_ENDPOINT_URL,
     region_name="ap-northeast-1",
 )
-pet_table = dynamodb.Table(PET_TABLE_NAME)
+chat_message_table = dynamodb.Table(CHAT_MESSAGE_TABLE_NAME)
 
 app = BedrockAgentFunctionResolver()
 
@@ -31,16 +34,19 @@ def get_chat() -> dict:
         raise BadRequestError("ペットIDが必要です")
 
     try:
-        response = pet_table.get_item(
-            Key={"pet_id": pet_id},
-            ProjectionExpression="chat_history",
+        response = chat_message_table.query(
+            KeyConditionExpression="pet_id = :pet_id",
+            ExpressionAttributeValues={":pet_id": pet_id},
+            ProjectionExpression="content, created_at",
+            ScanIndexForward=False,
+            Limit=CHAT_HISTORY_LIMIT,
         )
-        item = response.get("Item")
+        items = response.get("Items", [])
 
-        if not item:
+        if not items:
             raise NotFoundError("チャット履歴が見つかりませんでした")
 
-        return item
+        return {"chat_history": list(reversed(items))}
     except Exception as e:
         raise InternalServerError(str(e))
 
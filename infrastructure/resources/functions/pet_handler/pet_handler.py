@@ -19,6 +19,13 @@ dynamodb = boto3.resource(
 )
 pet_table = dynamodb.Table(PET_TABLE_NAME)
 
+# 移行前のチャット履歴 (chat_history) を読み込まないように取得する属性を限定する
+# version は条件付きの更新 (楽観的排他制御) に使う
+PET_PROJECTION_EXPRESSION = (
+    "pet_id, #name, category, birth_date, gender, care_notes, image_name, "
+    "created_at, updated_at, #version"
+)
+
 app = BedrockAgentFunctionResolver()
 
 
@@ -31,12 +38,20 @@ def get_pet() -> dict:
         raise BadRequestError("ペットidが必要です")
 
     try:
-        response = pet_table.get_item(Key={"pet_id": pet_id})
+        response = pet_table.get_item(
+            Key={"pet_id": pet_id},
+            ProjectionExpression=PET_PROJECTION_EXPRESSION,
+            ExpressionAttributeNames={"#name": "name", "#version": "version"},
+        )
         item = response.get("Item")
 
         if not item:
             raise NotFoundError("ペットが見つかりませんでした")
 
+        # 数値は Decimal で読み込まれ json.dumps で変換できないため，バージョンは整数にして返す
+        # (バージョンを持たない移行前の項目は0として扱う)
+        item["version"] = int(item.get("version", 0))
+
         return item
     except Exception as e:
         raise InternalServerError(str(e))
@@ -0,0 +1,469 @@
+"""
+負荷試験用の大量のダミーデータを DynamoDB に投入する
+
+ペット，ユーザー，日記，チャットメッセージを BatchWriteItem (batch_writer) で
+並列に書き込み，投入速度 (items/sec) を表示する．
+乱数はシードとペットの通し番号から決めるため，同じ引数で実行すれば同じデータになり，
+再実行しても同じキーの項目が上書きされるだけで重複しない．
+"""
+
+import argparse
+import hashlib
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from datetime import UTC, date, datetime, timedelta
+
+import boto3
+from botocore.config import Config
+from faker import Faker
+
+pet_genders = ["male", "female"]
+
+pet_care_note_icons = ["Dog", "Bone", "Smile", "Frown", "Utensils", "Cookie"]
+
+user_roles = ["child", "parent", "general"]
+
+# 晴れ，曇り，雨，雪の出現しやすさ
+weathers = ["晴れ", "曇り", "雨", "雪"]
+weather_weights = [45, 30, 20, 5]
+
+# Faker は1件ずつ呼び出すと遅いため，起動時に作った語彙から選ぶ
+VOCABULARY_SIZE = 500
+
+thread_local = threading.local()
+
+
+class Vocabulary:
+    """ダミーデータに使う語彙"""
+
+    def __init__(self, seed: int) -> None:
+        """
+        コンストラクタ
+
+        Args:
+            seed (int): 語彙を作るときのシード
+        """
+        fake = Faker("ja_JP")
+        fake.seed_instance(seed)
+
+        self.names = [fake.first_name() for _ in range(VOCABULARY_SIZE)]
+        self.words = [fake.word() for _ in range(VOCABULARY_SIZE)]
+        self.sentences = [fake.sentence() for _ in range(VOCABULARY_SIZE)]
+        self.texts = [fake.text(max_nb_chars=200) for _ in range(VOCABULARY_SIZE)]
+
+
+def get_random(seed: int, pet_index: int) -> random.Random:
+    """
+    ペットごとの乱数生成器を作る
+
+    Args:
+        seed (int): 全体のシード
+        pet_index (int): ペットの通し番号
+
+    Returns:
+        random.Random: ワーカー数や投入順に依存しない乱数生成器
+    """
+    return random.Random(f"{seed}:{pet_index}")
+
+
+def generate_uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def to_timestamp(value: datetime) -> str:
+    return value.isoformat(timespec="seconds")
+
+
+def generate_pet(
+    rng: random.Random, vocabulary: Vocabulary, pet_id: str, created_at: datetime
+) -> dict:
+    return {
+        "pet_id": pet_id,
+        "name": rng.choice(vocabulary.names),
+        "category": rng.choice(vocabulary.words),
+        "birth_date": (
+            created_at.date() - timedelta(days=rng.randint(0, 5000))
+        ).isoformat(),
+        "gender": rng.choice(pet_genders),
+        "care_notes": [
+            {
+                "title": rng.choice(vocabulary.words),
+                "description": rng.choice(vocabulary.sentences),
+                "icon": rng.choice(pet_care_note_icons),
+            }
+            for _ in range(rng.randint(1, 6))
+        ],
+        "image_name": f"{pet_id}/{generate_uuid(rng)}.jpg",
+        "created_at": to_timestamp(created_at),
+        "updated_at": to_timestamp(created_at),
+        "version": 0,
+    }
+
+
+def generate_users(
+    rng: random.Random, vocabulary: Vocabulary, pet_id: str, created_at: datetime
+) -> list[dict]:
+    # 1匹のペットを1〜3人で世話している家庭が多い
+    total_user = rng.choices([1, 2, 3], weights=[50, 35, 15])[0]
+
+    return [
+        {
+            "user_id": generate_uuid(rng),
+            "pet_id": pet_id,
+            "user_name": rng.choice(vocabulary.names),
+            "user_role": rng.choice(user_roles),
+            "password": f"{rng.getrandbits(32):08x}",
+            "created_at": to_timestamp(created_at),
+            "updated_at": to_timestamp(created_at),
+        }
+        for _ in range(total_user)
+    ]
+
+
+def generate_time(rng: random.Random) -> str:
+    return f"{rng.randint(6, 22):02d}:{rng.choice([0, 15, 30, 45]):02d}"
+
+
+def generate_task(rng: random.Random, vocabulary: Vocabulary) -> dict:
+    total_sub_task = rng.choices([0, 1, 2, 3], weights=[50, 20, 20, 10])[0]
+    sub_tasks = [
+        {
+            "title": rng.choice(vocabulary.words),
+            "description": rng.choice(vocabulary.sentences),
+            "scheduled_time": generate_time(rng),
+            "completed": rng.random() < 0.7,
+        }
+        for _ in range(total_sub_task)
+    ]
+
+    return {
+        "title": rng.choice(vocabulary.words),
+        "description": rng.choice(vocabulary.sentences),
+        "scheduled_time": None if sub_tasks else generate_time(rng),
+        "completed": rng.random() < 0.7,
+        "repeat": rng.random() < 0.5,
+        "sub_tasks": sub_tasks,
+    }
+
+
+def generate_diaries(
+    rng: random.Random,
+    vocabulary: Vocabulary,
+    pet_id: str,
+    start_date: date,
+    end_date: date,
+) -> list[dict]:
+    # 毎日書く飼い主もいれば，たまにしか書かない飼い主もいる
+    frequency = rng.betavariate(2, 1.5)
+
+    diaries = []
+    diary_date = start_date
+
+    while diary_date <= end_date:
+        if rng.random() < frequency:
+            written_at = datetime.combine(
+                diary_date, datetime.min.time(), UTC
+            ) + timedelta(minutes=rng.randint(6 * 60, 23 * 60))
+            diaries.append(
+                {
+                    "pet_id": pet_id,
+                    "date": diary_date.isoformat(),
+                    "picture_name": f"{pet_id}/{generate_uuid(rng)}.jpg",
+                    "reacted": rng.random() < 0.6,
+                    "advice": rng.choice(vocabulary.sentences),
+                    "comment": rng.choice(vocabulary.sentences),
+                    "weather": rng.choices(weathers, weights=weather_weights)[0],
+                    "temperature": str(round(rng.gauss(18, 8), 1)),
+                    "tasks": [
+                        generate_task(rng, vocabulary) for _ in range(rng.randint(1, 4))
+                    ],
+                    "created_at": to_timestamp(written_at),
+                    "updated_at": to_timestamp(written_at),
+                    "version": 0,
+                }
+            )
+
+        diary_date += timedelta(days=1)
+
+    return diaries
+
+
+def generate_chat_messages(
+    rng: random.Random,
+    vocabulary: Vocabulary,
+    pet_id: str,
+    start_at: datetime,
+    end_at: datetime,
+    mean_chat_message: int,
+    max_chat_message: int,
+) -> list[dict]:
+    """
+    チャットメッセージを生成する
+
+    Notes:
+        ほとんどのペットは短い履歴で，一部のペットだけが非常に長い履歴を持つように
+        対数正規分布から件数を決める．
+        ソートキーの形式は backend の DynamoDBChatRepository と揃える
+    """
+    if mean_chat_message <= 0:
+        return []
+
+    # 対数正規分布の平均が mean_chat_message になるように mu を決める
+    sigma = 1.2
+    mu = math.log(mean_chat_message) - sigma**2 / 2
+    total_turn = min(int(rng.lognormvariate(mu, sigma)) // 2, max_chat_message // 2)
+
+    span_seconds = max(1, int((end_at - start_at).total_seconds()))
+    turn_started_ats = sorted(rng.randrange(span_seconds) for _ in range(total_turn))
+
+    messages = []
+
+    for offset in turn_started_ats:
+        turn_started_at = start_at + timedelta(seconds=offset)
+
+        # ユーザーのメッセージとアシスタントの応答の1往復
+        for delay, content in [
+            (timedelta(), rng.choice(vocabulary.sentences)),
+            (timedelta(seconds=rng.uniform(1, 10)), rng.choice(vocabulary.texts)),
+        ]:
+            created_at = (turn_started_at + delay).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            digest = hashlib.sha256(f"{created_at}\n{content}".encode()).hexdigest()
+
+            messages.append(
+                {
+                    "pet_id": pet_id,
+                    "message_id": f"{created_at}#{digest[:8]}",
+                    "content": content,
+                    "created_at": created_at,
+                }
+            )
+
+    return messages
+
+
+def generate_pet_items(
+    seed: int,
+    vocabulary: Vocabulary,
+    pet_index: int,
+    end_date: date,
+    max_year: float,
+    mean_chat_message: int,
+    max_chat_message: int,
+) -> dict[str, list[dict]]:
+    """
+    1匹分のペット，ユーザー，日記，チャットメッセージを生成する
+
+    Args:
+        seed (int): 全体のシード
+        vocabulary (Vocabulary): ダミーデータに使う語彙
+        pet_index (int): ペットの通し番号
+        end_date (date): 最後の日記の日付
+        max_year (float): 日記をつけ始めてからの最大年数
+        mean_chat_message (int): 1匹あたりのチャットメッセージ数の平均
+        max_chat_message (int): 1匹あたりのチャットメッセージ数の上限
+
+    Returns:
+        dict[str, list[dict]]: テーブルの種類ごとの項目
+    """
+    rng = get_random(seed, pet_index)
+
+    pet_id = generate_uuid(rng)
+    end_at = datetime.combine(end_date, datetime.max.time(), UTC)
+    created_at = end_at - timedelta(
+        days=rng.uniform(1, max(1, max_year * 365)), seconds=rng.randrange(86400)
+    )
+
+    return {
+        "pet": [generate_pet(rng, vocabulary, pet_id, created_at)],
+        "user": generate_users(rng, vocabulary, pet_id, created_at),
+        "diary": generate_diaries(rng, vocabulary, pet_id, created_at.date(), end_date),
+        "chat_message": generate_chat_messages(
+            rng,
+            vocabulary,
+            pet_id,
+            created_at,
+            end_at,
+            mean_chat_message,
+            max_chat_message,
+        ),
+    }
+
+
+def get_tables(endpoint_url: str | None, table_names: dict[str, str]) -> dict:
+    """
+    スレッドごとのテーブルを取得する
+
+    Notes:
+        boto3 のセッションはスレッドセーフではないため，ワーカーごとに作成する
+    """
+    if not hasattr(thread_local, "tables"):
+        session = boto3.session.Session()
+        dynamodb = session.resource(
+            "dynamodb",
+            endpoint_url=endpoint_url,
+            region_name="ap-northeast-1",
+            config=Config(retries={"max_attempts": 10, "mode": "adaptive"}),
+        )
+        thread_local.tables = {
+            kind: dynamodb.Table(name) for kind, name in table_names.items()
+        }
+
+    return thread_local.tables
+
+
+def seed_chunk(
+    args: argparse.Namespace,
+    vocabulary: Vocabulary,
+    table_names: dict[str, str],
+    pet_indices: range,
+) -> Counter:
+    """
+    複数のペットの項目を生成して BatchWriteItem で書き込む
+
+    Returns:
+        Counter: テーブルの種類ごとの書き込んだ項目数
+    """
+    counts = Counter()
+    tables = get_tables(args.endpoint_url, table_names)
+
+    # batch_writer は25件ずつまとめて送り，未処理の項目 (UnprocessedItems) を再送する
+    with ExitStack() as stack:
+        writers = {
+            kind: stack.enter_context(table.batch_writer())
+            for kind, table in tables.items()
+        }
+
+        for pet_index in pet_indices:
+            pet_items = generate_pet_items(
+                args.seed,
+                vocabulary,
+                pet_index,
+                args.end_date,
+                args.max_year,
+                args.mean_chat_message,
+                args.max_chat_message,
+            )
+
+            for kind, items in pet_items.items():
+                if args.dry_run:
+                    counts[kind] += len(items)
+                    continue
+
+                for item in items:
+                    writers[kind].put_item(Item=item)
+                counts[kind] += len(items)
+
+    return counts
+
+
+def format_counts(counts: Counter) -> str:
+    return ", ".join(
+        f"{kind} {counts[kind]}件" for kind in ["pet", "user", "diary", "chat_message"]
+    )
+
+
+def bulk_seed(args: argparse.Namespace) -> None:
+    table_names = {
+        "pet": args.pet_table,
+        "user": args.user_table,
+        "diary": args.diary_table,
+        "chat_message": args.chat_message_table,
+    }
+    vocabulary = Vocabulary(args.seed)
+
+    chunks = [
+        range(start, min(start + args.chunk_size, args.pets))
+        for start in range(0, args.pets, args.chunk_size)
+    ]
+
+    total_counts = Counter()
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(
+        max_workers=args.workers, thread_name_prefix="seed"
+    ) as executor:
+        futures = [
+            executor.submit(seed_chunk, args, vocabulary, table_names, chunk)
+            for chunk in chunks
+        ]
+
+        for completed, future in enumerate(as_completed(futures), start=1):
+            total_counts += future.result()
+
+            elapsed = time.perf_counter() - started_at
+            total_item = sum(total_counts.values())
+            print(
+                f"[{completed}/{len(chunks)}] {format_counts(total_counts)} "
+                f"({total_item / elapsed:,.0f} items/sec)"
+            )
+
+    elapsed = time.perf_counter() - started_at
+    total_item = sum(total_counts.values())
+    action = "生成対象" if args.dry_run else "投入済み"
+    print(f"{action}: {format_counts(total_counts)}")
+    print(
+        f"合計 {total_item}件 / {elapsed:.1f}秒 ({total_item / elapsed:,.0f} items/sec)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="負荷試験用の大量のダミーデータを投入する"
+    )
+    parser.add_argument(
+        "--endpoint-url",
+        default="http://localhost:4566",
+        help="DynamoDBのエンドポイントURL (空文字の場合はAWS)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument("--pets", type=int, default=1000, help="投入するペットの数")
+    parser.add_argument(
+        "--max-year", type=float, default=3, help="日記をつけ始めてからの最大年数"
+    )
+    parser.add_argument(
+        "--mean-chat-message",
+        type=int,
+        default=200,
+        help="1匹あたりのチャットメッセージ数の平均",
+    )
+    parser.add_argument(
+        "--max-chat-message",
+        type=int,
+        default=20000,
+        help="1匹あたりのチャットメッセージ数の上限",
+    )
+    parser.add_argument(
+        "--end-date",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="最後の日記の日付 (同じデータを再現する場合は指定する)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="並列に書き込むスレッド数"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=20, help="1回の処理で書き込むペットの数"
+    )
+    parser.add_argument("--user-table", default="petrock-nova-user-table")
+    parser.add_argument("--pet-table", default="petrock-nova-pet-table")
+    parser.add_argument("--diary-table", default="petrock-nova-diary-table")
+    parser.add_argument(
+        "--chat-message-table", default="petrock-nova-chat-message-table"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="書き込まずに件数だけを表示する"
+    )
+    args = parser.parse_args()
+
+    args.endpoint_url = args.endpoint_url or None
+    bulk_seed(args)
+
+
+if __name__ == "__main__":
+    main()